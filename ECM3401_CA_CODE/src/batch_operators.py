@@ -0,0 +1,121 @@
+"""
+Population wide versions of the mutate and crossover functions in functions.py,
+which vary a whole population stored as a 2D array of gene indices (see
+compact_genome.stack_population) using a handful of NumPy random number
+generator calls instead of Python loops over each circuit
+"""
+import numpy as np
+
+def default_generator(rng: np.random.Generator = None) -> np.random.Generator:
+    """
+    Returns the provided random number generator, or a new one seeded from NumPy's
+    global random state, so runs which seed np.random (such as the experiment
+    runner's) stay repeatable.
+    """
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(0, 2**63, dtype=np.int64))
+    return rng
+
+def batch_crossover(population: np.ndarray,
+                    crossover_rate: float,
+                    rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Performs the two point crossover of functions.crossover in place on each pair of
+    neighbouring rows (0 and 1, 2 and 3, ...), where each pair is crossed over with a
+    probability of crossover_rate, exactly as in the generation step. The two cut
+    points are always distinct, as in crossover, but are drawn directly instead of
+    being re-drawn until they differ.
+
+    Args:
+        population (np.ndarray): A (population size, circuit length) array of gene
+            indices. With an odd population size, the last row isn't crossed over.
+        crossover_rate (float): The probability each pair of rows is crossed over.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        crossed (np.ndarray): A boolean array marking the rows that were crossed over.
+    """
+    rng = default_generator(rng)
+    num_pairs = len(population) // 2
+    length = population.shape[1]
+    crossed = np.zeros(len(population), dtype=bool)
+    if num_pairs == 0:
+        return crossed
+    if length < 2:
+        raise ValueError("Two point crossover needs circuits with at least 2 genes")
+
+    chosen = rng.random(num_pairs) < crossover_rate
+    # The second cut point is drawn from the remaining length - 1 positions, then
+    # moved past the first, so every pair of distinct positions is equally likely
+    cuts = rng.integers(0, [length, length - 1], size=(num_pairs, 2))
+    cuts[:, 1] += cuts[:, 1] >= cuts[:, 0]
+    cuts.sort(axis=1)
+
+    # The genes between the cut points of each chosen pair are swapped
+    positions = np.arange(length)
+    swapped = (chosen[:, np.newaxis]
+               & (positions >= cuts[:, :1])
+               & (positions < cuts[:, 1:]))
+    first = population[0:2*num_pairs:2]
+    second = population[1:2*num_pairs:2]
+    crossed_first = np.where(swapped, second, first)
+    second[...] = np.where(swapped, first, second)
+    first[...] = crossed_first
+
+    crossed[0:2*num_pairs:2] = chosen
+    crossed[1:2*num_pairs:2] = chosen
+    return crossed
+
+def batch_mutate(population: np.ndarray,
+                 num_genes: int,
+                 mutation_rate: float,
+                 rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Performs the point mutation of functions.mutate in place on each row with a
+    probability of mutation_rate, changing one random gene of the circuit to a random
+    gene of the table (which may be the same gene, as in mutate).
+
+    Args:
+        population (np.ndarray): A (population size, circuit length) array of gene
+            indices.
+        num_genes (int): The number of possible gates (the length of the gene table).
+        mutation_rate (float): The probability each row is mutated.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        mutated (np.ndarray): A boolean array marking the rows that were mutated.
+    """
+    rng = default_generator(rng)
+    mutated = rng.random(len(population)) < mutation_rate
+    # The position and replacement gene of every row are drawn at once
+    changes = rng.integers(0, [population.shape[1], num_genes], size=(len(population), 2))
+
+    rows = np.flatnonzero(mutated)
+    population[rows, changes[rows, 0]] = changes[rows, 1]
+    return mutated
+
+def vary_population(population: np.ndarray,
+                    num_genes: int,
+                    mutation_rate: float,
+                    crossover_rate: float,
+                    rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Applies crossover and then mutation to a population of offspring in place, in the
+    same order and with the same rates as generation_step.
+
+    Args:
+        population (np.ndarray): A (population size, circuit length) array of gene
+            indices, such as the offspring chosen by selection.
+        num_genes (int): The number of possible gates (the length of the gene table).
+        mutation_rate (float): The probability each row is mutated.
+        crossover_rate (float): The probability each pair of rows is crossed over.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        needs_evaluation (np.ndarray): A boolean array marking the rows which were
+            altered, whose fitness values are no longer valid.
+    """
+    rng = default_generator(rng)
+    crossed = batch_crossover(population, crossover_rate, rng)
+    mutated = batch_mutate(population, num_genes, mutation_rate, rng)
+    return crossed | mutated
@@ -0,0 +1,131 @@
+"""
+Tournament selection, elitism and the refill of the next generation performed on
+a flat array of fitness values (lower is fitter, as with FitnessMin), so selecting
+from a population of thousands of circuits costs a few NumPy calls rather than a
+Python loop per tournament
+"""
+import numpy as np
+from batch_operators import default_generator, vary_population
+
+def tournament_select(fitnesses: np.ndarray,
+                      k: int,
+                      tournament_size: int,
+                      rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Runs k tournaments at once, each between tournament_size circuits chosen at random
+    (with replacement, as in DEAP's selTournament), with the fittest contestant winning.
+
+    Args:
+        fitnesses (np.ndarray): The fitness value of each circuit in the population.
+        k (int): The number of circuits to select.
+        tournament_size (int): The number of circuits taking part in each tournament.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        winners (np.ndarray): The population index of the winner of each tournament.
+    """
+    rng = default_generator(rng)
+    contestants = rng.integers(0, len(fitnesses), size=(k, tournament_size))
+    # Ties are won by the first contestant drawn, as with DEAP's max
+    return contestants[np.arange(k), np.argmin(fitnesses[contestants], axis=1)]
+
+def select_elites(fitnesses: np.ndarray, elite_count: int) -> np.ndarray:
+    """
+    Finds the fittest circuits with a partial sort of the fitness values.
+
+    Args:
+        fitnesses (np.ndarray): The fitness value of each circuit in the population.
+        elite_count (int): The number of circuits to select.
+
+    Returns:
+        elites (np.ndarray): The population indices of the elite_count fittest
+            circuits, fittest first.
+    """
+    elite_count = min(elite_count, len(fitnesses))
+    if elite_count <= 0:
+        return np.zeros(0, dtype=np.intp)
+
+    elites = np.argpartition(fitnesses, elite_count - 1)[:elite_count]
+    # Only the elites themselves are sorted (stably, so ties keep population order)
+    return elites[np.argsort(fitnesses[elites], kind="stable")]
+
+def refill(num_offspring: int, count: int, rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Picks count different offspring at random to fill the rest of the next generation,
+    in linear time. This has the same distribution as repeatedly choosing an offspring
+    with random.choice and removing it from the list.
+
+    Args:
+        num_offspring (int): The number of offspring to choose from.
+        count (int): The number of offspring needed.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        chosen (np.ndarray): The indices of the chosen offspring.
+    """
+    if not 0 <= count <= num_offspring:
+        raise ValueError("Can't choose " + str(count) + " different offspring from " + str(num_offspring))
+
+    rng = default_generator(rng)
+    return rng.permutation(num_offspring)[:count]
+
+def batch_generation_step(population: np.ndarray,
+                          fitnesses: np.ndarray,
+                          evaluate,
+                          num_genes: int,
+                          mutation_rate: float,
+                          crossover_rate: float,
+                          elite_count: int,
+                          tournament_size: int,
+                          rng: np.random.Generator = None) -> (np.ndarray, np.ndarray, int, int):
+    """
+    The array version of evolution.generation_step: carries over the elite_count
+    fittest circuits, and fills the rest of the next generation with offspring chosen
+    by tournament selection, crossed over and mutated.
+
+    Args:
+        population (np.ndarray): A (population size, circuit length) array of gene
+            indices, which isn't modified.
+        fitnesses (np.ndarray): The fitness of each row of the population.
+        evaluate (function): Calculates the fitness of every row of an array of gene
+            indices, such as functions.index_array_fitness with its other arguments
+            filled in.
+        num_genes (int): The number of possible gates (the length of the gene table).
+        mutation_rate (float): The probability each offspring is mutated.
+        crossover_rate (float): The probability each pair of offspring is crossed over.
+        elite_count (int): The number of circuits carried over by elitism.
+        tournament_size (int): The number of circuits taking part in each tournament.
+        rng (np.random.Generator): The random number generator used.
+
+    Returns:
+        (next_population, next_fitnesses, best_index, evaluations): The next generation
+            and its fitness values, the population index of the fittest circuit in the
+            current generation and the number of fitness evaluations performed.
+    """
+    size = len(population)
+    if not 0 <= elite_count <= size:
+        raise ValueError("The elite count must be between 0 and the population size (" + str(size) + "), not "
+                         + str(elite_count))
+
+    rng = default_generator(rng)
+
+    winners = tournament_select(fitnesses, size, tournament_size, rng)
+    # Indexing copies the winners, so the offspring can be altered in place
+    offspring = population[winners]
+    offspring_fitnesses = fitnesses[winners]
+
+    elites = select_elites(fitnesses, max(elite_count, 1))
+    best_index = int(elites[0])
+    elites = elites[:elite_count]
+
+    # Only the altered offspring are re-evaluated, the rest keep their parent's fitness
+    needs_evaluation = vary_population(offspring, num_genes, mutation_rate, crossover_rate, rng)
+    altered = np.flatnonzero(needs_evaluation)
+    if len(altered):
+        offspring_fitnesses[altered] = evaluate(offspring[altered])
+
+    chosen = refill(size, size - len(elites), rng)
+    next_population = np.concatenate((population[elites], offspring[chosen]))
+    next_fitnesses = np.concatenate((fitnesses[elites], offspring_fitnesses[chosen]))
+
+    return (next_population, next_fitnesses, best_index, len(altered))
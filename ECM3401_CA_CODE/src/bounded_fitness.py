@@ -0,0 +1,195 @@
+"""
+A bounded version of the fitness evaluation, which calculates a circuit's unitary
+matrix a block of rows at a time and stops as soon as the distance accumulated so
+far passes a cutoff (such as the fitness of the least fit elite). The circuits it
+stops early for can't become elites, so their partial distance is returned as a
+lower bound on their fitness instead of finishing the whole 4^n element sum.
+"""
+import random
+import numpy as np
+from unitary_engine import compile_gate_set
+from evolution import select_elites
+
+# The number of row blocks a unitary matrix is split into by default
+DEFAULT_BLOCKS = 4
+
+def bounded_circuit_fitness(current_circuit: [[int, [int, int]]],
+                            gate_set: dict,
+                            target_matrix: [[float]],
+                            num_qubits: int,
+                            cutoff: float = None,
+                            block_rows: int = None,
+                            metric: str = "l1") -> ((float,), bool):
+    """
+    Calculates a circuit's fitness one block of rows of its unitary matrix at a time.
+    Row i of U is the conjugate of column i of U^dagger, which is found by applying
+    the daggered genes in reverse order to the basis state e_i, so each block costs
+    1 / (number of blocks) of building the full matrix.
+
+    Args:
+        current_circuit ([[int, [int, int]]]): The circuit being evaluated.
+        gate_set ({int: Gate}): The complete gate set for the current algorithm and
+            number of qubits.
+        target_matrix ([[float]]): The matrix representing the goal circuit.
+        num_qubits (int): The number of qubits being used by the circuit.
+        cutoff (float): Evaluation stops once the partial fitness is above this value,
+            or the full fitness is always calculated if it is None.
+        block_rows (int): The number of rows calculated at once, which defaults to
+            splitting the matrix into DEFAULT_BLOCKS blocks.
+        metric (str): "l1" or "frobenius", which are the metrics that only grow as
+            more rows are added ("fidelity" depends on every row, so can't be bounded).
+
+    Returns:
+        ((fitness,), exact): The fitness tuple and whether it is the exact fitness
+            (True), or a lower bound on it that is above the cutoff (False).
+    """
+    if metric not in ("l1", "frobenius"):
+        raise ValueError("Only the \"l1\" and \"frobenius\" metrics can be bounded, not " + repr(metric))
+
+    adjoint = compile_gate_set(gate_set, num_qubits).adjoint()
+    target_matrix = np.asarray(target_matrix)
+    dimension = 2 ** num_qubits
+    block_rows = block_rows or max(dimension // DEFAULT_BLOCKS, 1)
+    reversed_circuit = list(reversed(current_circuit))
+
+    total = 0.0
+    for start in range(0, dimension, block_rows):
+        end = min(start + block_rows, dimension)
+        basis_states = np.zeros((dimension, end - start), dtype=complex)
+        basis_states[np.arange(start, end), np.arange(end - start)] = 1
+        # The conjugate transpose of U^dagger's columns are the rows of U
+        rows = np.conj(adjoint.apply_circuit(basis_states, reversed_circuit)).T
+        difference = np.abs(rows - target_matrix[start:end])
+        total += difference.sum() if metric == "l1" else (difference ** 2).sum()
+
+        fitness = total if metric == "l1" else float(np.sqrt(total))
+        if cutoff is not None and fitness > cutoff and end < dimension:
+            return ((float(fitness),), False)
+
+    return ((float(fitness),), True)
+
+class BoundedEvaluator:
+    """
+    Evaluates circuits with bounded_circuit_fitness using the current elite cutoff,
+    and can be registered with the DEAP toolbox in place of circuit_fitness.
+
+    Every circuit which is stopped early has a fitness above the cutoff, so it ranks
+    below every elite and can't displace one, while the elites and the best circuit
+    always have their exact fitness. Its lower_bound attribute is set to True (and
+    to False for exact fitness values), so the lower bounds can be told apart.
+    Comparing two lower bounds says nothing about which circuit is fitter, so
+    register() also replaces tools.selTournament with select, which ranks every
+    lower bound equally and below every exact fitness. register() also registers
+    update_cutoff, which generation_step calls before evaluating the offspring, so
+    the cutoff follows the elites of each generation. The lower bounds should be
+    left out of any fitness statistics (see exact_fitness).
+
+    Args:
+        gate_set ({int: Gate}): The complete gate set for the current algorithm and
+            number of qubits.
+        target_matrix ([[float]]): The matrix representing the goal circuit.
+        num_qubits (int): The number of qubits being used by the circuits.
+        block_rows (int): The number of rows calculated at once.
+        metric (str): "l1" or "frobenius".
+    """
+    def __init__(self,
+                 gate_set: dict,
+                 target_matrix: [[float]],
+                 num_qubits: int,
+                 block_rows: int = None,
+                 metric: str = "l1"):
+        self.gate_set = gate_set
+        self.target_matrix = np.asarray(target_matrix)
+        self.num_qubits = num_qubits
+        self.block_rows = block_rows
+        self.metric = metric
+        self.cutoff = None
+        self.early_stops = 0
+
+    def evaluate(self, circuit: [[int, [int]]]) -> (float,):
+        """
+        Calculates a circuit's fitness, stopping early once it passes the cutoff.
+
+        Args:
+            circuit (creator.Individual): The circuit being evaluated.
+
+        Returns:
+            (fitness,): The fitness tuple, which is a lower bound if evaluation stopped early.
+        """
+        fitness, exact = bounded_circuit_fitness(circuit, self.gate_set, self.target_matrix,
+                                                 self.num_qubits, self.cutoff, self.block_rows, self.metric)
+        if not exact:
+            self.early_stops += 1
+        if hasattr(circuit, "__dict__"):
+            circuit.lower_bound = not exact
+
+        return fitness
+
+    def update_cutoff(self, population: list, elite_count: int):
+        """
+        Sets the cutoff to the fitness of the least fit elite of a population, the
+        worst fitness which can still be carried over by elitism. Without elitism
+        the population's best circuit isn't carried over, so every offspring is
+        evaluated exactly (the cutoff is None).
+
+        Args:
+            population ([creator.Individual]): Circuits which all have a valid fitness.
+            elite_count (int): The number of circuits carried over by elitism.
+        """
+        if elite_count < 1:
+            self.cutoff = None
+            return
+
+        elites = select_elites(population, elite_count)
+        self.cutoff = elites[-1].fitness.values[0]
+
+    def select(self, population: list, k: int, tournsize: int) -> list:
+        """
+        Selects k circuits by tournament in the same way as tools.selTournament,
+        except that a circuit whose fitness is a lower bound loses to any circuit
+        with an exact fitness, and ties with every other lower bound (so the first
+        one drawn, which is random, wins).
+
+        Args:
+            population ([creator.Individual]): Circuits which all have a valid fitness.
+            k (int): The number of circuits to select.
+            tournsize (int): The number of circuits taking part in each tournament.
+
+        Returns:
+            chosen ([creator.Individual]): The winner of each tournament.
+        """
+        chosen = []
+        for _ in range(k):
+            aspirants = [random.choice(population) for _ in range(tournsize)]
+            chosen.append(max(aspirants, key=self.selection_key))
+
+        return chosen
+
+    @staticmethod
+    def selection_key(circuit) -> tuple:
+        """Ranks a circuit for selection, with every lower bound equal and below every exact fitness"""
+        if getattr(circuit, "lower_bound", False):
+            return (False,)
+        return (True,) + circuit.fitness.wvalues
+
+    def register(self, toolbox):
+        """
+        Registers the bounded evaluation and selection as the DEAP toolbox's "evaluate"
+        and "select" functions, along with update_cutoff as its "update_cutoff" function.
+
+        Args:
+            toolbox (base.Toolbox): The toolbox used by the EA.
+        """
+        toolbox.register("evaluate", self.evaluate)
+        toolbox.register("select", self.select)
+        toolbox.register("update_cutoff", self.update_cutoff)
+
+def exact_fitness(circuit) -> float:
+    """
+    Returns a circuit's fitness, or NaN if it is only a lower bound, so it can be used
+    as the key of the notebooks' fitness statistics with np.nanmean, np.nanmin and
+    np.nanmax registered, which then leave the lower bounds out.
+    """
+    if getattr(circuit, "lower_bound", False):
+        return float("nan")
+    return circuit.fitness.values[0]
@@ -0,0 +1,269 @@
+"""
+Periodically stores the state of an EA run (the population and its fitness values,
+the best circuit found, the logbook and the random number generator states) in a
+small compressed file, so a run whose notebook kernel dies can be resumed from its
+last checkpoint and continue exactly as if it had never stopped
+"""
+import os
+import time
+import zlib
+import pickle
+import random
+import tempfile
+import numpy as np
+from deap import tools
+from evolution import generation_step
+
+# Changing this makes older checkpoint files fail to load instead of loading wrongly
+CHECKPOINT_VERSION = 1
+
+def pack_population(population: list) -> dict:
+    """
+    Stores a population compactly, as a table of the distinct genes it uses and a
+    2D array of indices into that table (one row per circuit, padded with -1), along
+    with an array of fitness values (NaN for circuits without a valid fitness).
+
+    Args:
+        population ([creator.Individual]): The circuits being stored.
+
+    Returns:
+        packed (dict): The gene table, index array, circuit lengths and fitness values.
+    """
+    genes = {}
+    length = max((len(circuit) for circuit in population), default=0)
+    indices = np.full((len(population), length), -1, dtype=np.int32)
+    for row, circuit in enumerate(population):
+        for column, gene in enumerate(circuit):
+            indices[row, column] = genes.setdefault((gene[0], tuple(gene[1])), len(genes))
+
+    num_values = max((len(circuit.fitness.values) for circuit in population), default=1) or 1
+    fitnesses = np.full((len(population), num_values), np.nan)
+    for row, circuit in enumerate(population):
+        if circuit.fitness.valid:
+            fitnesses[row] = circuit.fitness.values
+
+    dtype = np.int16 if len(genes) < np.iinfo(np.int16).max else np.int32
+    return {"genes": list(genes),
+            "indices": indices.astype(dtype),
+            "lengths": np.array([len(circuit) for circuit in population], dtype=np.int32),
+            "fitnesses": fitnesses}
+
+def unpack_population(packed: dict, individual_class: type) -> list:
+    """
+    Rebuilds a population stored by pack_population.
+
+    Args:
+        packed (dict): The stored population.
+        individual_class (type): The class of each circuit, such as creator.Individual.
+
+    Returns:
+        population ([creator.Individual]): The circuits, with their fitness values.
+    """
+    genes = [[gate_id, list(qubits)] for gate_id, qubits in packed["genes"]]
+    population = []
+    for row, length, fitness in zip(packed["indices"], packed["lengths"], packed["fitnesses"]):
+        circuit = individual_class(genes[index] for index in row[:length].tolist())
+        if not np.isnan(fitness).any():
+            circuit.fitness.values = tuple(fitness.tolist())
+        population.append(circuit)
+
+    return population
+
+def save_checkpoint(path: str, state: dict):
+    """
+    Writes a checkpoint as a compressed pickle to a temporary file in the same
+    directory and then renames it, so an interrupted write never replaces the
+    previous checkpoint with a partial file.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        state (dict): The state of the run, as created by Checkpointer.save.
+    """
+    contents = zlib.compress(pickle.dumps(dict(state, version=CHECKPOINT_VERSION),
+                                          protocol=pickle.HIGHEST_PROTOCOL))
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(contents)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def load_checkpoint(path: str, individual_class: type) -> dict:
+    """
+    Reads a checkpoint file and rebuilds its population and best circuit.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        individual_class (type): The class of each circuit, such as creator.Individual.
+
+    Returns:
+        state (dict): The generation reached, the population, the best circuit, the
+            logbook, both random number generator states and any extra values stored.
+    """
+    with open(path, "rb") as file:
+        state = pickle.loads(zlib.decompress(file.read()))
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError("The checkpoint " + repr(path) + " was written by an incompatible version")
+
+    state["population"] = unpack_population(state["population"], individual_class)
+    best = unpack_population(state["best_circuit"], individual_class)
+    state["best_circuit"] = best[0] if best else None
+    return state
+
+class Checkpointer:
+    """
+    Decides when a run is checkpointed, every_generations generations or every_seconds
+    seconds after the previous checkpoint (whichever comes first).
+
+    Args:
+        path (str): The path of the checkpoint file, which is replaced each time.
+        every_generations (int): The number of generations between checkpoints, or
+            None to only checkpoint by time.
+        every_seconds (float): The number of seconds between checkpoints, or None to
+            only checkpoint by generation.
+    """
+    def __init__(self, path: str, every_generations: int = None, every_seconds: float = None):
+        if every_generations is None and every_seconds is None:
+            raise ValueError("A checkpoint interval in generations or seconds is needed")
+
+        self.path = path
+        self.every_generations = every_generations
+        self.every_seconds = every_seconds
+        self.last_generation = 0
+        self.last_time = time.monotonic()
+        self.saves = 0
+
+    def due(self, gen: int) -> bool:
+        """Returns whether a checkpoint should be written after generation gen"""
+        if self.every_generations is not None and gen - self.last_generation >= self.every_generations:
+            return True
+        return self.every_seconds is not None and time.monotonic() - self.last_time >= self.every_seconds
+
+    def save(self, gen: int, population: list, best_circuit, logbook: tools.Logbook, **extra):
+        """
+        Writes a checkpoint of the run after generation gen, including the current
+        random number generator states, so resuming continues the same sequence.
+
+        Args:
+            gen (int): The number of generations completed.
+            population ([creator.Individual]): The population for the next generation.
+            best_circuit (creator.Individual): The fittest circuit found so far.
+            logbook (tools.Logbook): The statistics recorded so far.
+            **extra: Any other picklable values to store (such as the run's parameters).
+        """
+        save_checkpoint(self.path, {"generation": gen,
+                                    "population": pack_population(population),
+                                    "best_circuit": pack_population([] if best_circuit is None else [best_circuit]),
+                                    "logbook": logbook,
+                                    "random_state": random.getstate(),
+                                    "numpy_state": np.random.get_state(),
+                                    "extra": extra})
+        self.last_generation = gen
+        self.last_time = time.monotonic()
+        self.saves += 1
+
+    def maybe_save(self, gen: int, population: list, best_circuit, logbook: tools.Logbook, **extra) -> bool:
+        """Writes a checkpoint if one is due, returning whether it was written"""
+        if not self.due(gen):
+            return False
+        self.save(gen, population, best_circuit, logbook, **extra)
+        return True
+
+def evolve(toolbox,
+           population: list,
+           num_generations: int,
+           mutation_rate: float,
+           crossover_rate: float,
+           elite_count: int,
+           tournament_size: int,
+           checkpointer: Checkpointer = None,
+           statistics: tools.Statistics = None,
+           logbook: tools.Logbook = None,
+           start_generation: int = 0,
+           best_circuit=None) -> (list, tools.Logbook, object):
+    """
+    Runs the generational scheme from start_generation up to num_generations,
+    checkpointing whenever the checkpointer says one is due, and after the final
+    generation.
+
+    Args:
+        toolbox (base.Toolbox): The DEAP toolbox used by generation_step.
+        population ([creator.Individual]): The current population.
+        num_generations (int): The total number of generations of the run.
+        mutation_rate (float): The probability each offspring is mutated.
+        crossover_rate (float): The probability each pair of offspring is crossed over.
+        elite_count (int): The number of circuits carried over by elitism.
+        tournament_size (int): The number of circuits taking part in each tournament.
+        checkpointer (Checkpointer): Decides when checkpoints are written, or None.
+        statistics (tools.Statistics): Compiled for every generation, if provided.
+        logbook (tools.Logbook): The logbook to continue recording in.
+        start_generation (int): The number of generations already completed.
+        best_circuit (creator.Individual): The fittest circuit found so far.
+
+    Returns:
+        (population, logbook, best_circuit): The final population, the logbook and
+            the fittest circuit found.
+    """
+    logbook = tools.Logbook() if logbook is None else logbook
+    for gen in range(start_generation, num_generations):
+        next_gen_population, generation_best, evaluations = generation_step(
+            population, toolbox, mutation_rate, crossover_rate, elite_count, tournament_size)
+
+        # Replaces the best circuit with the fittest circuit of this generation if it is fitter
+        if best_circuit is None or generation_best.fitness.wvalues > best_circuit.fitness.wvalues:
+            best_circuit = toolbox.clone(generation_best)
+
+        population[:] = next_gen_population
+        record = statistics.compile(population) if statistics is not None else {}
+        logbook.record(gen=gen + 1, evaluations=evaluations, **record)
+
+        if checkpointer is not None:
+            if gen + 1 == num_generations:
+                checkpointer.save(gen + 1, population, best_circuit, logbook)
+            else:
+                checkpointer.maybe_save(gen + 1, population, best_circuit, logbook)
+
+    return (population, logbook, best_circuit)
+
+def resume(path: str,
+           toolbox,
+           individual_class: type,
+           num_generations: int,
+           mutation_rate: float,
+           crossover_rate: float,
+           elite_count: int,
+           tournament_size: int,
+           checkpointer: Checkpointer = None,
+           statistics: tools.Statistics = None) -> (list, tools.Logbook, object):
+    """
+    Continues a run from its checkpoint file, restoring the random number generator
+    states so the rest of the run matches the run that was interrupted.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        toolbox (base.Toolbox): The same toolbox as the interrupted run.
+        individual_class (type): The class of each circuit, such as creator.Individual.
+        num_generations (int): The total number of generations of the run.
+        mutation_rate, crossover_rate, elite_count, tournament_size: The parameters
+            of the interrupted run.
+        checkpointer (Checkpointer): Decides when later checkpoints are written.
+        statistics (tools.Statistics): Compiled for every generation, if provided.
+
+    Returns:
+        (population, logbook, best_circuit): As returned by evolve.
+    """
+    state = load_checkpoint(path, individual_class)
+    random.setstate(state["random_state"])
+    np.random.set_state(state["numpy_state"])
+    if checkpointer is not None:
+        checkpointer.last_generation = state["generation"]
+
+    return evolve(toolbox, state["population"], num_generations, mutation_rate, crossover_rate,
+                  elite_count, tournament_size, checkpointer, statistics, state["logbook"],
+                  state["generation"], state["best_circuit"])
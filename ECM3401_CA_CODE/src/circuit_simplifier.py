@@ -0,0 +1,192 @@
+"""
+A peephole simplifier for the list based circuit representation, which removes
+wires and cancelling pairs of gates (such as H.H or SWAP.SWAP on the same qubits)
+and puts commuting gates into a canonical order. Equivalent circuits are mapped
+to the same shorter gate sequence and canonical key, so they can share one
+evaluation and their size reflects the gates they really contain.
+
+Everything the simplifier knows about the gates (which are their own inverse,
+which have the same matrix and which qubit orders are equivalent) is found from
+the gate set's matrices, so it works with any gate set.
+"""
+import functools
+import itertools
+import numpy as np
+from unitary_engine import compile_gate_set
+
+class CircuitSimplifier:
+    """
+    Simplifies circuits built from one gate set.
+
+    Args:
+        gate_set ({int: Gate}): The gate set for the current algorithm and number of
+            qubits, mapping each gate id to its Qiskit gate (or "WIRE").
+        num_qubits (int): The number of qubits being used by the circuits.
+    """
+    def __init__(self, gate_set: dict, num_qubits: int):
+        compiled = compile_gate_set(gate_set, num_qubits)
+        tensors = {gate_id: tensor for gate_id, tensor in compiled.gate_tensors.items() if tensor is not None}
+        self.wire_ids = {gate_id for gate_id, tensor in compiled.gate_tensors.items() if tensor is None}
+
+        # Gates with the same matrix are replaced by the one with the smallest id
+        self.equivalent_ids = {}
+        for gate_id in sorted(tensors):
+            self.equivalent_ids[gate_id] = next(other for other in sorted(tensors)
+                                                if tensors[other].shape == tensors[gate_id].shape
+                                                and np.allclose(tensors[other], tensors[gate_id]))
+
+        # The pairs of gates which cancel each other when applied to the same qubits
+        self.inverse_pairs = set()
+        for first, second in itertools.product(tensors, repeat=2):
+            if tensors[first].shape == tensors[second].shape:
+                dimension = 2 ** (tensors[first].ndim // 2)
+                product = (tensors[second].reshape(dimension, dimension)
+                           @ tensors[first].reshape(dimension, dimension))
+                if np.allclose(product, np.eye(dimension)):
+                    self.inverse_pairs.add((first, second))
+
+        # The orderings of each gate's qubits which leave the gate unchanged
+        self.symmetries = {gate_id: symmetric_permutations(tensor) for gate_id, tensor in tensors.items()}
+
+    def canonical_gene(self, gene: [int, [int]]) -> (int, (int,)):
+        """
+        Returns a gene using the smallest equivalent gate id and the smallest
+        equivalent ordering of its qubits, e.g. SWAP [2, 0] becomes SWAP [0, 2].
+        """
+        gate_id = self.equivalent_ids[gene[0]]
+        qubits = tuple(gene[1])
+        return (gate_id, min(tuple(qubits[i] for i in permutation) for permutation in self.symmetries[gate_id]))
+
+    def cancel(self, circuit: [[int, [int]]]) -> [(int, (int,))]:
+        """
+        Removes wires and every pair of genes which cancel each other, where the second
+        gene follows the first with only gates on other qubits between them. As the
+        simplified circuit is built like a stack, cancellations can cascade, so
+        H.X.X.H becomes the empty circuit.
+
+        Args:
+            circuit ([[int, [int]]]): The circuit in the list based representation.
+
+        Returns:
+            genes ([(int, (int,))]): The remaining canonical genes, in circuit order.
+        """
+        genes = []
+        for gene in circuit:
+            if gene[0] in self.wire_ids:
+                continue
+            gene = self.canonical_gene(gene)
+            qubits = set(gene[1])
+
+            # Finds the last remaining gene acting on any of the same qubits
+            for position in range(len(genes) - 1, -1, -1):
+                if qubits.intersection(genes[position][1]):
+                    previous = genes[position]
+                    if previous[1] == gene[1] and (previous[0], gene[0]) in self.inverse_pairs:
+                        del genes[position]
+                        gene = None
+                    break
+
+            if gene is not None:
+                genes.append(gene)
+
+        return genes
+
+    def layers(self, circuit: [[int, [int]]]) -> [[(int, (int,))]]:
+        """
+        Groups the simplified genes into layers, placing each gene in the layer after
+        the last gene sharing one of its qubits. Gates on disjoint qubits commute, so
+        every ordering of them gives the same layers, and each layer is sorted.
+
+        Args:
+            circuit ([[int, [int]]]): The circuit in the list based representation.
+
+        Returns:
+            layers ([[(int, (int,))]]): The sorted genes of each layer.
+        """
+        layers = []
+        qubit_depths = {}
+        for gene in self.cancel(circuit):
+            depth = max((qubit_depths.get(qubit, 0) for qubit in gene[1]), default=0)
+            if depth == len(layers):
+                layers.append([])
+            layers[depth].append(gene)
+            for qubit in gene[1]:
+                qubit_depths[qubit] = depth + 1
+
+        return [sorted(layer) for layer in layers]
+
+    def simplify(self, circuit: [[int, [int]]]) -> [[int, [int]]]:
+        """
+        Simplifies a circuit into a shorter circuit with the same unitary matrix.
+
+        Args:
+            circuit ([[int, [int]]]): The circuit in the list based representation.
+
+        Returns:
+            simplified ([[int, [int]]]): The remaining genes in canonical (layer) order.
+        """
+        return [[gate_id, list(qubits)] for layer in self.layers(circuit) for gate_id, qubits in layer]
+
+    def canonical_key(self, circuit: [[int, [int]]]) -> (((int, (int,)),),):
+        """
+        Returns a hashable key which is shared by equivalent circuits (e.g. for a
+        FitnessCache), made up of the sorted genes of each layer.
+        """
+        return tuple(tuple(layer) for layer in self.layers(circuit))
+
+    def size(self, circuit: [[int, [int]]]) -> int:
+        """Returns the number of gates left in the circuit once it is simplified"""
+        return len(self.cancel(circuit))
+
+    def wrap(self, evaluate):
+        """
+        Wraps an evaluation function so that it's called with the simplified circuit,
+        which has fewer genes to simulate, e.g.
+        toolbox.register("evaluate", simplifier.wrap(circuit_fitness), gate_set=gate_set, ...)
+
+        Args:
+            evaluate (function): The evaluation function, such as circuit_fitness.
+
+        Returns:
+            simplified_evaluate (function): A function with the same arguments as evaluate.
+        """
+        @functools.wraps(evaluate)
+        def simplified_evaluate(circuit, *args, **kwargs):
+            return evaluate(self.simplify(circuit), *args, **kwargs)
+
+        return simplified_evaluate
+
+def symmetric_permutations(tensor: np.ndarray) -> [(int,)]:
+    """
+    Finds the orderings of a gate's qubits which leave its matrix unchanged (such as
+    both orderings of a SWAP's qubits), by permuting its input and output axes together.
+
+    Args:
+        tensor (np.ndarray): The gate's matrix as a (2,) * 2k tensor.
+
+    Returns:
+        permutations ([(int,)]): Each ordering of the k qubits with the same matrix,
+            including the original ordering.
+    """
+    gate_qubits = tensor.ndim // 2
+    permutations = []
+    for permutation in itertools.permutations(range(gate_qubits)):
+        # Qubit i of the gate is the tensor axis gate_qubits - 1 - i (little-endian)
+        axes = [gate_qubits - 1 - permutation[gate_qubits - 1 - axis] for axis in range(gate_qubits)]
+        if np.allclose(tensor.transpose(axes + [gate_qubits + axis for axis in axes]), tensor):
+            permutations.append(permutation)
+
+    return permutations
+
+# Stores each simplifier, keyed like the compiled gate sets in unitary_engine.py
+_simplifiers = {}
+
+def simplifier_for(gate_set: dict, num_qubits: int) -> CircuitSimplifier:
+    """Returns the simplifier of a gate set, only creating it the first time it is used"""
+    key = (id(gate_set), num_qubits)
+    cached = _simplifiers.get(key)
+    if cached is None or cached[0] is not gate_set:
+        cached = (gate_set, CircuitSimplifier(gate_set, num_qubits))
+        _simplifiers[key] = cached
+
+    return cached[1]
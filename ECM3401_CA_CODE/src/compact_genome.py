@@ -0,0 +1,200 @@
+"""
+A compact representation of a circuit, storing each gene as an index into a table
+of possible gates (a GateTable) in a small NumPy integer array, rather than as a
+list of [gate id, [qubits]] lists. Cloning a compact genome copies one array
+instead of deep-copying every gene, and a whole population can be stored as a
+single 2D array with one row per circuit.
+
+A CompactGenome still behaves as a sequence of [gate id, [qubits]] genes, so
+circuit_size, convert_circuit, mutate, crossover and the DEAP selection tools
+work with it unchanged.
+"""
+import random
+import numpy as np
+from gate_generator import WIRE_ID
+
+def index_dtype(table) -> np.dtype:
+    """Returns the smallest integer type that can index every gene in a table"""
+    return np.dtype(np.int16) if len(table) <= np.iinfo(np.int16).max else np.dtype(np.int32)
+
+class CompactFitness:
+    """
+    A lightweight equivalent of DEAP's base.Fitness for compact genomes, which only
+    stores the weighted fitness values (using __slots__, so it has no __dict__).
+    Fitnesses are compared by their weighted values, exactly like DEAP's, so the
+    DEAP selection tools can be used. Other weights are used by subclassing, e.g.
+    class FitnessMulti(CompactFitness): __slots__ = (); weights = (-1.0, -1.0)
+
+    Args:
+        values ((float,)): The initial fitness values, if already known.
+    """
+    __slots__ = ("wvalues",)
+    # Minimises the fitness, as with the EA's FitnessMin class
+    weights = (-1.0,)
+
+    def __init__(self, values: (float,) = ()):
+        self.wvalues = ()
+        if values:
+            self.values = values
+
+    @property
+    def values(self) -> (float,):
+        return tuple(value / weight for value, weight in zip(self.wvalues, self.weights))
+
+    @values.setter
+    def values(self, values: (float,)):
+        self.wvalues = tuple(value * weight for value, weight in zip(values, self.weights))
+
+    @values.deleter
+    def values(self):
+        self.wvalues = ()
+
+    @property
+    def valid(self) -> bool:
+        return len(self.wvalues) != 0
+
+    def __lt__(self, other) -> bool:
+        return self.wvalues < other.wvalues
+
+    def __le__(self, other) -> bool:
+        return self.wvalues <= other.wvalues
+
+    def __gt__(self, other) -> bool:
+        return self.wvalues > other.wvalues
+
+    def __ge__(self, other) -> bool:
+        return self.wvalues >= other.wvalues
+
+    def __eq__(self, other) -> bool:
+        return self.wvalues == other.wvalues
+
+    def __ne__(self, other) -> bool:
+        return self.wvalues != other.wvalues
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo: dict):
+        # The weighted values are an immutable tuple, so they can be shared
+        fitness = self.__class__.__new__(self.__class__)
+        fitness.wvalues = self.wvalues
+        return fitness
+
+    def __repr__(self) -> str:
+        return self.__class__.__name__ + "(" + repr(self.values) + ")"
+
+class CompactGenome:
+    """
+    A circuit stored as an array of indices into a table of possible gates.
+
+    Indexing and iterating over a genome gives the genes of the table (in the
+    [gate id, [qubits]] form), and assigning a gene stores its index, so the
+    existing genetic operators can be used on compact genomes. The array itself
+    is available as genome.indices for vectorised operators.
+
+    Args:
+        table (GateTable): The table of possible gates the indices refer to.
+        indices (np.ndarray): The index of each gene in table.possible_gates.
+        fitness (CompactFitness): The genome's fitness, which is invalid by default.
+    """
+    __slots__ = ("table", "indices", "fitness")
+
+    def __init__(self, table, indices, fitness: CompactFitness = None):
+        self.table = table
+        self.indices = np.asarray(indices, dtype=index_dtype(table))
+        self.fitness = CompactFitness() if fitness is None else fitness
+
+    @classmethod
+    def from_circuit(cls, table, circuit: [[int, [int]]], fitness: CompactFitness = None):
+        """Creates a compact genome from a circuit in the list based representation"""
+        return cls(table, [table.index(gene) for gene in circuit], fitness)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self):
+        possible_gates = self.table.possible_gates
+        return (possible_gates[index] for index in self.indices.tolist())
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            possible_gates = self.table.possible_gates
+            return [possible_gates[index] for index in self.indices[position].tolist()]
+        return self.table.possible_gates[self.indices[position]]
+
+    def __setitem__(self, position, genes):
+        if isinstance(position, slice):
+            if isinstance(genes, CompactGenome):
+                self.indices[position] = genes.indices
+            else:
+                self.indices[position] = [self.table.index(gene) for gene in genes]
+        else:
+            self.indices[position] = self.table.index(genes)
+
+    def to_circuit(self) -> [[int, [int]]]:
+        """Returns the circuit in the list based representation"""
+        return list(self)
+
+    def size(self) -> int:
+        """Returns the number of genes which aren't wires, the same as circuit_size"""
+        return int(np.count_nonzero(self.table.gate_ids[self.indices] != WIRE_ID))
+
+    def __deepcopy__(self, memo: dict):
+        # The table is shared, only the indices and fitness are copied
+        genome = self.__class__.__new__(self.__class__)
+        genome.table = self.table
+        genome.indices = self.indices.copy()
+        genome.fitness = self.fitness.__deepcopy__(memo)
+        return genome
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactGenome):
+            return self.table is other.table and np.array_equal(self.indices, other.indices)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "CompactGenome(" + repr(self.to_circuit()) + ")"
+
+def random_genome(table, length: int, fitness_class: type = CompactFitness) -> CompactGenome:
+    """
+    Creates a genome of random genes, which can be registered as the toolbox's
+    "individual" function.
+
+    Args:
+        table (GateTable): The table of possible gates.
+        length (int): The number of genes in the circuit.
+        fitness_class (type): The fitness class, a subclass of CompactFitness.
+
+    Returns:
+        genome (CompactGenome): The random genome, without a valid fitness.
+    """
+    indices = [random.randrange(len(table)) for _ in range(length)]
+    return CompactGenome(table, indices, fitness_class())
+
+def stack_population(population: [CompactGenome]) -> np.ndarray:
+    """
+    Stores a population of equal length genomes as one (population size, circuit
+    length) array of gene indices.
+    """
+    if not population:
+        return np.zeros((0, 0), dtype=np.int16)
+    return np.stack([genome.indices for genome in population])
+
+def genomes_from_array(table, array: np.ndarray, fitness_class: type = CompactFitness) -> [CompactGenome]:
+    """
+    Creates a genome for each row of a 2D array of gene indices. Each genome's indices
+    are a view of its row, so the population keeps being stored in the one array
+    (until a genome is cloned). The array is only copied if it doesn't already use
+    the table's index type.
+
+    Args:
+        table (GateTable): The table of possible gates.
+        array (np.ndarray): A (population size, circuit length) array of indices.
+        fitness_class (type): The fitness class, a subclass of CompactFitness.
+
+    Returns:
+        population ([CompactGenome]): The genomes, without valid fitnesses.
+    """
+    array = np.asarray(array, dtype=index_dtype(table))
+    return [CompactGenome(table, row, fitness_class()) for row in array]
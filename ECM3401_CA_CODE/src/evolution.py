@@ -0,0 +1,121 @@
+"""
+The generational scheme used by the EA (tournament selection, two point crossover,
+mutation and elitism), stored as a library function so that each notebook runs
+the same generation step instead of its own copy
+"""
+import heapq
+import random
+
+def evaluate_invalid(circuits: list, toolbox) -> int:
+    """
+    Evaluates every circuit without a valid fitness value, using the toolbox's
+    batch evaluator (toolbox.evaluate_population) when one is registered.
+
+    Args:
+        circuits ([creator.Individual]): The circuits which may need evaluating.
+        toolbox (base.Toolbox): The DEAP toolbox with an "evaluate" function registered.
+
+    Returns:
+        evaluations (int): The number of circuits that were evaluated.
+    """
+    altered_circuits = [circuit for circuit in circuits if not circuit.fitness.valid]
+    if not altered_circuits:
+        return 0
+
+    if hasattr(toolbox, "evaluate_population"):
+        fitnesses = toolbox.evaluate_population(altered_circuits)
+    else:
+        fitnesses = toolbox.map(toolbox.evaluate, altered_circuits)
+
+    for (circuit, fitness) in zip(altered_circuits, fitnesses):
+        circuit.fitness.values = fitness
+
+    return len(altered_circuits)
+
+def select_elites(population: list, elite_count: int) -> list:
+    """
+    Finds the fittest circuits in a population from their stored fitness values,
+    using a partial selection instead of sorting the whole population.
+
+    Args:
+        population ([creator.Individual]): Circuits which all have a valid fitness.
+        elite_count (int): The number of circuits to select.
+
+    Returns:
+        elites ([creator.Individual]): The elite_count fittest circuits, fittest first.
+    """
+    # The weighted values are maximised by DEAP, whatever the fitness weights are
+    return heapq.nlargest(elite_count, population, key=lambda circuit: circuit.fitness.wvalues)
+
+def generation_step(population: list,
+                    toolbox,
+                    mutation_rate: float,
+                    crossover_rate: float,
+                    elite_count: int,
+                    tournament_size: int) -> (list, object, int):
+    """
+    Creates the next generation of the population, carrying over the elite_count
+    fittest circuits and filling the rest of the population with offspring.
+
+    Args:
+        population ([creator.Individual]): The current generation of circuits. Any
+            circuit without a valid fitness value is evaluated first.
+        toolbox (base.Toolbox): The DEAP toolbox with the "select", "clone", "mate",
+            "mutate" and "evaluate" functions registered, and optionally an
+            "update_cutoff" function which is given the population and elite count
+            before the offspring are evaluated (see bounded_fitness.py).
+        mutation_rate (float): The probability each offspring is mutated.
+        crossover_rate (float): The probability each pair of offspring is crossed over.
+        elite_count (int): The number of circuits carried over by elitism.
+        tournament_size (int): The number of circuits taking part in each tournament.
+
+    Returns:
+        (next_gen_population, best_circuit, evaluations): The next generation of
+            circuits, the fittest circuit in the current generation and the number
+            of fitness evaluations performed.
+    """
+    # Only circuits without a stored fitness value need evaluating, so the rest of
+    # the population is never re-evaluated
+    evaluations = evaluate_invalid(population, toolbox)
+
+    # Selects the individuals to be used in the current generation
+    offspring = toolbox.select(population, len(population), tournament_size)
+    # Clones the selected population so that it can be altered
+    offspring = list(map(toolbox.clone, offspring))
+
+    # The fittest circuits are found from their stored fitness values
+    elites = select_elites(population, max(elite_count, 1))
+    best_circuit = elites[0]
+    next_gen_population = elites[:elite_count]
+
+    # Applies crossover to this generation of circuits
+    for c1, c2 in zip(offspring[::2], offspring[1::2]):
+        if random.random() < crossover_rate:
+            toolbox.mate(c1, c2)
+            # Deletes the fitness values from the parent circuits as they have been
+            # altered (value no longer corresponds to the circuit's actual fitness)
+            del c1.fitness.values
+            del c2.fitness.values
+
+    # Applies mutation to this generation of circuits
+    for child in offspring:
+        if random.random() < mutation_rate:
+            toolbox.mutate(child)
+            # For the aforementioned reason, deletes the circuits fitness value
+            del child.fitness.values
+
+    # Lets a bounded evaluation stop early for offspring which can't beat the elites
+    if hasattr(toolbox, "update_cutoff"):
+        toolbox.update_cutoff(population, elite_count)
+
+    # Re-evaluates the fitness of all individuals that have been altered via
+    # crossover and/or mutation
+    evaluations += evaluate_invalid(offspring, toolbox)
+
+    # Randomly pick circuits from the offspring to fill the rest of the next
+    # generation's population. Each offspring is picked at most once, so there is
+    # less chance duplicate individuals end up in the next generation (sampling
+    # without replacement in linear time, rather than removing each choice)
+    next_gen_population.extend(random.sample(offspring, len(population) - len(next_gen_population)))
+
+    return (next_gen_population, best_circuit, evaluations)
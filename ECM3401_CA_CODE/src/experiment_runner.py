@@ -0,0 +1,227 @@
+"""
+Runs a parameter sweep (such as the population size experiment) without a
+notebook, executing every (value, repeat) run concurrently across a process
+pool. Each finished run is written to its own file, along with the fixed options
+and seed it was run with, so a sweep that is restarted after a crash skips the
+runs that already finished (but runs again any whose options have since changed).
+
+Usage (from the src directory): python experiment_runner.py sweep.json [--processes N]
+
+An example sweep specification:
+    {
+        "run": "run_ea:sweep_run",
+        "parameter": "population_size",
+        "values": [100, 200, 300],
+        "repeats": 10,
+        "seed": 0,
+        "fixed": {"family": "qft", "num_qubits": 3, "num_generations": 100,
+                  "mutation_rate": 0.4, "crossover_rate": 0.7, "elitism_rate": 0.05},
+        "output": "experiment_results/population_size",
+        "summary": "experiment_results/population_size_results.txt"
+    }
+where the run function is called as sweep_run(population_size=value, **fixed) and
+returns the best circuit's (fitness, size). run_ea.sweep_run accepts any option of
+run_ea.DEFAULT_CONFIG, so any of the notebook experiments' parameters can be swept.
+"seeds" may be given instead of "seed" to choose the seed of each repeat explicitly.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+import tempfile
+import concurrent.futures
+import numpy as np
+
+def write_atomically(path: str, contents: str):
+    """
+    Writes a file by writing to a temporary file in the same directory and then
+    renaming it, so the file is either complete or doesn't exist at all.
+
+    Args:
+        path (str): The path of the file being written.
+        contents (str): The text written to the file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(contents)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def load_function(name: str):
+    """Imports and returns a function named in the form "module:function" """
+    module_name, function_name = name.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def sweep_jobs(spec: dict) -> [dict]:
+    """
+    Lists every run in a sweep specification.
+
+    Args:
+        spec (dict): The sweep specification (see the module docstring).
+
+    Returns:
+        jobs ([dict]): The parameter value, repeat number, seed and result file of
+            each run, in the order they appear in the specification.
+    """
+    repeats = spec.get("repeats", 1)
+    seeds = spec.get("seeds")
+    if seeds is None:
+        seeds = [spec.get("seed", 0) + repeat for repeat in range(repeats)]
+    elif len(seeds) != repeats:
+        raise ValueError("The sweep has " + str(repeats) + " repeats but " + str(len(seeds)) + " seeds")
+
+    jobs = []
+    for value in spec["values"]:
+        for repeat in range(repeats):
+            file_name = spec["parameter"] + "=" + str(value) + "_run" + str(repeat) + ".json"
+            jobs.append({"value": value,
+                         "repeat": repeat,
+                         "seed": seeds[repeat],
+                         "path": os.path.join(spec["output"], file_name)})
+
+    return jobs
+
+def run_job(spec: dict, job: dict) -> dict:
+    """
+    Executes and times a single run of a sweep, then stores its result.
+
+    Args:
+        spec (dict): The sweep specification.
+        job (dict): The job being run, as returned by sweep_jobs.
+
+    Returns:
+        result (dict): The job along with the best fitness, best size and run time.
+    """
+    random.seed(job["seed"])
+    np.random.seed(job["seed"])
+    run = load_function(spec["run"])
+    arguments = dict(spec.get("fixed", {}))
+    arguments[spec["parameter"]] = job["value"]
+
+    start = time.perf_counter()
+    best_fitness, best_size = run(**arguments)
+    end = time.perf_counter()
+
+    result = dict(job, run=spec["run"], fixed=spec.get("fixed", {}),
+                  fitness=float(best_fitness), size=int(best_size), time=round(end - start, 5))
+    write_atomically(job["path"], json.dumps(result) + "\n")
+    return result
+
+def stored_result(spec: dict, job: dict) -> dict:
+    """
+    Reads the stored result of a job, if it was run with the sweep's current run
+    function, fixed options and seed.
+
+    Args:
+        spec (dict): The sweep specification.
+        job (dict): The job, as returned by sweep_jobs.
+
+    Returns:
+        result (dict): The stored result, or None if the job hasn't finished or its
+            result came from a run with different options.
+    """
+    if not os.path.exists(job["path"]):
+        return None
+    with open(job["path"]) as file:
+        result = json.load(file)
+
+    # The fixed options are compared as they are stored, in JSON
+    fixed = json.loads(json.dumps(spec.get("fixed", {})))
+    if (result.get("run"), result.get("fixed"), result.get("seed")) != (spec["run"], fixed, job["seed"]):
+        return None
+
+    return result
+
+def load_results(spec: dict) -> [dict]:
+    """Returns the results of every finished run of a sweep, with its current options"""
+    results = []
+    for job in sweep_jobs(spec):
+        result = stored_result(spec, job)
+        if result is not None:
+            results.append(result)
+
+    return results
+
+def summarise(spec: dict) -> str:
+    """
+    Creates a summary in the same format as the notebook experiments, with a line
+    of "average fitness,average size,average time,value" for each parameter value
+    where every repeat has finished.
+
+    Args:
+        spec (dict): The sweep specification.
+
+    Returns:
+        summary (str): The summary, which is also written to spec["summary"] if given.
+    """
+    results = load_results(spec)
+    lines = []
+    for value in spec["values"]:
+        value_results = [result for result in results if result["value"] == value]
+        if len(value_results) < spec.get("repeats", 1):
+            continue
+
+        runs = len(value_results)
+        lines.append(",".join([str(round(sum(result["fitness"] for result in value_results) / runs, 5)),
+                               str(round(sum(result["size"] for result in value_results) / runs, 5)),
+                               str(round(sum(result["time"] for result in value_results) / runs, 5)),
+                               str(value)]) + "\n")
+
+    summary = "".join(lines)
+    if spec.get("summary"):
+        write_atomically(spec["summary"], summary)
+
+    return summary
+
+def run_sweep(spec: dict, processes: int = None) -> [dict]:
+    """
+    Runs every unfinished job in a sweep across a process pool.
+
+    Args:
+        spec (dict): The sweep specification.
+        processes (int): The number of worker processes, which defaults to the
+            number of CPUs.
+
+    Returns:
+        results ([dict]): The results of the jobs run by this call.
+    """
+    # Jobs with a result from the same options finished in an earlier run of the sweep
+    jobs = [job for job in sweep_jobs(spec) if stored_result(spec, job) is None]
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        futures = [executor.submit(run_job, spec, job) for job in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(spec["parameter"] + "=" + str(result["value"]), "run", result["repeat"],
+                  "finished with a fitness of", result["fitness"], "in", result["time"], "seconds")
+
+    summarise(spec)
+    return results
+
+def main(arguments: [str] = None):
+    """Runs the sweep specified by the command line arguments"""
+    parser = argparse.ArgumentParser(description="Runs a parameter sweep of the EA across a process pool")
+    parser.add_argument("spec", help="the path of the sweep specification (a JSON file)")
+    parser.add_argument("--processes", type=int, default=None, help="the number of worker processes")
+    arguments = parser.parse_args(arguments)
+
+    with open(arguments.spec) as file:
+        spec = json.load(file)
+
+    run_sweep(spec, arguments.processes)
+
+if __name__ == "__main__":
+    # Enables run functions in the current directory's modules to be imported
+    sys.path.insert(0, os.getcwd())
+    main()
@@ -0,0 +1,125 @@
+"""
+Memoises the fitness of circuits so that identical circuits (such as the copies
+created by tournament selection and elitism) are only simulated once
+"""
+import functools
+from collections import OrderedDict
+
+# The gate id used to represent a wire, which doesn't change a circuit's unitary
+WIRE_ID = 10
+# The default maximum number of fitness values stored by a FitnessCache
+DEFAULT_MAX_SIZE = 100000
+
+def canonical_key(circuit: [[int, [int]]]) -> ((int, (int,)),):
+    """
+    Creates a hashable key for a circuit which is shared by every circuit with the
+    same unitary because of its wires, by removing all of the wire genes.
+
+    Args:
+        circuit ([[int, [int]]]): The circuit in the list based representation.
+
+    Returns:
+        key (((int, (int,)),)): A tuple of (gate id, qubits) pairs for every gene that
+            isn't a wire, in circuit order.
+    """
+    return tuple((gene[0], tuple(gene[1])) for gene in circuit if gene[0] != WIRE_ID)
+
+class FitnessCache:
+    """
+    A least recently used cache mapping the canonical key of each circuit to its
+    fitness, which counts its hits and misses so its effect on a run can be seen.
+
+    A cache must only be used with one goal matrix and gate set, as these aren't
+    part of the key.
+
+    Args:
+        max_size (int): The maximum number of fitness values stored at once, after
+            which the least recently used value is evicted.
+        key (function): Creates the key of a circuit, which defaults to canonical_key.
+            A CircuitSimplifier's canonical_key also maps circuits that only differ
+            by cancelling gates or the order of commuting gates to the same key.
+    """
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, key=canonical_key):
+        if max_size < 1:
+            raise ValueError("The maximum cache size must be at least 1")
+
+        self.max_size = max_size
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._fitnesses = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fitnesses)
+
+    def evaluate(self, evaluate, circuit: [[int, [int]]], *args, **kwargs) -> (float,):
+        """
+        Returns the cached fitness of a circuit, only calling the evaluation function
+        (and storing its result) if an equivalent circuit hasn't been evaluated.
+
+        Args:
+            evaluate (function): The evaluation function, such as circuit_fitness.
+            circuit ([[int, [int]]]): The circuit being evaluated.
+            *args, **kwargs: Any further arguments passed on to the evaluation function.
+
+        Returns:
+            (fitness,): The fitness tuple returned by the evaluation function.
+        """
+        key = self.key(circuit)
+        fitness = self._fitnesses.get(key)
+        if fitness is not None:
+            self.hits += 1
+            # Marks the fitness as the most recently used value
+            self._fitnesses.move_to_end(key)
+            return fitness
+
+        self.misses += 1
+        fitness = tuple(evaluate(circuit, *args, **kwargs))
+        self._fitnesses[key] = fitness
+        # Evicts the least recently used fitness once the cache is full
+        if len(self._fitnesses) > self.max_size:
+            self._fitnesses.popitem(last=False)
+            self.evictions += 1
+
+        return fitness
+
+    def wrap(self, evaluate):
+        """
+        Wraps an evaluation function so that every call goes through the cache, which
+        enables it to be registered with the DEAP toolbox in place of the function, e.g.
+        toolbox.register("evaluate", cache.wrap(circuit_fitness), gate_set=gate_set, ...)
+
+        Args:
+            evaluate (function): The evaluation function, such as circuit_fitness.
+
+        Returns:
+            cached_evaluate (function): A function with the same arguments as evaluate.
+        """
+        @functools.wraps(evaluate)
+        def cached_evaluate(circuit, *args, **kwargs):
+            return self.evaluate(evaluate, circuit, *args, **kwargs)
+
+        return cached_evaluate
+
+    def statistics(self) -> dict:
+        """
+        Returns the cache's counters, which can be recorded alongside the logbook.
+
+        Returns:
+            statistics ({str: float}): The number of hits, misses and evictions, the
+                hit rate and the number of fitness values currently stored.
+        """
+        lookups = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._fitnesses)}
+
+    def clear(self):
+        """Removes every stored fitness value and resets the counters"""
+        self._fitnesses.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -0,0 +1,70 @@
+"""
+The distance measures which can be used as the EA's fitness, comparing a circuit's
+unitary matrix against the target's. Every metric is minimised (0 is a perfect
+match) and is calculated with NumPy over the last two axes, so the same function
+evaluates one 2^n x 2^n matrix or a (circuits, 2^n, 2^n) stack of them at once.
+"""
+import numpy as np
+
+def l1_distance(unitaries: np.ndarray, target_matrix: np.ndarray) -> np.ndarray:
+    """The sum of the absolute element to element difference (the EA's original fitness)"""
+    return np.abs(unitaries - target_matrix).sum(axis=(-2, -1))
+
+def frobenius_distance(unitaries: np.ndarray, target_matrix: np.ndarray) -> np.ndarray:
+    """The Frobenius norm of the difference (the square root of the summed squared differences)"""
+    return np.linalg.norm(unitaries - target_matrix, axis=(-2, -1))
+
+def process_infidelity(unitaries: np.ndarray, target_matrix: np.ndarray) -> np.ndarray:
+    """
+    One minus the process fidelity |Tr(T^dagger U)| / 2^n, which is 0 for any circuit
+    matching the target up to a global phase, so such circuits aren't penalised.
+    """
+    dimension = target_matrix.shape[-1]
+    # Tr(T^dagger U) is the sum of the element-wise product of conj(T) and U
+    overlap = np.einsum("ij,...ij->...", np.conj(target_matrix), unitaries)
+    # Rounding errors can take the fidelity of a perfect match just above 1
+    return np.maximum(1 - np.abs(overlap) / dimension, 0.0)
+
+# The metrics which can be chosen by name when registering the evaluation function
+METRICS = {"l1": l1_distance,
+           "frobenius": frobenius_distance,
+           "fidelity": process_infidelity}
+
+def get_metric(metric):
+    """
+    Returns the function of a metric chosen by name (a key of METRICS), or the
+    metric itself if a function was provided.
+    """
+    if callable(metric):
+        return metric
+    if metric not in METRICS:
+        raise ValueError("Unknown fitness metric " + repr(metric) + ", expected one of " + str(list(METRICS)))
+    return METRICS[metric]
+
+def circuit_distance(unitary: np.ndarray, target_matrix: np.ndarray, metric="l1") -> float:
+    """
+    Calculates a single circuit's fitness with the chosen metric.
+
+    Args:
+        unitary (np.ndarray): The circuit's 2^n x 2^n unitary matrix.
+        target_matrix (np.ndarray): The goal circuit's unitary matrix.
+        metric (str or function): The name of a metric in METRICS, or a metric function.
+
+    Returns:
+        fitness (float): The distance between the circuit and the goal.
+    """
+    return float(get_metric(metric)(np.asarray(unitary), np.asarray(target_matrix)))
+
+def batch_distances(unitaries: np.ndarray, target_matrix: np.ndarray, metric="l1") -> np.ndarray:
+    """
+    Calculates the fitness of a stack of circuits with the chosen metric.
+
+    Args:
+        unitaries (np.ndarray): A (circuits, 2^n, 2^n) stack of unitary matrices.
+        target_matrix (np.ndarray): The goal circuit's unitary matrix.
+        metric (str or function): The name of a metric in METRICS, or a metric function.
+
+    Returns:
+        fitnesses (np.ndarray): The distance between each circuit and the goal.
+    """
+    return get_metric(metric)(np.asarray(unitaries), np.asarray(target_matrix))
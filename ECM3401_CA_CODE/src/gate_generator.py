@@ -0,0 +1,160 @@
+"""
+Generates the gate set and set of possible gates for any number of qubits from
+a gate family specification, replacing the hand-written qgate_set/qpossible_gates
+and ggate_set/gpossible_gates lists when scaling the EA to more qubits
+"""
+import math
+import itertools
+import numpy as np
+
+# The gate id used to represent a wire, which is never given to a gate
+WIRE_ID = 10
+
+# The gates making up each family, in the order their ids are given, which matches
+# the gate ids used by qft_circuits.py and grover_circuits.py
+FAMILIES = {"qft": ("h", "swap", "cphase"),
+            "grover": ("h", "x", "mcz", "mcx", "u3")}
+
+def _single_qubit_gate(name: str):
+    """Returns a function creating the named single qubit gate"""
+    def create(num_qubits: int) -> list:
+        from qiskit.circuit.library import HGate, XGate, U3Gate
+        gates = {"h": HGate, "x": XGate, "u3": lambda: U3Gate(math.pi/2, 0, math.pi)}
+        return [(gates[name](), 1)]
+    return create
+
+def _swap_gates(num_qubits: int) -> list:
+    from qiskit.circuit.library import SwapGate
+    return [(SwapGate(), 2)]
+
+def _cphase_gates(num_qubits: int) -> list:
+    # A QFT on n qubits uses the rotations pi/2 to pi/2^(n-1)
+    from qiskit.circuit.library import CPhaseGate
+    return [(CPhaseGate(math.pi / 2**k), 2) for k in range(1, num_qubits)]
+
+def _cx_gates(num_qubits: int) -> list:
+    from qiskit.circuit.library import CXGate
+    return [(CXGate(), 2)]
+
+def _mcz_gates(num_qubits: int) -> list:
+    from qiskit.circuit.library import ZGate
+    return [(ZGate().control(num_qubits - 1), num_qubits)]
+
+def _mcx_gates(num_qubits: int) -> list:
+    from qiskit.circuit.library import MCXGate
+    return [(MCXGate(num_qubits - 1), num_qubits)]
+
+# For each kind of gate, a function creating its gates (with the number of qubits
+# each acts on), and which of its qubits can be reordered without changing the
+# gate: "all" for fully symmetric gates, "controls" for gates where only the
+# last qubit (the target) is distinguished, and "none" otherwise
+GATE_KINDS = {"h": (_single_qubit_gate("h"), "all"),
+              "x": (_single_qubit_gate("x"), "all"),
+              "u3": (_single_qubit_gate("u3"), "all"),
+              "swap": (_swap_gates, "all"),
+              "cphase": (_cphase_gates, "all"),
+              "cx": (_cx_gates, "none"),
+              "mcz": (_mcz_gates, "all"),
+              "mcx": (_mcx_gates, "controls")}
+
+def qubit_placements(num_qubits: int, gate_qubits: int, symmetry: str, prune_symmetric: bool) -> [[int]]:
+    """
+    Lists every ordered choice of qubits a gate can be applied to.
+
+    Args:
+        num_qubits (int): The number of qubits used by the circuits.
+        gate_qubits (int): The number of qubits the gate acts on.
+        symmetry (str): Which of the gate's qubits can be reordered ("all",
+            "controls" or "none").
+        prune_symmetric (bool): Whether only one ordering of qubits that can be
+            reordered is kept.
+
+    Returns:
+        placements ([[int]]): The qubits of each placement, in the order they are
+            passed to QuantumCircuit.append.
+    """
+    placements = itertools.permutations(range(num_qubits), gate_qubits)
+    if prune_symmetric and symmetry == "all":
+        placements = itertools.combinations(range(num_qubits), gate_qubits)
+    elif prune_symmetric and symmetry == "controls":
+        placements = (placement for placement in placements if list(placement[:-1]) == sorted(placement[:-1]))
+
+    return [list(placement) for placement in placements]
+
+class GateTable:
+    """
+    A gate set along with every possible gate (gene), which can be referred to by
+    its index in possible_gates, e.g. by a genome stored as an array of indices.
+
+    Args:
+        gate_set ({int: Gate}): Maps each gate id to its Qiskit gate (or "WIRE").
+        possible_gates ([[int, [int]]]): Every gene that can appear in a circuit.
+    """
+    def __init__(self, gate_set: dict, possible_gates: [[int, [int]]]):
+        self.gate_set = gate_set
+        self.possible_gates = possible_gates
+        # The gate id and the qubits of each possible gate as arrays, where the
+        # qubits are padded with -1 up to the largest number of qubits
+        width = max(len(gene[1]) for gene in possible_gates)
+        self.gate_ids = np.array([gene[0] for gene in possible_gates], dtype=np.int16)
+        self.qubits = np.full((len(possible_gates), width), -1, dtype=np.int16)
+        for index, gene in enumerate(possible_gates):
+            self.qubits[index, :len(gene[1])] = gene[1]
+        self._indices = {(gene[0], tuple(gene[1])): index for index, gene in enumerate(possible_gates)}
+
+    def __len__(self) -> int:
+        return len(self.possible_gates)
+
+    def index(self, gene: [int, [int]]) -> int:
+        """Returns the index of a gene in possible_gates"""
+        return self._indices[(gene[0], tuple(gene[1]))]
+
+def generate_gate_table(num_qubits: int,
+                        family,
+                        prune_symmetric: bool = True,
+                        structured: bool = False) -> GateTable:
+    """
+    Generates the gate set and set of possible gates for a gate family.
+
+    Args:
+        num_qubits (int): The number of qubits used by the circuits.
+        family (str or (str,)): The name of a family in FAMILIES ("qft" or "grover"),
+            or the names of the kinds of gate in GATE_KINDS to use.
+        prune_symmetric (bool): Whether orderings of qubits that don't change a gate
+            (such as SWAP [0, 1] and [1, 0]) are only included once.
+        structured (bool): Whether gates are only placed where they appear in the
+            family's circuits, which keeps the set of possible gates small. For
+            the QFT, each rotation pi/2^k only acts on qubits k apart and SWAPs
+            only act on mirrored qubits (as in qpossible_gates_1 to 3).
+
+    Returns:
+        table (GateTable): The gate set (gate ids start at 1, skipping WIRE_ID,
+            which is the wire) and the possible gates, including one wire per qubit.
+    """
+    kinds = FAMILIES[family] if isinstance(family, str) else tuple(family)
+    structured_qft = structured and "cphase" in kinds
+
+    gate_set = {}
+    possible_gates = []
+    gate_id = 1
+    for kind in kinds:
+        create, symmetry = GATE_KINDS[kind]
+        for rotation, (gate, gate_qubits) in enumerate(create(num_qubits), start=1):
+            if gate_qubits > num_qubits or (gate_qubits > 1 and num_qubits < 2):
+                raise ValueError("A " + kind + " gate can't be used with " + str(num_qubits) + " qubit(s)")
+            if gate_id == WIRE_ID:
+                gate_id += 1
+            gate_set[gate_id] = gate
+
+            for placement in qubit_placements(num_qubits, gate_qubits, symmetry, prune_symmetric):
+                if structured_qft and kind == "cphase" and placement[1] - placement[0] != rotation:
+                    continue
+                if structured_qft and kind == "swap" and placement[0] + placement[1] != num_qubits - 1:
+                    continue
+                possible_gates.append([gate_id, placement])
+            gate_id += 1
+
+    gate_set[WIRE_ID] = "WIRE"
+    possible_gates.extend([WIRE_ID, [qubit]] for qubit in range(num_qubits))
+
+    return GateTable(gate_set, possible_gates)
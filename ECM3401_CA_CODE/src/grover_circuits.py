@@ -2,10 +2,12 @@
 Stores and displays each of the Grover's Search Algorithm circuits used to
 test the EA
 """
+import os
 import math
-from qiskit import QuantumCircuit
-from qiskit.circuit.library import ZGate, GroverOperator, MCMT, HGate, XGate, CZGate, CXGate, U3Gate, CCZGate, CCXGate, MCXGate
-import qiskit.quantum_info as qi
+from target_registry import TARGETS
+
+# The directory the circuit diagrams are saved in, next to this file
+DIAGRAM_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grover_circuits")
 
 def grovers_algorithm_oracle(states):
     """Builds an oracle for the Grover's Search algorithm that amplifies one or more marked states.
@@ -19,6 +21,9 @@ def grovers_algorithm_oracle(states):
         circuit (QuantumCircuit): The quantum circuit representing the Grover oracle.
     """
 
+    from qiskit import QuantumCircuit
+    from qiskit.circuit.library import ZGate, MCMT
+
     if not isinstance(states, list):
         states = [states]
     
@@ -49,13 +54,30 @@ def optimal_applications(num_qubits, num_marked_states):
     """
     return math.floor(math.pi / (4 * math.asin(math.sqrt(num_marked_states / 2**num_qubits))))
 
-# A gate set which contains exactly all the circuits required to create a
-# fully decomposed Grovers circuit
-ggate_set1 = {1:HGate(), 2:XGate(), 3:CZGate(), 4:CXGate(), 5:U3Gate(math.pi/2, 0, math.pi), 10:"WIRE"}
+def create_gate_set(num_qubits: int) -> dict:
+    """
+    Creates a gate set which contains exactly all the circuits required to create a
+    fully decomposed Grovers circuit on 2, 3 or 4 qubits.
 
-ggate_set2 = {1:HGate(), 2:XGate(), 3:CCZGate(), 4:CCXGate(), 5:U3Gate(math.pi/2, 0, math.pi), 10:"WIRE"}
-# Need to make a custom CZ gate to accommodate 3 or more control qubits
-ggate_set3 = {1:HGate(), 2:XGate(), 3:MCMT('z', num_ctrl_qubits=3, num_target_qubits=1), 4:MCXGate(num_ctrl_qubits=3), 5:U3Gate(math.pi/2, 0, math.pi), 10:"WIRE"}
+    Args:
+        num_qubits (int): The number of qubits used by the circuits.
+
+    Returns:
+        gate_set ({int: Gate}): A dictionary where the key value pair is the indexes
+            and the Qiskit gate.
+    """
+    # Qiskit is only imported once a gate set is used, so importing the sets of
+    # possible gates (plain lists) stays cheap
+    from qiskit.circuit.library import MCMT, HGate, XGate, CZGate, CXGate, U3Gate, CCZGate, CCXGate, MCXGate
+    if num_qubits == 2:
+        controlled_gates = {3:CZGate(), 4:CXGate()}
+    elif num_qubits == 3:
+        controlled_gates = {3:CCZGate(), 4:CCXGate()}
+    else:
+        # Need to make a custom CZ gate to accommodate 3 or more control qubits
+        controlled_gates = {3:MCMT('z', num_ctrl_qubits=3, num_target_qubits=1), 4:MCXGate(num_ctrl_qubits=3)}
+
+    return {1:HGate(), 2:XGate(), **controlled_gates, 5:U3Gate(math.pi/2, 0, math.pi), 10:"WIRE"}
 
 gpossible_gates_1 = [[1, [0]],
                    [1, [1]],
@@ -133,66 +155,95 @@ gpossible_gates_3 = [[1, [0]],
                     [10, [2]],
                     [10, [3]]]
 
-# The marked states for each of the three circuits respectively
-marked_states1 = ["10"]
-marked_states2 = ["011", "100"]
-marked_states3 = ["0000", "1010"]
-
-# Creates a base oracle circuit to be used to create each of the
-# three circuits respectively
-oracle1 = grovers_algorithm_oracle(marked_states1)
-oracle2 = grovers_algorithm_oracle(marked_states2)
-oracle3 = grovers_algorithm_oracle(marked_states3)
-
-# Takes each of the three oracle circuits and returns a circuit that is
-# composed of the oracle circuit and a circuit that amplifies the marked
-# states
-circuit1 = GroverOperator(oracle1)
-circuit2 = GroverOperator(oracle2)
-circuit3 = GroverOperator(oracle3)
-
-# A 2-Qubit Grover's Search circuit, 'initialised' as an empty 2-qubit circuit
-grover_circuit1 = QuantumCircuit(2)
-# A 3-Qubit Grover's Search circuit, 'initialised' as an empty 3-qubit circuit
-grover_circuit2 = QuantumCircuit(3)
-# A 4-Qubit Grover's Search circuit, 'initialised' as an empty 4-qubit circuit
-grover_circuit3 = QuantumCircuit(4)
-
-# Complete Grover circuits start with a Hadamard gate to create an even
-# superposition of all the basis states
-# Therefore, Hadamard gates are added to the start of each of the circuits
-grover_circuit1.h(range(circuit1.num_qubits))
-grover_circuit2.h(range(circuit2.num_qubits))
-grover_circuit3.h(range(circuit3.num_qubits))
-
-
-# Applies the Grover operator the optimal number of times for each circuit
-grover_circuit1.compose(circuit1.power(optimal_applications(2, len(marked_states1))), inplace=True)
-grover_circuit2.compose(circuit2.power(optimal_applications(3, len(marked_states2))), inplace=True)
-grover_circuit3.compose(circuit3.power(optimal_applications(4, len(marked_states3))), inplace=True)
-
-# Gets the unitary matrix representing each of the circuits
-grover_matrix1 = qi.Operator(grover_circuit1)
-grover_matrix1 = grover_matrix1.data
-grover_matrix2 = qi.Operator(grover_circuit2)
-grover_matrix2 = grover_matrix2.data
-grover_matrix3 = qi.Operator(grover_circuit3)
-grover_matrix3 = grover_matrix3.data
-
-# As this program is not being stored as a Jupyter Notebook, all images are
-# stored in a specific directory instead of being displayed on screen
-
-# Formats the matrix representing the first circuit and saves the example
-# 2 qubit circuit to a file named "2qubit_circuit.pdf"
-print(grover_circuit1.decompose().decompose().size())
-grover_circuit1.decompose().decompose().draw(output="latex", filename="grover_circuits/2qubit_circuit.pdf", style="iqp")
-
-# Formats the matrix representing the second circuit and saves the example
-# 3 qubit circuit to a file named "3qubit_circuit.pdf"
-print(grover_circuit2.decompose().decompose().size())
-grover_circuit2.decompose().decompose().draw(output="latex", filename="grover_circuits/3qubit_circuit.pdf", style="iqp")
-
-# Formats the matrix representing the third circuit and saves the example
-# 4 qubit circuit to a file named "4qubit_circuit.pdf"
-print(grover_circuit3.decompose().decompose().size())
-grover_circuit3.decompose().decompose().draw(output="latex", filename="grover_circuits/4qubit_circuit.pdf", style="iqp")
\ No newline at end of file
+# The marked states for each of the three circuits respectively, which are
+# stored with the construction parameters of each target in the target registry
+marked_states1 = TARGETS["grover_matrix1"][1]["marked_states"]
+marked_states2 = TARGETS["grover_matrix2"][1]["marked_states"]
+marked_states3 = TARGETS["grover_matrix3"][1]["marked_states"]
+
+def build_grover_circuit(marked_states: [str]) -> "QuantumCircuit":
+    """
+    Creates a complete Grover's Search circuit which amplifies the marked states.
+
+    Args:
+        marked_states ([str]): The marked states, which all have one bit per qubit.
+
+    Returns:
+        grover_circuit (QuantumCircuit): The circuit, made up of a Hadamard gate on
+            each qubit followed by the optimal number of Grover operators.
+    """
+    from qiskit import QuantumCircuit
+    from qiskit.circuit.library import GroverOperator
+
+    num_qubits = len(marked_states[0])
+    # Takes the oracle circuit and returns a circuit that is composed of the oracle
+    # circuit and a circuit that amplifies the marked states
+    grover_operator = GroverOperator(grovers_algorithm_oracle(marked_states))
+
+    grover_circuit = QuantumCircuit(num_qubits)
+    # Complete Grover circuits start with a Hadamard gate to create an even
+    # superposition of all the basis states
+    grover_circuit.h(range(num_qubits))
+    # Applies the Grover operator the optimal number of times
+    grover_circuit.compose(grover_operator.power(optimal_applications(num_qubits, len(marked_states))), inplace=True)
+
+    return grover_circuit
+
+# The gate sets (ggate_set1 to ggate_set3), base oracle circuits (oracle1 to oracle3),
+# Grover operators (circuit1 to circuit3), complete circuits (grover_circuit1 to
+# grover_circuit3) and their unitary matrices (grover_matrix1 to grover_matrix3) are
+# only created the first time they are used
+_grover_circuits = {}
+
+def __getattr__(name: str):
+    """Creates the gate sets, Grover's Search circuits and unitary matrices when they are first accessed"""
+    if name in _grover_circuits:
+        return _grover_circuits[name]
+
+    prefix, number = name[:-1], name[-1:]
+    if number not in ("1", "2", "3") or prefix not in ("ggate_set", "oracle", "circuit", "grover_circuit", "grover_matrix"):
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+    marked_states = globals()["marked_states" + number]
+    if prefix == "ggate_set":
+        # Each gate set is only created once, so compiled gate sets (which are
+        # stored against the gate set's id) stay valid
+        value = create_gate_set(len(marked_states[0]))
+    elif prefix == "oracle":
+        value = grovers_algorithm_oracle(marked_states)
+    elif prefix == "circuit":
+        from qiskit.circuit.library import GroverOperator
+        value = GroverOperator(__getattr__("oracle" + number))
+    elif prefix == "grover_circuit":
+        value = build_grover_circuit(marked_states)
+    else:
+        from target_registry import target_matrix
+        return target_matrix(name)
+
+    _grover_circuits[name] = value
+    return value
+
+# Wildcard imports still provide the gate sets, circuits and matrices, but explicitly
+# importing only the sets of possible gates doesn't create them (or import Qiskit)
+__all__ = ["grovers_algorithm_oracle", "optimal_applications", "build_grover_circuit",
+           "ggate_set1", "ggate_set2", "ggate_set3",
+           "gpossible_gates_1", "gpossible_gates_2", "gpossible_gates_3",
+           "marked_states1", "marked_states2", "marked_states3"]
+__all__ += [prefix + number for prefix in ("oracle", "circuit", "grover_circuit", "grover_matrix")
+            for number in ("1", "2", "3")]
+
+def draw_circuits():
+    """
+    As this program is not being stored as a Jupyter Notebook, all images are
+    stored in a specific directory instead of being displayed on screen.
+    The decomposed size of each circuit is printed and its diagram is saved into
+    the grover_circuits directory, e.g. the 2 qubit circuit is saved to a file
+    named "2qubit_circuit.pdf"
+    """
+    for number, num_qubits in (("1", 2), ("2", 3), ("3", 4)):
+        grover_circuit = __getattr__("grover_circuit" + number)
+        print(grover_circuit.decompose().decompose().size())
+        grover_circuit.decompose().decompose().draw(output="latex", filename=os.path.join(DIAGRAM_DIRECTORY, str(num_qubits) + "qubit_circuit.pdf"), style="iqp")
+
+if __name__ == "__main__":
+    draw_circuits()
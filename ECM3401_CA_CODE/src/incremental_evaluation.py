@@ -0,0 +1,162 @@
+"""
+Re-evaluates circuits after mutation and crossover by reusing cached prefix and
+suffix products of the unitary matrix of the circuit they were cloned from, so
+only the genes between the first and last altered positions are re-applied
+"""
+import numpy as np
+from unitary_engine import compile_gate_set
+from fitness_metrics import circuit_distance
+
+# Prefix and suffix products are stored at every DEFAULT_INTERVAL-th position,
+# which bounds each cache to 2 * (length / interval + 1) matrices
+DEFAULT_INTERVAL = 4
+# The cache is rebuilt for the current circuit once the re-applied segment covers
+# more than this fraction of the circuit
+DEFAULT_REFRESH_FRACTION = 0.5
+
+def gene_key(gene: [int, [int]]) -> (int, (int,)):
+    """Returns a hashable version of a gene which can be compared with other genes"""
+    return (gene[0], tuple(gene[1]))
+
+class UnitaryCache:
+    """
+    Stores the prefix products P_i = G_{i-1}...G_0 and suffix products
+    S_i = G_{L-1}...G_i of a circuit's unitary at every interval-th position i,
+    together with the genes of the circuit they were calculated for.
+
+    The unitary of any circuit of the same length is S_hi * (G_{hi-1}...G_lo) * P_lo,
+    where lo and hi are the stored positions surrounding every gene that differs
+    from the cached circuit, so a point mutation with an interval of 1 costs a
+    single gate application and matrix multiplication.
+
+    A cache is never modified after it is built, so clones of an individual share
+    the same cache (toolbox.clone doesn't copy it). As the cache is checked against
+    the genes it was built for rather than the individual's fitness, it stays
+    correct after del circuit.fitness.values and any later change to the circuit.
+
+    Args:
+        circuit ([[int, [int]]]): The circuit in the list based representation.
+        compiled (CompiledGateSet): The compiled gate set used by the circuit.
+        interval (int): The number of genes between each stored product.
+    """
+    def __init__(self, circuit: [[int, [int]]], compiled, interval: int = DEFAULT_INTERVAL):
+        if interval < 1:
+            raise ValueError("The cache interval must be at least 1")
+
+        self.compiled = compiled
+        self.interval = interval
+        self.genes = [gene_key(gene) for gene in circuit]
+        # The positions of each stored product, the last of which is the circuit length
+        self.positions = list(range(0, len(circuit), interval)) + [len(circuit)]
+
+        identity = np.eye(compiled.dimension, dtype=complex)
+        # The product of the genes between each pair of neighbouring positions
+        blocks = [compiled.apply_circuit(identity, circuit[start:end])
+                  for start, end in zip(self.positions, self.positions[1:])]
+
+        self.prefixes = [identity]
+        for block in blocks:
+            self.prefixes.append(block @ self.prefixes[-1])
+
+        self.suffixes = [identity]
+        for block in reversed(blocks):
+            self.suffixes.append(self.suffixes[-1] @ block)
+        self.suffixes.reverse()
+
+        self.unitary = self.prefixes[-1]
+
+    def __deepcopy__(self, memo: dict):
+        # The cache is immutable, so clones of an individual share it
+        return self
+
+    def changed_segment(self, circuit: [[int, [int]]]) -> (int, int):
+        """
+        Finds the stored positions surrounding every gene that differs between the
+        provided circuit and the circuit the cache was built for.
+
+        Args:
+            circuit ([[int, [int]]]): A circuit with the same length as the cached one.
+
+        Returns:
+            (lo, hi): The indexes of the surrounding stored positions, or None if the
+                circuit is unchanged.
+        """
+        changed = [index for index, gene in enumerate(circuit)
+                   if gene_key(gene) != self.genes[index]]
+        if not changed:
+            return None
+
+        lo = changed[0] // self.interval
+        # The end of the segment is rounded up to the next stored position
+        hi = min(-(-(changed[-1] + 1) // self.interval), len(self.positions) - 1)
+        return (lo, hi)
+
+    def unitary_for(self, circuit: [[int, [int]]]) -> (np.ndarray, int):
+        """
+        Calculates the unitary of a circuit by only re-applying the changed segment.
+
+        Args:
+            circuit ([[int, [int]]]): A circuit with the same length as the cached one.
+
+        Returns:
+            (unitary, reapplied): The circuit's unitary matrix and the number of genes
+                which had to be re-applied to calculate it.
+        """
+        segment = self.changed_segment(circuit)
+        if segment is None:
+            return (self.unitary, 0)
+
+        lo, hi = segment
+        start, end = self.positions[lo], self.positions[hi]
+        unitary = self.compiled.apply_circuit(self.prefixes[lo], circuit[start:end])
+        # The suffix at the end of the circuit is the identity
+        if hi != len(self.positions) - 1:
+            unitary = self.suffixes[hi] @ unitary
+
+        return (unitary, end - start)
+
+def incremental_circuit_fitness(current_circuit: [[int, [int, int]]],
+                                gate_set: dict,
+                                target_matrix: [[float]],
+                                num_qubits: int,
+                                interval: int = DEFAULT_INTERVAL,
+                                refresh_fraction: float = DEFAULT_REFRESH_FRACTION,
+                                metric: str = "l1") -> (float,):
+    """
+    Calculates the same fitness as circuit_fitness, using (and storing) the
+    UnitaryCache held by the individual in its unitary_cache attribute.
+
+    Args:
+        current_circuit ([[int, [int, int]]]): The circuit being evaluated, which must
+            be an object that accepts attributes (such as a creator.Individual).
+        gate_set ({int: Gate}): The complete gate set for the current algorithm and
+            number of qubits.
+        target_matrix ([[float]]): The matrix representing the goal circuit.
+        num_qubits (int): The number of qubits being used by the circuit.
+        interval (int): The number of genes between each stored product when a new
+            cache is built, trading memory for re-evaluation cost.
+        refresh_fraction (float): A new cache is built for the circuit when the
+            re-applied segment is longer than this fraction of the circuit.
+        metric (str): The name of the distance measure used as the fitness (see
+            fitness_metrics.py), or a metric function.
+
+    Returns:
+        (fitness,): The distance between the circuit's unitary matrix and the target
+            matrix, by default the sum of the absolute element to element difference.
+    """
+    compiled = compile_gate_set(gate_set, num_qubits)
+    cache = getattr(current_circuit, "unitary_cache", None)
+
+    if (cache is None or cache.compiled is not compiled
+            or len(cache.genes) != len(current_circuit)):
+        cache = UnitaryCache(current_circuit, compiled, interval)
+        current_circuit.unitary_cache = cache
+        unitary = cache.unitary
+    else:
+        unitary, reapplied = cache.unitary_for(current_circuit)
+        # Rebuilds the cache once the circuit has drifted too far from it, so
+        # the segment re-applied by later offspring stays short
+        if reapplied > refresh_fraction * len(current_circuit):
+            current_circuit.unitary_cache = UnitaryCache(current_circuit, compiled, cache.interval)
+
+    return (circuit_distance(unitary, target_matrix, metric),)
@@ -0,0 +1,169 @@
+"""
+An island model version of the EA, where several sub-populations (islands) are
+evolved in separate processes with the usual generational scheme, and every few
+generations the fittest circuits of each island migrate to its neighbours
+"""
+import random
+import multiprocessing
+from deap import tools
+from evolution import generation_step, select_elites
+
+def ring_topology(num_islands: int) -> {int: [int]}:
+    """Each island sends its migrants to the next island, with the last sending to the first"""
+    return {island: [(island + 1) % num_islands] for island in range(num_islands)
+            if num_islands > 1}
+
+def fully_connected_topology(num_islands: int) -> {int: [int]}:
+    """Each island sends its migrants to every other island"""
+    return {island: [other for other in range(num_islands) if other != island]
+            for island in range(num_islands)}
+
+# The topologies which can be chosen by name when running the island model
+TOPOLOGIES = {"ring": ring_topology, "full": fully_connected_topology}
+
+# The toolbox created by each worker process when it starts
+_island_state = {}
+
+def _initialise_island_worker(toolbox_factory):
+    """Creates the DEAP toolbox used by every island evolved in a worker process"""
+    _island_state["toolbox"] = toolbox_factory()
+
+def _evolve_island(arguments: tuple) -> (list, [dict], object):
+    """
+    Runs the generational scheme on one island for a number of generations.
+
+    Args:
+        arguments (tuple): The island's population, the number of generations, the
+            generation_step parameters and the island's random number generator state.
+
+    Returns:
+        (population, records, random_state): The island's evolved population, the
+            fittest circuit's fitness (and weighted fitness) and number of evaluations
+            for each generation,
+            and the random number generator state to continue from next time.
+    """
+    population, generations, parameters, random_state = arguments
+    toolbox = _island_state["toolbox"]
+    random.setstate(random_state)
+
+    records = []
+    for gen in range(0, generations):
+        population, best_circuit, evaluations = generation_step(population, toolbox, *parameters)
+        records.append({"best": best_circuit.fitness.values[0], "wvalues": best_circuit.fitness.wvalues,
+                        "evaluations": evaluations})
+
+    return (population, records, random.getstate())
+
+def migrate(populations: [list], topology: {int: [int]}, migration_size: int, toolbox):
+    """
+    Copies the migration_size fittest circuits of each island to each of its neighbours,
+    where they replace the least fit circuits. Every island's migrants are chosen
+    before any of them arrive, so circuits only move one step per migration.
+
+    Args:
+        populations ([[creator.Individual]]): The population of each island, which
+            all have valid fitness values.
+        topology ({int: [int]}): The islands each island sends its migrants to.
+        migration_size (int): The number of circuits sent to each neighbour.
+        toolbox (base.Toolbox): The DEAP toolbox with the "clone" function registered.
+    """
+    migrants = {island: select_elites(populations[island], migration_size) for island in topology}
+
+    for island, neighbours in topology.items():
+        for neighbour in neighbours:
+            population = populations[neighbour]
+            # Finds the least fit circuits of the neighbour, which are replaced
+            population.sort(key=lambda circuit: circuit.fitness.wvalues)
+            for i, migrant in enumerate(migrants[island][:len(population)]):
+                population[i] = toolbox.clone(migrant)
+
+def run_islands(toolbox_factory,
+                num_islands: int,
+                island_size: int,
+                num_generations: int,
+                mutation_rate: float,
+                crossover_rate: float,
+                elite_count: int,
+                tournament_size: int,
+                migration_interval: int = 10,
+                migration_size: int = 5,
+                topology: str = "ring",
+                processes: int = None,
+                seed: int = None) -> ([list], tools.Logbook, object):
+    """
+    Evolves num_islands populations in parallel, migrating the fittest circuits
+    between them every migration_interval generations.
+
+    Args:
+        toolbox_factory (function): A function (defined at the top level of a module,
+            so it can be sent to the worker processes) which creates the creator
+            classes if needed, and returns a toolbox with the "population", "select",
+            "clone", "mate", "mutate" and "evaluate" functions registered.
+        num_islands (int): The number of sub-populations.
+        island_size (int): The number of circuits in each sub-population.
+        num_generations (int): The number of generations each island is evolved for.
+        mutation_rate (float): The probability each offspring is mutated.
+        crossover_rate (float): The probability each pair of offspring is crossed over.
+        elite_count (int): The number of circuits carried over by elitism on each island.
+        tournament_size (int): The number of circuits taking part in each tournament.
+        migration_interval (int): The number of generations between each migration.
+        migration_size (int): The number of circuits each island sends to each neighbour.
+        topology (str): The name of the topology in TOPOLOGIES ("ring" or "full").
+        processes (int): The number of worker processes, which defaults to one per island.
+        seed (int): Seeds each island's random number generator (island i uses seed + i),
+            which creates its initial population and then evolves it.
+
+    Returns:
+        (populations, logbook, best_circuit): The final population of each island, a
+            logbook with the best fitness across all islands and the total number of
+            evaluations for every generation, and the fittest circuit found.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError("Unknown topology " + repr(topology) + ", expected one of " + str(list(TOPOLOGIES)))
+
+    toolbox = toolbox_factory()
+    connections = TOPOLOGIES[topology](num_islands)
+    parameters = (mutation_rate, crossover_rate, elite_count, tournament_size)
+
+    # Each island has its own random number generator, which also creates its initial
+    # population (through the global generator, as used by toolbox.population), so
+    # runs with the same seed can be repeated
+    caller_state = random.getstate()
+    populations = []
+    random_states = []
+    for island in range(num_islands):
+        random.setstate(random.Random(None if seed is None else seed + island).getstate())
+        populations.append(toolbox.population(n=island_size))
+        random_states.append(random.getstate())
+    random.setstate(caller_state)
+
+    logbook = tools.Logbook()
+    logbook.header = "gen", "best", "evaluations", "islands"
+    gen = 0
+    with multiprocessing.Pool(processes or num_islands,
+                              initializer=_initialise_island_worker,
+                              initargs=(toolbox_factory,)) as pool:
+        while gen < num_generations:
+            generations = min(migration_interval, num_generations - gen)
+            results = pool.map(_evolve_island, [(population, generations, parameters, random_state)
+                                                for population, random_state in zip(populations, random_states)])
+            populations = [population for population, _, _ in results]
+            random_states = [random_state for _, _, random_state in results]
+
+            # Merges the records of each island into one record per generation
+            for island_records in zip(*[records for _, records, _ in results]):
+                gen += 1
+                # The weighted values are maximised by DEAP, whatever the fitness weights are
+                fittest = max(island_records, key=lambda record: record["wvalues"])
+                logbook.record(gen=gen,
+                               best=fittest["best"],
+                               evaluations=sum(record["evaluations"] for record in island_records),
+                               islands=[record["best"] for record in island_records])
+
+            # Migration takes place between epochs, but not after the final one
+            if gen < num_generations:
+                migrate(populations, connections, migration_size, toolbox)
+
+    best_circuit = max((circuit for population in populations for circuit in population),
+                       key=lambda circuit: circuit.fitness.wvalues)
+    return (populations, logbook, best_circuit)
@@ -0,0 +1,197 @@
+"""
+Streams each generation's statistics to a JSONL or CSV file as the EA runs, rather
+than only keeping them in an in-memory logbook until the end of the run. The size
+of each circuit is cached, so the statistics of circuits carried over from the
+previous generation (elites and unaltered offspring) aren't recalculated.
+"""
+import csv
+import json
+import time
+import numpy as np
+
+# The file formats a MetricsWriter can write
+FORMATS = ("jsonl", "csv")
+
+def flatten_record(record: dict, prefix: str = "") -> dict:
+    """Flattens nested dictionaries, e.g. {"fitness": {"minimum": 1}} to {"fitness_minimum": 1}"""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix + key + "_"))
+        else:
+            flat[prefix + key] = value.item() if isinstance(value, np.generic) else value
+
+    return flat
+
+class PopulationStatistics:
+    """
+    Calculates the average, minimum and maximum fitness and size of a population,
+    calling the size function only for circuits it hasn't seen before.
+
+    A circuit's size is cached against its fitness.wvalues tuple. Altering a circuit
+    deletes its fitness, and evaluating it stores a new tuple, while clones share
+    the same tuple, so the cached size is reused exactly as long as the circuit is
+    unchanged.
+
+    Args:
+        size (function): Calculates the size of a circuit, such as circuit_size.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.size_calls = 0
+        self._sizes = {}
+
+    def circuit_size(self, circuit) -> int:
+        """Returns the circuit's size, from the cache if its fitness hasn't changed"""
+        wvalues = circuit.fitness.wvalues
+        cached = self._sizes.get(id(wvalues))
+        if cached is not None and cached[0] is wvalues:
+            return cached[1]
+
+        self.size_calls += 1
+        size = self.size(circuit)
+        # Circuits without a fitness can't be cached, as they all share an empty tuple
+        if wvalues:
+            self._sizes[id(wvalues)] = (wvalues, size)
+        return size
+
+    def compile(self, population: list) -> dict:
+        """
+        Calculates the statistics of a population, in the same layout as the
+        notebooks' MultiStatistics (fitness and size, each with average, minimum
+        and maximum). Fitness values which are only lower bounds (see
+        bounded_fitness.py) are left out of the fitness statistics and counted
+        separately instead.
+
+        Args:
+            population ([creator.Individual]): Circuits which all have a valid fitness.
+
+        Returns:
+            record ({str: {str: float}}): The fitness and size statistics.
+        """
+        exact = [circuit for circuit in population if not getattr(circuit, "lower_bound", False)]
+        fitnesses = np.array([circuit.fitness.values[0] for circuit in exact or population])
+        sizes = np.array([self.circuit_size(circuit) for circuit in population])
+        # Only the sizes of the current population are kept, so the cache doesn't grow
+        live = {id(circuit.fitness.wvalues) for circuit in population}
+        self._sizes = {key: value for key, value in self._sizes.items() if key in live}
+
+        return {"fitness": {"average": float(fitnesses.mean()),
+                            "minimum": float(fitnesses.min()),
+                            "maximum": float(fitnesses.max()),
+                            "lower_bounds": len(population) - len(exact)},
+                "size": {"average": float(sizes.mean()),
+                         "minimum": int(sizes.min()),
+                         "maximum": int(sizes.max())}}
+
+class MetricsWriter:
+    """
+    Appends one record per generation to a JSONL or CSV file, flushing the file
+    every flush_every records (and when it is closed), so a run that is stopped
+    early still has its statistics on disk.
+
+    Args:
+        path (str): The path of the file, which is appended to if it exists.
+        size (function): Calculates the size of a circuit, such as circuit_size.
+        file_format (str): "jsonl" (one JSON object per line) or "csv" (whose columns
+            are taken from the header of the file being appended to, or else from the
+            first record written, and which every later record must match).
+        flush_every (int): The number of records written between each flush.
+    """
+    def __init__(self, path: str, size, file_format: str = "jsonl", flush_every: int = 10):
+        if file_format not in FORMATS:
+            raise ValueError("Unknown metrics format " + repr(file_format) + ", expected one of " + str(list(FORMATS)))
+
+        self.path = path
+        self.file_format = file_format
+        self.flush_every = max(flush_every, 1)
+        self.statistics = PopulationStatistics(size)
+        self.records = 0
+        self.start_time = time.perf_counter()
+        self._file = open(path, "a", newline="")
+        self._csv_writer = None
+
+    def record(self, gen: int, population: list, evaluations: int = None, cache=None,
+               phases: dict = None, **extra) -> dict:
+        """
+        Writes the statistics of one generation.
+
+        Args:
+            gen (int): The generation number.
+            population ([creator.Individual]): The generation's circuits, which all
+                have a valid fitness.
+            evaluations (int): The number of fitness evaluations in the generation.
+            cache (FitnessCache): A fitness cache whose counters are recorded.
+            phases ({str: float}): The wall time of each phase of the generation.
+            **extra: Any other values to record.
+
+        Returns:
+            record (dict): The flattened record that was written.
+        """
+        record = {"gen": gen}
+        record.update(self.statistics.compile(population))
+        if evaluations is not None:
+            record["evaluations"] = evaluations
+        if cache is not None:
+            record["cache"] = cache.statistics()
+        if phases:
+            record["phase"] = dict(phases)
+        record["time"] = round(time.perf_counter() - self.start_time, 5)
+        record.update(extra)
+        record = flatten_record(record)
+
+        if self.file_format == "jsonl":
+            self._file.write(json.dumps(record) + "\n")
+        else:
+            if self._csv_writer is None:
+                fieldnames = self.csv_header() or list(record)
+                self._csv_writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+                # The header is only written at the start of a new file
+                if self._file.tell() == 0:
+                    self._csv_writer.writeheader()
+            # A CSV file can't gain columns, so a record with different fields is an
+            # error rather than being written with some of its values dropped
+            if set(record) != set(self._csv_writer.fieldnames):
+                raise ValueError("The record's fields " + str(sorted(record)) + " don't match the CSV columns "
+                                 + str(sorted(self._csv_writer.fieldnames)) + " of " + repr(self.path))
+            self._csv_writer.writerow(record)
+
+        self.records += 1
+        if self.records % self.flush_every == 0:
+            self._file.flush()
+
+        return record
+
+    def csv_header(self) -> [str]:
+        """Returns the columns of the CSV file being appended to, or None if it is empty"""
+        with open(self.path, newline="") as file:
+            return next(csv.reader(file), None)
+
+    def close(self):
+        """Flushes and closes the file"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def read_metrics(path: str) -> [dict]:
+    """
+    Reads the records written by a MetricsWriter (in either format), e.g. to plot
+    a run's statistics. Values in CSV files are read back as floats where possible.
+    """
+    with open(path, newline="") as file:
+        if path.endswith(".csv"):
+            records = list(csv.DictReader(file))
+            for record in records:
+                for key, value in record.items():
+                    try:
+                        record[key] = float(value)
+                    except ValueError:
+                        pass
+            return records
+
+        return [json.loads(line) for line in file if line.strip()]
@@ -0,0 +1,138 @@
+"""
+Evaluates the fitness of circuits across a pool of worker processes. The compiled
+gate set and goal matrix are sent to each worker once when it starts, so only
+compact versions of the circuits are sent with each chunk of evaluations
+"""
+import math
+import multiprocessing
+import numpy as np
+from unitary_engine import CompiledGateSet
+from fitness_metrics import circuit_distance, batch_distances
+
+# The number of chunks each worker is given per call, which balances the load
+# between workers against the cost of sending each chunk
+CHUNKS_PER_WORKER = 4
+
+# The compiled gate set, goal matrix and fitness metric stored by each worker process
+_worker_state = {}
+
+def _initialise_worker(compiled: CompiledGateSet, target_matrix: np.ndarray, metric: str = "l1"):
+    """Stores the compiled gate set, goal matrix and fitness metric in a newly started worker"""
+    _worker_state["compiled"] = compiled
+    _worker_state["target_matrix"] = target_matrix
+    _worker_state["metric"] = metric
+
+def _evaluate_chunk(circuits: [((int, (int,)),)]) -> [float]:
+    """Calculates the fitness of a chunk of compact circuits inside a worker"""
+    unitaries = _worker_state["compiled"].batch_unitaries(circuits)
+    return batch_distances(unitaries, _worker_state["target_matrix"], _worker_state["metric"]).tolist()
+
+def compact_circuit(circuit: [[int, [int]]]) -> ((int, (int,)),):
+    """
+    Converts a circuit into nested tuples of integers, which are much smaller to
+    send to a worker than a creator.Individual with its fitness object.
+
+    Args:
+        circuit ([[int, [int]]]): The circuit in the list based representation.
+
+    Returns:
+        compact (((int, (int,)),)): A (gate id, qubits) tuple for each gene.
+    """
+    return tuple((gene[0], tuple(gene[1])) for gene in circuit)
+
+class ProcessPoolEvaluator:
+    """
+    A pool of worker processes that calculate the same fitness as circuit_fitness,
+    which is selected by registering it with the DEAP toolbox via register().
+
+    The gate set is compiled once in the main process and the compiled matrices
+    (rather than the Qiskit gates) are sent to each worker along with the goal
+    matrix when it starts.
+
+    Args:
+        gate_set ({int: Gate}): The complete gate set for the current algorithm and
+            number of qubits.
+        target_matrix ([[float]]): The matrix representing the goal circuit.
+        num_qubits (int): The number of qubits being used by the circuits.
+        processes (int): The number of worker processes, which defaults to the
+            number of CPUs.
+        chunk_size (int): The number of circuits sent to a worker at once, which
+            defaults to splitting each call into CHUNKS_PER_WORKER chunks per worker.
+        metric (str): The name of the distance measure used as the fitness (see
+            fitness_metrics.py), or a metric function defined at the top level of a
+            module, so it can be sent to the workers.
+    """
+    def __init__(self,
+                 gate_set: dict,
+                 target_matrix: [[float]],
+                 num_qubits: int,
+                 processes: int = None,
+                 chunk_size: int = None,
+                 metric: str = "l1"):
+        self.compiled = CompiledGateSet(gate_set, num_qubits)
+        self.target_matrix = np.asarray(target_matrix, dtype=complex)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.metric = metric
+        self.pool = multiprocessing.Pool(self.processes,
+                                         initializer=_initialise_worker,
+                                         initargs=(self.compiled, self.target_matrix, self.metric))
+
+    def evaluate(self, circuit: [[int, [int]]]) -> (float,):
+        """
+        Calculates the fitness of a single circuit in the main process, as sending
+        one circuit to a worker costs more than evaluating it.
+
+        Args:
+            circuit ([[int, [int]]]): The circuit being evaluated.
+
+        Returns:
+            (fitness,): The fitness tuple, as returned by circuit_fitness.
+        """
+        unitary = self.compiled.unitary(circuit)
+        return (circuit_distance(unitary, self.target_matrix, self.metric),)
+
+    def evaluate_population(self, circuits: list) -> [(float,)]:
+        """
+        Calculates the fitness of every circuit in the list across the workers.
+
+        Args:
+            circuits ([creator.Individual]): The circuits being evaluated.
+
+        Returns:
+            [(fitness,)]: A fitness tuple for each circuit, in the same order.
+        """
+        if len(circuits) == 0:
+            return []
+
+        chunk_size = self.chunk_size or math.ceil(len(circuits) / (self.processes * CHUNKS_PER_WORKER))
+        compact_circuits = [compact_circuit(circuit) for circuit in circuits]
+        chunks = [compact_circuits[i:i + chunk_size] for i in range(0, len(compact_circuits), chunk_size)]
+
+        fitnesses = []
+        for chunk_fitnesses in self.pool.map(_evaluate_chunk, chunks):
+            fitnesses.extend((fitness,) for fitness in chunk_fitnesses)
+
+        return fitnesses
+
+    def register(self, toolbox):
+        """
+        Registers the pool's evaluation functions with a DEAP toolbox, so that
+        generation_step evaluates each generation's altered circuits in the pool.
+
+        Args:
+            toolbox (base.Toolbox): The toolbox used by the EA.
+        """
+        toolbox.register("evaluate", self.evaluate)
+        toolbox.register("evaluate_population", self.evaluate_population)
+
+    def close(self):
+        """Stops the worker processes once all of their work is finished"""
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,182 @@
+"""
+Low overhead timing of each phase of the EA (selection, cloning, crossover,
+mutation, evaluation and the steps inside circuit_fitness), an opt-in window that
+runs cProfile or tracemalloc over a chosen range of generations, and a breakdown
+table of where a run's time went
+"""
+import io
+import time
+import pstats
+import cProfile
+import functools
+import contextlib
+import tracemalloc
+
+# The toolbox functions timed by instrument_toolbox, when they are registered
+TOOLBOX_PHASES = ("select", "clone", "mate", "mutate", "evaluate", "evaluate_population")
+
+class PhaseTimer:
+    """
+    Accumulates the total wall time and number of calls of each named phase.
+    """
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+
+    def add(self, name: str, seconds: float, calls: int = 1):
+        """Adds the time taken by calls of a phase"""
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Times the code inside a with block as one call of the named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def wrap(self, name: str, function):
+        """
+        Wraps a function so every call is timed as the named phase.
+
+        Args:
+            name (str): The name of the phase.
+            function (function): The function being timed.
+
+        Returns:
+            timed_function (function): A function with the same arguments and result.
+        """
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+
+        return timed_function
+
+    def snapshot(self) -> {str: float}:
+        """Returns a copy of the total time of each phase, e.g. for a MetricsWriter record"""
+        return {name: round(total, 6) for name, total in self.totals.items()}
+
+    def reset(self):
+        """Clears every phase's time and calls"""
+        self.totals.clear()
+        self.calls.clear()
+
+class _NullTimer:
+    """A timer which does nothing, used when no timer is provided"""
+    def phase(self, name: str):
+        return contextlib.nullcontext()
+
+# Used by functions (such as circuit_fitness) that are called without a timer
+NULL_TIMER = _NullTimer()
+
+def instrument_toolbox(toolbox, timer: PhaseTimer, phases: (str,) = TOOLBOX_PHASES):
+    """
+    Re-registers each of the toolbox's functions wrapped by the timer, so every call
+    made by generation_step is timed under the function's name.
+
+    Args:
+        toolbox (base.Toolbox): The DEAP toolbox used by the EA.
+        timer (PhaseTimer): The timer the calls are added to.
+        phases ((str,)): The names of the toolbox functions to time.
+    """
+    for name in phases:
+        if hasattr(toolbox, name):
+            toolbox.register(name, timer.wrap(name, getattr(toolbox, name)))
+
+class ProfileWindow:
+    """
+    Runs cProfile or tracemalloc over a range of generations, so the detailed cost
+    of a few generations can be examined without slowing down the whole run. If the
+    run ends before the window's last generation, close() stops the profiler and
+    writes the report of the generations that were profiled.
+
+    Args:
+        generations (range): The generations profiled, e.g. range(50, 55).
+        mode (str): "cprofile" for function timings, or "tracemalloc" for the
+            memory allocated by each line.
+        limit (int): The number of entries in the report.
+    """
+    MODES = ("cprofile", "tracemalloc")
+
+    def __init__(self, generations: range, mode: str = "cprofile", limit: int = 20):
+        if mode not in self.MODES:
+            raise ValueError("Unknown profiling mode " + repr(mode) + ", expected one of " + str(list(self.MODES)))
+
+        self.generations = generations
+        self.mode = mode
+        self.limit = limit
+        self.report = None
+        self._profiler = None
+        self._snapshot = None
+
+    @contextlib.contextmanager
+    def generation(self, gen: int):
+        """
+        Wraps a single generation, starting the profiler at the first generation of
+        the window and writing the report after the last.
+
+        Args:
+            gen (int): The generation number.
+        """
+        active = len(self.generations) > 0
+        if active and gen == self.generations[0]:
+            self._start()
+        try:
+            yield
+        finally:
+            if active and gen == self.generations[-1]:
+                self._stop()
+
+    def close(self):
+        """Stops the profiler if the window is still open, e.g. because the run ended early"""
+        if self._profiler is not None or self._snapshot is not None:
+            self._stop()
+
+    def _start(self):
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def _stop(self):
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(self.limit)
+            self.report = stream.getvalue()
+            self._profiler = None
+        else:
+            statistics = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+            tracemalloc.stop()
+            self.report = "\n".join(str(statistic) for statistic in statistics[:self.limit])
+            self._snapshot = None
+
+def breakdown_table(timer: PhaseTimer, total: float = None) -> str:
+    """
+    Creates a table of each phase's calls, total time, time per call and share of
+    the run, with the slowest phase first.
+
+    Args:
+        timer (PhaseTimer): The timer holding the run's phases.
+        total (float): The run's total time, which defaults to the sum of the phases
+            (phases that are nested inside others are then counted twice).
+
+    Returns:
+        table (str): The formatted table.
+    """
+    total = total or sum(timer.totals.values()) or 1.0
+    lines = ["{:<24}{:>10}{:>12}{:>14}{:>9}".format("phase", "calls", "total (s)", "per call (ms)", "share")]
+    for name, seconds in sorted(timer.totals.items(), key=lambda item: -item[1]):
+        calls = timer.calls[name]
+        lines.append("{:<24}{:>10}{:>12.4f}{:>14.4f}{:>8.1f}%".format(
+            name, calls, seconds, 1000 * seconds / calls if calls else 0.0, 100 * seconds / total))
+
+    return "\n".join(lines)
@@ -2,21 +2,35 @@
 Stores and displays each of the Quantum Fourier Transform circuits used to
 test the EA
 """
-import numpy as np
+import os
 import math
-from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT, HGate, SwapGate, CPhaseGate
-import qiskit.quantum_info as qi
-
-# Dynamically creates the gate set to be used as the rotation and number of
-# possible p gates depends on the number of qubits being used (pi/2^N-1)
-
-# a dictionary where the key value pair is the indexes and the Qiskit gate name
-qgate_set1 = {1:HGate(), 2:SwapGate(), 3:CPhaseGate(math.pi/2), 10:"WIRE"}
-
-qgate_set2 = {1:HGate(), 2:SwapGate(), 3:CPhaseGate(math.pi/2), 4:CPhaseGate(math.pi/4), 10:"WIRE"}
-
-qgate_set3 = {1:HGate(), 2:SwapGate(), 3:CPhaseGate(math.pi/2), 4:CPhaseGate(math.pi/4), 5:CPhaseGate(math.pi/8), 10:"WIRE"}
+from target_registry import TARGETS
+
+# The directory the circuit diagrams are saved in, next to this file
+DIAGRAM_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "qft_circuits")
+
+def create_gate_set(num_rotations: int) -> dict:
+    """
+    Dynamically creates the gate set to be used as the rotation and number of
+    possible p gates depends on the number of qubits being used (pi/2^N-1).
+
+    Args:
+        num_rotations (int): The number of controlled phase gates, one fewer than the
+            number of qubits.
+
+    Returns:
+        gate_set ({int: Gate}): A dictionary where the key value pair is the indexes
+            and the Qiskit gate.
+    """
+    # Qiskit is only imported once a gate set is used, so importing the sets of
+    # possible gates (plain lists) stays cheap
+    from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+    gate_set = {1:HGate(), 2:SwapGate()}
+    for rotation in range(1, num_rotations + 1):
+        gate_set[2 + rotation] = CPhaseGate(math.pi / 2**rotation)
+    gate_set[10] = "WIRE"
+
+    return gate_set
 
 # Creates sets of possible gates for 2qubit circuit
 qpossible_gates_1 = [[1, [0]],
@@ -112,39 +126,70 @@ qpossible_gates_3 = [[1, [0]],
                     [10, [2]],
                     [10, [3]]]
 
-# A 2-qubit QFT circuit which is initialised to an empty 2 qubit circuit
-qft_circuit1 = QuantumCircuit(2)
-# A 3-qubit QFT circuit which is initialised to an empty 3 qubit circuit
-qft_circuit2 = QuantumCircuit(3)
-# A 4-qubit QFT circuit which is initialised to an empty 4 qubit circuit
-qft_circuit3 = QuantumCircuit(4)
-
-# The Qiskit QFT method creates a complete QFT circuit with the specified parameters
-qft_circuit1 = QFT(num_qubits=2, approximation_degree=0, do_swaps=True, inverse=False, insert_barriers=False, name="qft2")
-
-qft_circuit2 = QFT(num_qubits=3, approximation_degree=0, do_swaps=True, inverse=False, insert_barriers=False, name="qft3")
-
-qft_circuit3 = QFT(num_qubits=4, approximation_degree=0, do_swaps=True, inverse=False, insert_barriers=False, name="qft4")
-
-# Gets the unitary matrix representing each of the circuits
-qft_matrix1 = qi.Operator(qft_circuit1)
-qft_matrix1 = qft_matrix1.data
-qft_matrix2 = qi.Operator(qft_circuit2)
-qft_matrix2 = qft_matrix2.data
-qft_matrix3 = qi.Operator(qft_circuit3)
-qft_matrix3 = qft_matrix3.data
-
-# As this program is not being stored as a Jupyter Notebook, all images are
-# stored in a specific directory instead of being displayed on screen
-
-# For each of the circuits, the pdf diagram is saved into the qft_circuits directory
-# print(qft_circuit1)
-
-qft_circuit1.decompose().draw(output="latex", filename="qft_circuits/2qubit_circuit.pdf", style="iqp")
-print(qft_circuit1.decompose().data)
-
-# print(qft_circuit2)
-qft_circuit2.decompose().draw(output="latex", filename="qft_circuits/3qubit_circuit.pdf", style="iqp")
-
-# print(qft_circuit3)
-qft_circuit3.decompose().draw(output="latex", filename="qft_circuits/4qubit_circuit.pdf", style="iqp")
\ No newline at end of file
+def build_qft_circuit(num_qubits: int) -> "QuantumCircuit":
+    """
+    Creates a complete QFT circuit on the specified number of qubits, using the
+    Qiskit QFT method.
+
+    Args:
+        num_qubits (int): The number of qubits used by the circuit.
+
+    Returns:
+        circuit (QuantumCircuit): The QFT circuit, which is named qft followed by
+            its number of qubits.
+    """
+    from qiskit.circuit.library import QFT
+    return QFT(num_qubits=num_qubits, approximation_degree=0, do_swaps=True, inverse=False,
+               insert_barriers=False, name="qft" + str(num_qubits))
+
+# The 2, 3 and 4-qubit QFT circuits (qft_circuit1 to qft_circuit3) and their unitary
+# matrices (qft_matrix1 to qft_matrix3) are only created the first time they are
+# used, with the number of qubits of each taken from the target registry
+QFT_CIRCUITS = {"qft_circuit1": "qft_matrix1", "qft_circuit2": "qft_matrix2", "qft_circuit3": "qft_matrix3"}
+# The gate sets for 2, 3 and 4-qubit circuits (qgate_set1 to qgate_set3), keyed
+# by their number of controlled phase gates, are also created when first used
+QFT_GATE_SETS = {"qgate_set1": 1, "qgate_set2": 2, "qgate_set3": 3}
+_qft_circuits = {}
+
+def __getattr__(name: str):
+    """Creates the gate sets, QFT circuits and unitary matrices when they are first accessed"""
+    if name in QFT_GATE_SETS:
+        # Each gate set is only created once, so compiled gate sets (which are
+        # stored against the gate set's id) stay valid
+        if name not in _qft_circuits:
+            _qft_circuits[name] = create_gate_set(QFT_GATE_SETS[name])
+        return _qft_circuits[name]
+    if name in QFT_CIRCUITS:
+        if name not in _qft_circuits:
+            _qft_circuits[name] = build_qft_circuit(**TARGETS[QFT_CIRCUITS[name]][1])
+        return _qft_circuits[name]
+    if name in QFT_CIRCUITS.values():
+        from target_registry import target_matrix
+        return target_matrix(name)
+
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+# Wildcard imports still provide the gate sets, circuits and matrices, but explicitly
+# importing only the sets of possible gates doesn't create them (or import Qiskit)
+__all__ = ["qgate_set1", "qgate_set2", "qgate_set3",
+           "qpossible_gates_1", "qpossible_gates_2", "qpossible_gates_3",
+           "build_qft_circuit"] + list(QFT_CIRCUITS) + list(QFT_CIRCUITS.values())
+
+def draw_circuits():
+    """
+    As this program is not being stored as a Jupyter Notebook, all images are
+    stored in a specific directory instead of being displayed on screen.
+    For each of the circuits, the pdf diagram is saved into the qft_circuits directory
+    """
+    qft_circuit1 = __getattr__("qft_circuit1")
+    qft_circuit1.decompose().draw(output="latex", filename=os.path.join(DIAGRAM_DIRECTORY, "2qubit_circuit.pdf"), style="iqp")
+    print(qft_circuit1.decompose().data)
+
+    qft_circuit2 = __getattr__("qft_circuit2")
+    qft_circuit2.decompose().draw(output="latex", filename=os.path.join(DIAGRAM_DIRECTORY, "3qubit_circuit.pdf"), style="iqp")
+
+    qft_circuit3 = __getattr__("qft_circuit3")
+    qft_circuit3.decompose().draw(output="latex", filename=os.path.join(DIAGRAM_DIRECTORY, "4qubit_circuit.pdf"), style="iqp")
+
+if __name__ == "__main__":
+    draw_circuits()
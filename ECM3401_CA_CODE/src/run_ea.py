@@ -0,0 +1,462 @@
+"""
+Runs the single objective EA from the command line, without a notebook, with the
+target and the EA's parameters read from a configuration file rather than edited
+into main.ipynb. Matplotlib and Qiskit's circuit drawing are only imported when
+plots are requested, so batch jobs start quickly.
+
+Usage (from the src directory): python -m run_ea [config.json] [--seed N] [--output DIR] [--plot] [--profile] [--resume]
+
+An example configuration, where any missing value takes its value from DEFAULT_CONFIG:
+    {
+        "family": "grover",
+        "num_qubits": 3,
+        "marked_states": ["011", "100"],
+        "population_size": 600,
+        "num_generations": 400,
+        "mutation_rate": 0.8,
+        "crossover_rate": 0.6,
+        "elitism_rate": 0.05,
+        "seed": 0,
+        "output": "results/grover3"
+    }
+The output directory receives the resolved configuration (config.json), the
+statistics of every generation (metrics.jsonl) and the best circuit found
+(result.json), along with the graphs and circuit diagram when plotting. With
+--profile, each generation's record also holds the time taken by each of the
+toolbox's functions, and a breakdown of the run's time is saved (profile.txt). When
+checkpoint_every is set, the run is also checkpointed (checkpoint.pkl), and running
+again with --resume continues it from its last checkpoint.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import numpy as np
+from deap import base, creator, tools
+from evolution import generation_step, select_elites
+from gate_generator import generate_gate_table, WIRE_ID
+from target_registry import TARGETS, get_target
+from unitary_engine import circuit_unitary
+from fitness_metrics import circuit_distance
+from metrics_stream import MetricsWriter, read_metrics
+from checkpoint import Checkpointer, load_checkpoint
+from shared_genes import interned_gates, intern_circuit, light_clone
+from profiling import PhaseTimer, ProfileWindow, instrument_toolbox, breakdown_table
+
+# The value of each configuration option when it isn't given, which match main.ipynb
+DEFAULT_CONFIG = {
+    # The algorithm being evolved ("qft" or "grover") and its number of qubits
+    "family": "qft",
+    "num_qubits": 2,
+    # The states marked by a Grover's Search target, which default to those of the
+    # shipped target with the same number of qubits
+    "marked_states": None,
+    # Whether only the qubit placements used by the family's circuits are possible
+    # (see gate_generator.py)
+    "structured_gates": True,
+    # The number of genes in each circuit, which defaults to the decomposed size of
+    # the target plus one (main.ipynb's CIRCUIT_LENGTH)
+    "circuit_length": None,
+    "population_size": 600,
+    "num_generations": 400,
+    "mutation_rate": 0.8,
+    "crossover_rate": 0.6,
+    # The fraction of the population carried over by elitism
+    "elitism_rate": 0.05,
+    "tournament_size": 4,
+    # The distance measure used as the fitness (see fitness_metrics.py)
+    "metric": "l1",
+    # The number of processes evaluating circuits, where 1 evaluates in this process
+    "processes": 1,
+    "seed": None,
+    "output": "results",
+    # The number of generations between checkpoints, or None to never checkpoint
+    "checkpoint_every": None,
+    # Whether the time taken by each toolbox function is recorded every generation
+    # and broken down at the end of the run (see profiling.py)
+    "profile": False,
+    # The [first, last] generations run under cProfile or tracemalloc ("profile_mode"),
+    # whose report is saved in profile_window.txt, or None to not profile any
+    "profile_window": None,
+    "profile_mode": "cprofile",
+    # Whether the graphs of the run and a diagram of the best circuit are saved,
+    # and the Qiskit drawer used for the diagram ("latex" or "mpl")
+    "plot": False,
+    "circuit_drawer": "latex"
+}
+
+# The options which can differ from those of a checkpointed run when it is resumed,
+# as they don't change the circuits evolved in each generation
+RESUME_OPTIONS = ("num_generations", "processes", "output", "checkpoint_every", "plot", "circuit_drawer",
+                  "profile", "profile_window", "profile_mode")
+
+def load_config(path: str = None, **overrides) -> dict:
+    """
+    Reads a configuration file, filling in every missing option from DEFAULT_CONFIG.
+
+    Args:
+        path (str): The path of the configuration (a JSON file), or None to only
+            use the defaults.
+        **overrides: Options which replace those in the file (None values are ignored).
+
+    Returns:
+        config (dict): The complete configuration.
+    """
+    config = dict(DEFAULT_CONFIG)
+    if path is not None:
+        with open(path) as file:
+            config.update(json.load(file))
+    config.update({key: value for key, value in overrides.items() if value is not None})
+
+    unknown = sorted(set(config) - set(DEFAULT_CONFIG))
+    if unknown:
+        raise ValueError("Unknown configuration options " + str(unknown) + ", expected some of " + str(list(DEFAULT_CONFIG)))
+
+    return config
+
+def target_parameters(config: dict) -> dict:
+    """
+    Returns the parameters of the configured target, as passed to the family's
+    circuit builder by the target registry.
+
+    Args:
+        config (dict): The configuration.
+
+    Returns:
+        parameters (dict): The number of qubits of a QFT, or the marked states of a
+            Grover's Search circuit.
+    """
+    if config["family"] == "qft":
+        return {"num_qubits": config["num_qubits"]}
+
+    marked_states = config["marked_states"]
+    if marked_states is None:
+        # Uses the marked states of the shipped target with the same number of qubits
+        shipped = [parameters["marked_states"] for family, parameters in TARGETS.values()
+                   if family == "grover" and len(parameters["marked_states"][0]) == config["num_qubits"]]
+        if not shipped:
+            raise ValueError("There is no shipped " + str(config["num_qubits"]) + " qubit Grover's Search target, "
+                             "so marked_states must be given")
+        marked_states = shipped[0]
+    elif any(len(state) != config["num_qubits"] for state in marked_states):
+        raise ValueError("Every marked state must have one bit per qubit")
+
+    return {"marked_states": list(marked_states)}
+
+def point_mutation(circuit: list, possible_gates: [[int, [int]]]) -> list:
+    """
+    Replaces a random gene in the circuit with a random possible gate, in the same
+    way as mutate in main.ipynb (which uses a fixed set of possible gates).
+
+    Args:
+        circuit (creator.Individual): The circuit being mutated in place.
+        possible_gates ([[int, [int]]]): The genes the mutated gene can be replaced with.
+
+    Returns:
+        circuit (creator.Individual): The mutated circuit.
+    """
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(possible_gates)
+    del circuit.fitness.values
+    return circuit
+
+def native_fitness(circuit: list, gate_set: dict, target_matrix: np.ndarray, num_qubits: int,
+                   metric: str = "l1") -> (float,):
+    """Calculates circuit_fitness with the native unitary engine, which doesn't need Qiskit's Operator"""
+    return (circuit_distance(circuit_unitary(circuit, gate_set, num_qubits), target_matrix, metric),)
+
+def gate_count(circuit: list) -> int:
+    """Returns the number of genes in a circuit which aren't wires"""
+    return sum(1 for gene in circuit if gene[0] != WIRE_ID)
+
+def create_toolbox(config: dict, gate_set: dict, possible_gates: list, target_matrix: np.ndarray,
+                   circuit_length: int) -> base.Toolbox:
+    """
+    Registers the EA's functions for the configured target with a DEAP toolbox.
+
+    Args:
+        config (dict): The configuration.
+        gate_set ({int: Gate}): The gate set of the target's family and number of qubits.
+        possible_gates ([[int, [int]]]): Every gene that can appear in a circuit.
+        target_matrix (np.ndarray): The unitary matrix of the target.
+        circuit_length (int): The number of genes in each circuit.
+
+    Returns:
+        toolbox (base.Toolbox): The toolbox, with the functions used by generation_step.
+    """
+    # Creates a minimising fitness and individual, unless they already exist
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+
+    # The genes are shared tuples, so selected circuits are cloned by a shallow copy
+    possible_gates = interned_gates(possible_gates)
+    toolbox = base.Toolbox()
+    toolbox.register("clone", light_clone)
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(possible_gates), n=circuit_length)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", point_mutation, possible_gates=possible_gates)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", native_fitness, gate_set=gate_set, target_matrix=target_matrix,
+                     num_qubits=config["num_qubits"], metric=config["metric"])
+    return toolbox
+
+def run(config: dict, resume: bool = False) -> dict:
+    """
+    Runs the EA with a configuration, writing its statistics and result to the
+    output directory.
+
+    Args:
+        config (dict): The complete configuration, as returned by load_config.
+        resume (bool): Whether the run in the output directory is continued from its
+            checkpoint, rather than starting a new run (which replaces it).
+
+    Returns:
+        result (dict): The best circuit found, along with its fitness, size and the
+            run time in seconds (of this part of the run, when resuming).
+    """
+    output = config["output"]
+    metrics_path = os.path.join(output, "metrics.jsonl")
+    checkpoint_path = os.path.join(output, "checkpoint.pkl")
+    if resume and not os.path.exists(checkpoint_path):
+        raise FileNotFoundError("There is no checkpoint to resume from in " + repr(output))
+
+    os.makedirs(output, exist_ok=True)
+    if not resume:
+        if config["seed"] is not None:
+            random.seed(config["seed"])
+            np.random.seed(config["seed"])
+        # The statistics, checkpoint and profiles of any earlier run in the same
+        # directory are replaced along with its configuration and result, as
+        # MetricsWriter appends to an existing file
+        open(metrics_path, "w").close()
+        for name in ("checkpoint.pkl", "profile.txt", "profile_window.txt"):
+            if os.path.exists(os.path.join(output, name)):
+                os.remove(os.path.join(output, name))
+
+    table = generate_gate_table(config["num_qubits"], config["family"], structured=config["structured_gates"])
+    target_matrix, target_size = get_target(config["family"], target_parameters(config))
+    circuit_length = config["circuit_length"] or target_size + 1
+    toolbox = create_toolbox(config, table.gate_set, table.possible_gates, target_matrix, circuit_length)
+
+    evaluator = None
+    if config["processes"] > 1:
+        from parallel_evaluation import ProcessPoolEvaluator
+        evaluator = ProcessPoolEvaluator(table.gate_set, target_matrix, config["num_qubits"],
+                                         processes=config["processes"], metric=config["metric"])
+        evaluator.register(toolbox)
+
+    checkpointer = None
+    if config["checkpoint_every"]:
+        checkpointer = Checkpointer(checkpoint_path, config["checkpoint_every"])
+
+    # The timer holds one generation's phases, which are added to the run's totals
+    timer = run_timer = None
+    if config["profile"]:
+        timer, run_timer = PhaseTimer(), PhaseTimer()
+        instrument_toolbox(toolbox, timer)
+    first, last = config["profile_window"] or (0, -1)
+    window = ProfileWindow(range(first, last + 1), config["profile_mode"])
+
+    elite_count = int(config["elitism_rate"] * config["population_size"])
+    start = time.perf_counter()
+    if resume:
+        population, best_circuit, logbook, start_generation = resume_state(config, checkpoint_path, checkpointer)
+    else:
+        population = toolbox.population(n=config["population_size"])
+        best_circuit = None
+        logbook = tools.Logbook()
+        start_generation = 0
+    with open(os.path.join(output, "config.json"), "w") as file:
+        json.dump(config, file, indent=4)
+
+    try:
+        with MetricsWriter(metrics_path, gate_count) as metrics:
+            for gen in range(start_generation, config["num_generations"]):
+                with window.generation(gen + 1):
+                    population[:], generation_best, evaluations = generation_step(
+                        population, toolbox, config["mutation_rate"], config["crossover_rate"],
+                        elite_count, config["tournament_size"])
+
+                # Replaces the best circuit with the fittest circuit of this generation if it is fitter
+                if best_circuit is None or generation_best.fitness.wvalues > best_circuit.fitness.wvalues:
+                    best_circuit = toolbox.clone(generation_best)
+
+                phases = None
+                if timer is not None:
+                    phases = timer.snapshot()
+                    for name, seconds in timer.totals.items():
+                        run_timer.add(name, seconds, timer.calls[name])
+                    timer.reset()
+                logbook.record(**metrics.record(gen + 1, population, evaluations, phases=phases))
+
+                if checkpointer is not None:
+                    # The final generation is always checkpointed, so the run can be extended
+                    if gen + 1 == config["num_generations"]:
+                        checkpointer.save(gen + 1, population, best_circuit, logbook, config=config)
+                    else:
+                        checkpointer.maybe_save(gen + 1, population, best_circuit, logbook, config=config)
+    finally:
+        # Stops the profiler if the run ended inside the window
+        window.close()
+        if evaluator is not None:
+            evaluator.close()
+
+    # generation_step only compares the circuits it is given, so the fittest circuit
+    # of the final population (which was evaluated by the last step) is checked here
+    final_best = select_elites(population, 1)[0]
+    if best_circuit is None or final_best.fitness.wvalues > best_circuit.fitness.wvalues:
+        best_circuit = toolbox.clone(final_best)
+
+    result = {"fitness": best_circuit.fitness.values[0],
+              "size": gate_count(best_circuit),
+              "circuit": [[gene[0], list(gene[1])] for gene in best_circuit],
+              "time": round(time.perf_counter() - start, 5)}
+    with open(os.path.join(output, "result.json"), "w") as file:
+        json.dump(result, file, indent=4)
+    if run_timer is not None:
+        with open(os.path.join(output, "profile.txt"), "w") as file:
+            file.write(breakdown_table(run_timer, result["time"]) + "\n")
+    if window.report is not None:
+        with open(os.path.join(output, "profile_window.txt"), "w") as file:
+            file.write(window.report)
+
+    if config["plot"]:
+        plot_results(config, table.gate_set)
+
+    return result
+
+def sweep_run(**options) -> (float, int):
+    """
+    Runs the EA for one run of a parameter sweep (see experiment_runner.py), which
+    calls it with the swept parameter and the sweep's fixed options, e.g.
+    sweep_run(population_size=200, num_generations=100, mutation_rate=0.4).
+
+    The run's files are written to a temporary directory unless an output is given,
+    so runs of a sweep executing at the same time don't replace each other's files.
+    Without a seed option, the random number generators are left as they are, which
+    the experiment runner seeds for each run.
+
+    Args:
+        **options: Any options of DEFAULT_CONFIG, with the rest taking their defaults.
+
+    Returns:
+        (fitness, size): The fitness and size of the best circuit found.
+    """
+    if "output" in options:
+        result = run(load_config(**options))
+    else:
+        with tempfile.TemporaryDirectory() as output:
+            result = run(load_config(**options, output=output))
+
+    return (result["fitness"], result["size"])
+
+def resume_state(config: dict, checkpoint_path: str, checkpointer: Checkpointer = None) -> (list, object, tools.Logbook, int):
+    """
+    Loads the checkpoint of an earlier run, restoring the random number generator
+    states, and removes any statistics recorded after the checkpoint (which the
+    resumed run records again).
+
+    Args:
+        config (dict): The configuration of the resumed run, which can only differ
+            from that of the checkpointed run in the RESUME_OPTIONS.
+        checkpoint_path (str): The path of the checkpoint file.
+        checkpointer (Checkpointer): Decides when the resumed run is checkpointed.
+
+    Returns:
+        (population, best_circuit, logbook, generation): The checkpointed population,
+            the fittest circuit found, the logbook and the number of generations completed.
+    """
+    state = load_checkpoint(checkpoint_path, creator.Individual)
+    checkpointed_config = state["extra"]["config"]
+    changed = sorted(key for key in DEFAULT_CONFIG
+                     if key not in RESUME_OPTIONS and config[key] != checkpointed_config[key])
+    if changed:
+        raise ValueError("A run can't be resumed with different " + str(changed) + " options")
+
+    random.setstate(state["random_state"])
+    np.random.set_state(state["numpy_state"])
+    if checkpointer is not None:
+        checkpointer.last_generation = state["generation"]
+
+    # Keeps the statistics of the generations before the checkpoint
+    metrics_path = os.path.join(config["output"], "metrics.jsonl")
+    records = read_metrics(metrics_path) if os.path.exists(metrics_path) else []
+    with open(metrics_path, "w") as file:
+        for record in records:
+            if record["gen"] <= state["generation"]:
+                file.write(json.dumps(record) + "\n")
+
+    # The checkpoint stores the genes as lists, which are interned for light_clone
+    population = [intern_circuit(circuit) for circuit in state["population"]]
+    best_circuit = state["best_circuit"]
+    if best_circuit is not None:
+        intern_circuit(best_circuit)
+
+    return (population, best_circuit, state["logbook"], state["generation"])
+
+def plot_results(config: dict, gate_set: dict):
+    """
+    Saves graphs of the average and minimum fitness and the average size over the
+    run, along with a diagram of the best circuit, into the output directory.
+    Matplotlib and Qiskit are only imported here, so runs without plots don't load them.
+
+    Args:
+        config (dict): The configuration of the run.
+        gate_set ({int: Gate}): The gate set used by the run's circuits.
+    """
+    import matplotlib
+    # Saves the figures without needing a display
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from qiskit import QuantumCircuit
+
+    output = config["output"]
+    records = read_metrics(os.path.join(output, "metrics.jsonl"))
+    generations = [record["gen"] for record in records]
+    for key, title in [("fitness_average", "Average Circuit Fitness"),
+                       ("fitness_minimum", "Minimum Circuit Fitness"),
+                       ("size_average", "Average Circuit Size")]:
+        plt.figure()
+        plt.plot(generations, [record[key] for record in records])
+        plt.title(title + " Over the Evolution")
+        plt.xlabel("Generation")
+        plt.ylabel(title)
+        plt.savefig(os.path.join(output, key + ".pdf"))
+        plt.close()
+
+    with open(os.path.join(output, "result.json")) as file:
+        best_circuit = json.load(file)["circuit"]
+    circuit = QuantumCircuit(config["num_qubits"])
+    for gene in best_circuit:
+        if gate_set[gene[0]] != "WIRE":
+            circuit.append(gate_set[gene[0]], gene[1])
+    circuit.draw(output=config["circuit_drawer"], filename=os.path.join(output, "best_circuit.pdf"))
+
+def main(arguments: [str] = None) -> dict:
+    """Runs the EA with the configuration given by the command line arguments"""
+    parser = argparse.ArgumentParser(description="Runs the single objective EA without a notebook")
+    parser.add_argument("config", nargs="?", default=None, help="the path of the configuration (a JSON file)")
+    parser.add_argument("--seed", type=int, default=None, help="replaces the configured seed")
+    parser.add_argument("--output", default=None, help="replaces the configured output directory")
+    parser.add_argument("--plot", action="store_true", default=None, help="saves the graphs and circuit diagram")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="records the time taken by each toolbox function and saves a breakdown")
+    parser.add_argument("--resume", action="store_true",
+                        help="continues the run in the output directory from its checkpoint")
+    arguments = parser.parse_args(arguments)
+
+    config = load_config(arguments.config, seed=arguments.seed, output=arguments.output, plot=arguments.plot,
+                         profile=arguments.profile)
+    result = run(config, resume=arguments.resume)
+    print("The best circuit has a fitness of", result["fitness"], "and a size of", result["size"],
+          "(found in", result["time"], "seconds)")
+    return result
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
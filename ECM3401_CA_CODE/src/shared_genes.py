@@ -0,0 +1,93 @@
+"""
+Makes the genes of the list based circuits immutable, interned (gate id, qubits)
+tuples shared by every circuit, so cloning a circuit only needs a shallow copy
+of its list of genes rather than the deep copy made by DEAP's default clone.
+
+mutate and crossover only ever replace whole genes, never altering a gene in
+place, so clones can safely share them. Interning the genes as tuples makes this
+certain, as altering a shared gene raises a TypeError rather than silently
+changing every circuit containing it. (CompactGenome in compact_genome.py takes
+the same idea further, storing each gene as an index into the possible gates.)
+"""
+
+# Every gene interned so far, keyed by (and equal to) its (gate id, qubits) tuple
+_interned_genes = {}
+
+def intern_gene(gene: [int, [int]]) -> (int, (int,)):
+    """
+    Returns the shared tuple version of a gene, which is the same object for every
+    equal gene, e.g. [2, [0, 1]] and (2, (0, 1)) both give the same (2, (0, 1)).
+    """
+    key = (gene[0], tuple(gene[1]))
+    return _interned_genes.setdefault(key, key)
+
+def interned_gates(possible_gates: [[int, [int]]]) -> [(int, (int,))]:
+    """
+    Returns a set of possible gates made up of interned genes, which can replace
+    the possible gates used by the EA, e.g.
+    toolbox.register("mutate", mutate, possible_gates=interned_gates(qpossible_gates_3))
+
+    Args:
+        possible_gates ([[int, [int]]]): Every gene that can appear in a circuit.
+
+    Returns:
+        possible_gates ([(int, (int,))]): The same genes, as interned tuples.
+    """
+    return [intern_gene(gene) for gene in possible_gates]
+
+def intern_circuit(circuit: list) -> list:
+    """
+    Replaces each gene of a circuit (such as a circuit loaded from a checkpoint, or
+    created from list genes) with its interned tuple, in place.
+
+    Args:
+        circuit (creator.Individual): The circuit whose genes are replaced.
+
+    Returns:
+        circuit (creator.Individual): The same circuit, which keeps its fitness.
+    """
+    circuit[:] = [intern_gene(gene) for gene in circuit]
+    return circuit
+
+def light_clone(circuit: list) -> list:
+    """
+    Clones a circuit by copying its list of genes (which are shared, rather than
+    copied) and its fitness values, in time proportional to the circuit's length.
+    Any other attributes (such as the UnitaryCache of incremental_evaluation.py)
+    are shared with the clone, as they are replaced rather than altered.
+
+    Args:
+        circuit (creator.Individual): The circuit being cloned.
+
+    Returns:
+        clone (creator.Individual): A new circuit of the same class, with the same
+            genes and an equal (but separate) fitness.
+    """
+    # Creating the individual gives the clone its own fitness object
+    clone = circuit.__class__(circuit)
+    for name, value in circuit.__dict__.items():
+        if name != "fitness":
+            clone.__dict__[name] = value
+    # The weighted values are an immutable tuple, so the clone can share it
+    clone.fitness.wvalues = circuit.fitness.wvalues
+
+    return clone
+
+def register(toolbox, possible_gates: [[int, [int]]] = None) -> [(int, (int,))]:
+    """
+    Registers light_clone as the toolbox's clone function, so generation_step
+    shallow copies the selected circuits.
+
+    Args:
+        toolbox (base.Toolbox): The toolbox used by the EA.
+        possible_gates ([[int, [int]]]): The possible gates, which are interned and
+            returned so they can be used by mutate and the initial population.
+
+    Returns:
+        possible_gates ([(int, (int,))]): The interned possible gates (or None).
+    """
+    toolbox.register("clone", light_clone)
+    if possible_gates is None:
+        return None
+
+    return interned_gates(possible_gates)
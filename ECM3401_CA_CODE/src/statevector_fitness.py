@@ -0,0 +1,193 @@
+"""
+Estimates a circuit's fitness from its action on a fixed sample of k input states
+rather than its full 2^n x 2^n unitary matrix, which costs O(L * k * 2^n) time and
+O(k * 2^n) memory instead of O(L * 4^n) and O(4^n), so the EA can be run beyond 4
+qubits. Candidates which beat the current elite threshold can optionally be
+re-checked against the full unitary matrix.
+"""
+import sys
+import numpy as np
+from unitary_engine import compile_gate_set
+from fitness_metrics import circuit_distance
+from evolution import select_elites
+
+# The kinds of sampled input states
+STATE_KINDS = ("basis", "random")
+
+def sample_states(num_qubits: int, num_states: int, kind: str = "basis", seed: int = 0) -> np.ndarray:
+    """
+    Creates a repeatable sample of input statevectors.
+
+    Args:
+        num_qubits (int): The number of qubits being used by the circuits.
+        num_states (int): The number of input states (k).
+        kind (str): "basis" for k different computational basis states, or "random"
+            for k random normalised states.
+        seed (int): Seeds the sample, so every evaluation uses the same states.
+
+    Returns:
+        states (np.ndarray): A 2^n x k complex matrix with one state per column.
+    """
+    dimension = 2 ** num_qubits
+    rng = np.random.default_rng(seed)
+    if kind == "basis":
+        if num_states > dimension:
+            raise ValueError("Only " + str(dimension) + " basis states can be sampled with "
+                             + str(num_qubits) + " qubits")
+        states = np.zeros((dimension, num_states), dtype=complex)
+        # The basis states are sorted, so k = 2^n gives the identity
+        chosen = np.sort(rng.choice(dimension, num_states, replace=False))
+        states[chosen, np.arange(num_states)] = 1
+    elif kind == "random":
+        states = rng.normal(size=(dimension, num_states)) + 1j * rng.normal(size=(dimension, num_states))
+        states /= np.linalg.norm(states, axis=0)
+    else:
+        raise ValueError("Unknown state kind " + repr(kind) + ", expected one of " + str(list(STATE_KINDS)))
+
+    return states
+
+def is_quantum_circuit(target) -> bool:
+    """
+    Returns whether a goal is a Qiskit QuantumCircuit rather than a matrix (such as
+    an np.ndarray or the nested lists of circuit_fitness's target_matrix). Qiskit
+    isn't imported, as a QuantumCircuit can only exist once it has been.
+    """
+    qiskit = sys.modules.get("qiskit")
+    return qiskit is not None and isinstance(target, qiskit.QuantumCircuit)
+
+def target_outputs(target, states: np.ndarray) -> np.ndarray:
+    """
+    Calculates the goal circuit's output for each sampled state.
+
+    Args:
+        target (np.ndarray, [[float]] or QuantumCircuit): The goal's unitary matrix,
+            or the goal circuit itself, which is simulated one state at a time so its
+            unitary matrix is never built.
+        states (np.ndarray): The 2^n x k matrix of input states.
+
+    Returns:
+        outputs (np.ndarray): The 2^n x k matrix of output states.
+    """
+    if not is_quantum_circuit(target):
+        return np.asarray(target, dtype=complex) @ states
+
+    import qiskit.quantum_info as qi
+    return np.stack([qi.Statevector(state).evolve(target).data for state in states.T], axis=1)
+
+def sampled_distance(outputs: np.ndarray, expected: np.ndarray, metric: str = "l1") -> float:
+    """
+    Estimates a fitness metric from the outputs of k sampled states. The estimates of
+    "l1" and "frobenius" are scaled by 2^n / k, so with computational basis states
+    they are unbiased estimates of the full metric, and every estimate equals the full
+    metric when all 2^n basis states are used.
+
+    Args:
+        outputs (np.ndarray): The 2^n x k outputs of the circuit being evaluated.
+        expected (np.ndarray): The 2^n x k outputs of the goal circuit.
+        metric (str): "l1", "frobenius" or "fidelity" (see fitness_metrics.py).
+
+    Returns:
+        fitness (float): The estimated distance between the circuit and the goal.
+    """
+    dimension, num_states = outputs.shape
+    if metric == "l1":
+        return float(np.abs(outputs - expected).sum() * dimension / num_states)
+    if metric == "frobenius":
+        return float(np.sqrt((np.abs(outputs - expected) ** 2).sum() * dimension / num_states))
+    if metric == "fidelity":
+        # The sampled columns' share of Tr(T^dagger U), which ignores the global phase
+        overlap = np.vdot(expected, outputs)
+        return float(max(1 - abs(overlap) / num_states, 0.0))
+
+    raise ValueError("Unknown fitness metric " + repr(metric) + ", expected \"l1\", \"frobenius\" or \"fidelity\"")
+
+class SampledStateEvaluator:
+    """
+    Calculates the sampled fitness of circuits, and can be registered with the DEAP
+    toolbox in place of circuit_fitness via register().
+
+    When an exact threshold is set (see update_threshold), every circuit whose sampled
+    fitness is below it is re-evaluated with its full unitary matrix, so the elites are
+    ranked by their exact fitness while the rest of the population only costs a
+    sampled evaluation.
+
+    Args:
+        gate_set ({int: Gate}): The complete gate set for the current algorithm and
+            number of qubits.
+        target (np.ndarray, [[float]] or QuantumCircuit): The goal's unitary matrix,
+            or the goal circuit (in which case the full matrix is only built if a circuit beats
+            the exact threshold).
+        num_qubits (int): The number of qubits being used by the circuits.
+        num_states (int): The number of sampled input states (k).
+        kind (str): "basis" or "random" input states.
+        seed (int): Seeds the sample of input states.
+        metric (str): "l1", "frobenius" or "fidelity".
+    """
+    def __init__(self,
+                 gate_set: dict,
+                 target,
+                 num_qubits: int,
+                 num_states: int,
+                 kind: str = "basis",
+                 seed: int = 0,
+                 metric: str = "l1"):
+        self.compiled = compile_gate_set(gate_set, num_qubits)
+        if not is_quantum_circuit(target):
+            target = np.asarray(target, dtype=complex)
+        self.target = target
+        self.metric = metric
+        self.states = sample_states(num_qubits, num_states, kind, seed)
+        self.expected = target_outputs(target, self.states)
+        self.exact_threshold = None
+        self.exact_evaluations = 0
+        self._target_matrix = target if isinstance(target, np.ndarray) else None
+
+    def target_matrix(self) -> np.ndarray:
+        """Returns the goal's full unitary matrix, building it the first time it is needed"""
+        if self._target_matrix is None:
+            import qiskit.quantum_info as qi
+            self._target_matrix = qi.Operator(self.target).data
+        return self._target_matrix
+
+    def sampled_fitness(self, circuit: [[int, [int]]]) -> float:
+        """Returns the estimated fitness of a circuit from the sampled states"""
+        outputs = self.compiled.apply_circuit(self.states, circuit)
+        return sampled_distance(outputs, self.expected, self.metric)
+
+    def exact_fitness(self, circuit: [[int, [int]]]) -> float:
+        """Returns the fitness of a circuit calculated from its full unitary matrix"""
+        self.exact_evaluations += 1
+        return circuit_distance(self.compiled.unitary(circuit), self.target_matrix(), self.metric)
+
+    def evaluate(self, circuit: [[int, [int]]]) -> (float,):
+        """
+        Calculates a circuit's fitness from the sampled states, falling back to the
+        full unitary matrix when the circuit beats the exact threshold.
+
+        Args:
+            circuit ([[int, [int]]]): The circuit being evaluated.
+
+        Returns:
+            (fitness,): The fitness tuple, in the same format as circuit_fitness.
+        """
+        fitness = self.sampled_fitness(circuit)
+        if self.exact_threshold is not None and fitness < self.exact_threshold:
+            fitness = self.exact_fitness(circuit)
+
+        return (fitness,)
+
+    def update_threshold(self, population: list, elite_count: int):
+        """
+        Sets the exact threshold to the fitness of the least fit elite of a population,
+        so only circuits which would become elites are evaluated exactly.
+
+        Args:
+            population ([creator.Individual]): Circuits which all have a valid fitness.
+            elite_count (int): The number of circuits carried over by elitism.
+        """
+        elites = select_elites(population, max(elite_count, 1))
+        self.exact_threshold = elites[-1].fitness.values[0]
+
+    def register(self, toolbox):
+        """Registers the sampled evaluation as the DEAP toolbox's "evaluate" function"""
+        toolbox.register("evaluate", self.evaluate)
@@ -0,0 +1,193 @@
+"""
+A steady-state version of the EA without a generation barrier. A fixed number of
+children are always being evaluated on an executor, and as soon as any evaluation
+finishes the child is inserted into the population (replacing its least fit circuit,
+or the loser of a reverse tournament) and a new child is bred and dispatched. The
+workers never wait for the slowest evaluation of a generation, so they all stay busy.
+
+The children are bred with the same select, clone, mate and mutate functions as
+generation_step, and the statistics are recorded every record_every evaluations
+rather than every generation. To evaluate in other processes, an EvaluationPool
+sends the evaluation function (with its gate set and goal matrix) to each worker
+once when it starts, in the same way as parallel_evaluation.py, so only the genes
+of each child are sent with its evaluation.
+"""
+import random
+import concurrent.futures
+from deap import tools
+from evolution import evaluate_invalid
+
+def replace_worst(population: list, tournament_size: int) -> int:
+    """Returns the position of the least fit circuit in the population"""
+    return min(range(len(population)), key=lambda i: population[i].fitness.wvalues)
+
+def tournament_replace(population: list, tournament_size: int) -> int:
+    """
+    Returns the position of the least fit of tournament_size randomly chosen
+    circuits, so fitter circuits are less likely (but not certain) to survive.
+    """
+    contestants = random.sample(range(len(population)), min(tournament_size, len(population)))
+    return min(contestants, key=lambda i: population[i].fitness.wvalues)
+
+# The ways a finished child can be inserted, which can be chosen by name
+REPLACEMENTS = {"worst": replace_worst, "tournament": tournament_replace}
+
+# The evaluation function stored by each worker process of an EvaluationPool
+_worker_state = {}
+
+def _initialise_worker(evaluate):
+    """Stores the evaluation function in a newly started worker"""
+    _worker_state["evaluate"] = evaluate
+
+def _evaluate_circuit(circuit: list) -> (float,):
+    """Calculates the fitness of a child's genes inside a worker"""
+    return _worker_state["evaluate"](circuit)
+
+class EvaluationPool(concurrent.futures.ProcessPoolExecutor):
+    """
+    A ProcessPoolExecutor whose workers each receive the evaluation function once
+    when they start. Sending toolbox.evaluate with every child would unpickle a new
+    copy of its gate set for each evaluation, which unitary_engine.compile_gate_set
+    (keyed by the gate set's id) then compiles and stores again every time.
+
+    Args:
+        evaluate (function): The evaluation function, which must be picklable (e.g.
+            circuit_fitness registered with its gate set and goal matrix via
+            functools.partial).
+        processes (int): The number of worker processes, which defaults to the
+            number of CPUs.
+    """
+    def __init__(self, evaluate, processes: int = None):
+        super().__init__(processes, initializer=_initialise_worker, initargs=(evaluate,))
+
+    def submit_circuit(self, circuit: list) -> concurrent.futures.Future:
+        """Evaluates a child's genes in a worker, returning the future of its fitness"""
+        return self.submit(_evaluate_circuit, circuit)
+
+def breed_child(population: list, toolbox, mutation_rate: float, crossover_rate: float, tournament_size: int):
+    """
+    Creates a single child by selecting two parents by tournament, then crossing
+    them over and mutating the first, with the same probabilities as generation_step.
+
+    Args:
+        population ([creator.Individual]): The current population, which all have
+            valid fitness values.
+        toolbox (base.Toolbox): The DEAP toolbox with the "select", "clone", "mate"
+            and "mutate" functions registered.
+        mutation_rate (float): The probability the child is mutated.
+        crossover_rate (float): The probability the parents are crossed over.
+        tournament_size (int): The number of circuits taking part in each tournament.
+
+    Returns:
+        child (creator.Individual): The child, whose fitness is only valid if it
+            wasn't altered (so it is identical to a parent).
+    """
+    child, other = map(toolbox.clone, toolbox.select(population, 2, tournament_size))
+    if random.random() < crossover_rate:
+        toolbox.mate(child, other)
+        del child.fitness.values
+    if random.random() < mutation_rate:
+        toolbox.mutate(child)
+        del child.fitness.values
+
+    return child
+
+def steady_state(toolbox,
+                 population: list,
+                 num_evaluations: int,
+                 mutation_rate: float,
+                 crossover_rate: float,
+                 tournament_size: int,
+                 executor: concurrent.futures.Executor,
+                 in_flight: int,
+                 replacement: str = "worst",
+                 record_every: int = None,
+                 statistics: tools.Statistics = None,
+                 logbook: tools.Logbook = None) -> (list, tools.Logbook, object):
+    """
+    Runs the steady-state scheme until num_evaluations children have been evaluated.
+
+    Each child is sent to the executor as a plain list of genes, so the creator
+    classes don't need to exist in the worker processes. An EvaluationPool evaluates
+    it with the function its workers were started with, and any other executor
+    (such as a ThreadPoolExecutor) evaluates it with toolbox.evaluate.
+
+    Args:
+        toolbox (base.Toolbox): The DEAP toolbox with the "select", "clone", "mate",
+            "mutate" and "evaluate" functions registered.
+        population ([creator.Individual]): The initial population, which is altered in
+            place. Any circuit without a valid fitness value is evaluated first.
+        num_evaluations (int): The number of children evaluated before the run ends.
+        mutation_rate (float): The probability each child is mutated.
+        crossover_rate (float): The probability each child's parents are crossed over.
+        tournament_size (int): The number of circuits taking part in each tournament
+            (for selection, and for replacement when it is "tournament").
+        executor (concurrent.futures.Executor): Evaluates the children, such as a
+            ThreadPoolExecutor or an EvaluationPool.
+        in_flight (int): The number of children being evaluated at any time (at least
+            1), usually at least the number of workers of the executor.
+        replacement (str): How a finished child is inserted, "worst" (replacing the
+            least fit circuit) or "tournament" (replacing the least fit of a random
+            tournament).
+        record_every (int): The number of evaluations between each logbook record,
+            which defaults to the size of the population (one generation's worth).
+        statistics (tools.Statistics): Compiled for every record, if provided.
+        logbook (tools.Logbook): The logbook to continue recording in.
+
+    Returns:
+        (population, logbook, best_circuit): The final population, the logbook (with
+            an "evaluations" field in place of the generation) and the fittest
+            circuit found.
+    """
+    if replacement not in REPLACEMENTS:
+        raise ValueError("Unknown replacement " + repr(replacement) + ", expected one of " + str(list(REPLACEMENTS)))
+    if in_flight < 1:
+        raise ValueError("At least one child must be evaluated at a time, not " + str(in_flight))
+    if mutation_rate <= 0 and crossover_rate <= 0:
+        raise ValueError("Children are only evaluated when they are altered, so a mutation or crossover rate is needed")
+
+    replace = REPLACEMENTS[replacement]
+    if isinstance(executor, EvaluationPool):
+        submit = executor.submit_circuit
+    else:
+        submit = lambda circuit: executor.submit(toolbox.evaluate, circuit)
+    record_every = record_every or len(population)
+    logbook = tools.Logbook() if logbook is None else logbook
+
+    evaluate_invalid(population, toolbox)
+    best_circuit = toolbox.clone(max(population, key=lambda circuit: circuit.fitness.wvalues))
+
+    def insert(child):
+        # Replaces a circuit of the population with the finished child, and keeps
+        # a copy of the child if it is the fittest circuit found so far
+        nonlocal best_circuit
+        population[replace(population, tournament_size)] = child
+        if child.fitness.wvalues > best_circuit.fitness.wvalues:
+            best_circuit = toolbox.clone(child)
+
+    pending = {}
+    dispatched = 0
+    evaluations = 0
+    while evaluations < num_evaluations:
+        # Keeps in_flight children being evaluated, until every evaluation is dispatched
+        while len(pending) < in_flight and dispatched < num_evaluations:
+            child = breed_child(population, toolbox, mutation_rate, crossover_rate, tournament_size)
+            if child.fitness.valid:
+                # An unaltered child is a copy of its parent, so it doesn't need evaluating
+                insert(child)
+                continue
+            pending[submit(list(child))] = child
+            dispatched += 1
+
+        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            child = pending.pop(future)
+            child.fitness.values = future.result()
+            insert(child)
+            evaluations += 1
+
+            if evaluations % record_every == 0 or evaluations == num_evaluations:
+                record = statistics.compile(population) if statistics is not None else {}
+                logbook.record(evaluations=evaluations, best=best_circuit.fitness.values[0], **record)
+
+    return (population, logbook, best_circuit)
@@ -0,0 +1,131 @@
+"""
+Creates the goal (target) unitary matrices used by the EA only when they are
+requested, and stores each one on disk along with the size of its decomposed
+circuit, so later runs load the matrix instead of rebuilding the circuit
+"""
+import os
+import json
+import hashlib
+import tempfile
+import importlib.metadata
+import numpy as np
+
+# Changing this invalidates every stored target (e.g. if a circuit's construction changes)
+CACHE_VERSION = 1
+# The directory the targets are stored in, next to this file
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "target_cache")
+
+# The family and construction parameters of each target, keyed by the name of its
+# matrix in qft_circuits.py and grover_circuits.py
+TARGETS = {"qft_matrix1": ("qft", {"num_qubits": 2}),
+           "qft_matrix2": ("qft", {"num_qubits": 3}),
+           "qft_matrix3": ("qft", {"num_qubits": 4}),
+           "grover_matrix1": ("grover", {"marked_states": ["10"]}),
+           "grover_matrix2": ("grover", {"marked_states": ["011", "100"]}),
+           "grover_matrix3": ("grover", {"marked_states": ["0000", "1010"]})}
+
+# The targets which have already been built or loaded by this process
+_targets = {}
+
+def build_target(family: str, parameters: dict) -> (np.ndarray, int):
+    """
+    Creates a goal circuit with Qiskit and calculates its unitary matrix.
+
+    Args:
+        family (str): The algorithm the circuit implements, "qft" or "grover".
+        parameters (dict): The arguments passed to the family's circuit builder.
+
+    Returns:
+        (matrix, gate_count): The circuit's unitary matrix and the number of gates
+            in the circuit once decomposed into the gates used by the gate sets.
+    """
+    import qiskit.quantum_info as qi
+
+    if family == "qft":
+        from qft_circuits import build_qft_circuit
+        circuit = build_qft_circuit(**parameters)
+        # QFT circuits only need to be decomposed once
+        decomposed_circuit = circuit.decompose()
+    elif family == "grover":
+        from grover_circuits import build_grover_circuit
+        circuit = build_grover_circuit(**parameters)
+        # Grover's algorithm circuits need to be decomposed twice
+        decomposed_circuit = circuit.decompose().decompose()
+    else:
+        raise ValueError("Unknown target family " + repr(family) + ", expected \"qft\" or \"grover\"")
+
+    # The matrix is calculated from the circuit before it is decomposed
+    return (qi.Operator(circuit).data, decomposed_circuit.size())
+
+def target_key(family: str, parameters: dict) -> str:
+    """
+    Creates the name of the file a target is stored in, from a hash of everything
+    its unitary matrix depends on.
+
+    Args:
+        family (str): The algorithm the circuit implements.
+        parameters (dict): The arguments passed to the family's circuit builder.
+
+    Returns:
+        key (str): The family followed by a hash of the parameters, cache version and
+            Qiskit version.
+    """
+    description = json.dumps({"family": family,
+                              "parameters": parameters,
+                              "cache_version": CACHE_VERSION,
+                              "qiskit_version": importlib.metadata.version("qiskit")},
+                             sort_keys=True)
+    return family + "_" + hashlib.sha256(description.encode()).hexdigest()[:16]
+
+def get_target(family: str, parameters: dict, cache_directory: str = CACHE_DIRECTORY) -> (np.ndarray, int):
+    """
+    Returns a target's unitary matrix and decomposed gate count, building and storing
+    it the first time it is requested and loading it from disk afterwards.
+
+    Args:
+        family (str): The algorithm the circuit implements, "qft" or "grover".
+        parameters (dict): The arguments passed to the family's circuit builder.
+        cache_directory (str): The directory targets are stored in, or None to
+            never read or write targets on disk.
+
+    Returns:
+        (matrix, gate_count): The circuit's unitary matrix and decomposed gate count.
+    """
+    key = target_key(family, parameters)
+    if key in _targets:
+        return _targets[key]
+
+    path = None if cache_directory is None else os.path.join(cache_directory, key + ".npz")
+    if path is not None and os.path.exists(path):
+        with np.load(path) as stored:
+            target = (stored["matrix"], int(stored["gate_count"]))
+    else:
+        target = build_target(family, parameters)
+        if path is not None:
+            save_target(path, target, family, parameters)
+
+    _targets[key] = target
+    return target
+
+def save_target(path: str, target: (np.ndarray, int), family: str, parameters: dict):
+    """Writes a target to a temporary file and renames it, so a partly written file is never loaded"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, matrix=target[0], gate_count=target[1],
+                     description=json.dumps({"family": family, "parameters": parameters}))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def target_matrix(name: str) -> np.ndarray:
+    """Returns the unitary matrix of a named target, such as "qft_matrix3" """
+    family, parameters = TARGETS[name]
+    return get_target(family, parameters)[0]
+
+def target_gate_count(name: str) -> int:
+    """Returns the decomposed gate count of a named target, such as "grover_matrix3" """
+    family, parameters = TARGETS[name]
+    return get_target(family, parameters)[1]
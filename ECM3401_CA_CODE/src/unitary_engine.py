@@ -0,0 +1,313 @@
+"""
+Compiles the gate sets used by the EA into NumPy matrices once and builds the
+unitary matrix of a circuit directly from its list based representation, so
+that evaluating a circuit does not require a Qiskit QuantumCircuit or Operator
+"""
+import copy
+import math
+import numpy as np
+
+class CompiledGateSet:
+    """
+    Stores the matrix of every gate in a gate set as a tensor with one axis per
+    input and output qubit, which enables each gate to be applied to a 2^n x 2^n
+    unitary matrix by a tensor contraction over only the qubits it acts on.
+
+    Qiskit orders qubits in little-endian order (qubit 0 is the least significant
+    bit of a basis state's index), so when a matrix is reshaped into a tensor, qubit
+    q corresponds to the axis num_qubits - 1 - q.
+
+    Args:
+        gate_set ({int: Gate}): The gate set for the current algorithm and number of
+            qubits, mapping each gate id to its Qiskit gate (or "WIRE").
+        num_qubits (int): The number of qubits being used by the circuits.
+    """
+    def __init__(self, gate_set: dict, num_qubits: int):
+        self.num_qubits = num_qubits
+        self.dimension = 2 ** num_qubits
+        # Maps each gate id to its matrix reshaped into a (2,) * 2k tensor, where
+        # k is the number of qubits the gate acts on (None represents a wire)
+        self.gate_tensors = {}
+        for gate_id, gate in gate_set.items():
+            if isinstance(gate, str):
+                self.gate_tensors[gate_id] = None
+            else:
+                matrix = gate_matrix(gate)
+                gate_qubits = int(math.log2(matrix.shape[0]))
+                self.gate_tensors[gate_id] = matrix.reshape((2,) * (2 * gate_qubits))
+
+        # The contraction axes for each qubit combination and the full size matrix
+        # for each gene are calculated the first time they are needed
+        self._axes = {}
+        self._gene_matrices = {}
+        # Each distinct gene used by a batch is given an index into a stack of
+        # full size matrices, where index 0 is the identity (used for padding)
+        self._gene_indices = {}
+        self._gene_stack = np.eye(self.dimension, dtype=complex)[np.newaxis]
+        # The compiled gate set of the daggered gates, created by adjoint()
+        self._adjoint = None
+
+    def qubit_axes(self, qubits: [int]) -> (int,):
+        """
+        Returns the tensor axes that the gate's input axes are contracted with when
+        it is applied to the given qubits.
+
+        Args:
+            qubits ([int]): The qubits the gate is applied to, in the same order as
+                they are passed to QuantumCircuit.append.
+
+        Returns:
+            axes ((int,)): The matching tensor axes, the first of which belongs to
+                the gate's most significant qubit (the last qubit in the list).
+        """
+        key = tuple(qubits)
+        axes = self._axes.get(key)
+        if axes is None:
+            axes = tuple(self.num_qubits - 1 - qubit for qubit in reversed(key))
+            self._axes[key] = axes
+
+        return axes
+
+    def apply_gene(self, tensor: np.ndarray, gene: [int, [int]]) -> np.ndarray:
+        """
+        Applies a single gene (gate) to the left of a matrix stored as a tensor.
+
+        Args:
+            tensor (np.ndarray): A matrix with 2^n rows, reshaped so that each row
+                qubit has its own axis, followed by a single axis for the columns.
+            gene ([int, [int]]): The gate id and the qubits it is applied to.
+
+        Returns:
+            tensor (np.ndarray): The tensor with the same shape representing the
+                gate's matrix multiplied by the original matrix.
+        """
+        gate_tensor = self.gate_tensors[gene[0]]
+        if gate_tensor is None:
+            return tensor
+
+        axes = self.qubit_axes(gene[1])
+        gate_qubits = len(axes)
+        # Contracts the gate's input axes with the matching row axes, which places
+        # the gate's output axes first, so they are moved back into position
+        tensor = np.tensordot(gate_tensor, tensor,
+                              axes=(tuple(range(gate_qubits, 2 * gate_qubits)), axes))
+        return np.moveaxis(tensor, tuple(range(gate_qubits)), axes)
+
+    def apply_circuit(self, matrix: np.ndarray, circuit: [[int, [int]]]) -> np.ndarray:
+        """
+        Applies each gene in the circuit, in order, to the left of the given matrix.
+
+        Args:
+            matrix (np.ndarray): A 2^n x m matrix (the identity for a full unitary,
+                or a set of column statevectors).
+            circuit ([[int, [int]]]): The circuit in the list based representation.
+
+        Returns:
+            matrix (np.ndarray): The 2^n x m matrix after the circuit was applied.
+        """
+        columns = matrix.shape[1]
+        tensor = matrix.reshape((2,) * self.num_qubits + (columns,))
+        for gene in circuit:
+            tensor = self.apply_gene(tensor, gene)
+
+        return tensor.reshape(self.dimension, columns)
+
+    def unitary(self, circuit: [[int, [int]]]) -> np.ndarray:
+        """
+        Calculates the unitary matrix of a circuit, matching the data of
+        qi.Operator(convert_circuit(circuit, num_qubits, gate_set)).
+
+        Args:
+            circuit ([[int, [int]]]): The circuit in the list based representation.
+
+        Returns:
+            unitary (np.ndarray): The 2^n x 2^n complex unitary matrix of the circuit.
+        """
+        return self.apply_circuit(np.eye(self.dimension, dtype=complex), circuit)
+
+    def gene_matrix(self, gene: [int, [int]]) -> np.ndarray:
+        """
+        Returns the full 2^n x 2^n matrix of a single gene, which is calculated
+        once and reused for every later call with the same gene.
+
+        Args:
+            gene ([int, [int]]): The gate id and the qubits it is applied to.
+
+        Returns:
+            matrix (np.ndarray): The gene's matrix acting on all n qubits.
+        """
+        key = (gene[0], tuple(gene[1]))
+        matrix = self._gene_matrices.get(key)
+        if matrix is None:
+            matrix = self.unitary([gene])
+            self._gene_matrices[key] = matrix
+
+        return matrix
+
+    def adjoint(self):
+        """
+        Returns a compiled gate set holding the conjugate transpose (dagger) of each
+        gate, so applying a circuit's genes from it in reverse order applies the
+        circuit's inverse U^dagger. It is only created the first time it is needed.
+
+        Returns:
+            adjoint (CompiledGateSet): The compiled gate set of the daggered gates.
+        """
+        if self._adjoint is None:
+            adjoint = copy.copy(self)
+            adjoint.gate_tensors = {}
+            for gate_id, tensor in self.gate_tensors.items():
+                if tensor is None:
+                    adjoint.gate_tensors[gate_id] = None
+                else:
+                    # Swaps the output and input axes and conjugates each element
+                    gate_qubits = tensor.ndim // 2
+                    axes = tuple(range(gate_qubits, 2 * gate_qubits)) + tuple(range(gate_qubits))
+                    adjoint.gate_tensors[gate_id] = np.conj(tensor.transpose(axes))
+            adjoint._gene_matrices = {}
+            adjoint._gene_indices = {}
+            adjoint._gene_stack = self._gene_stack[:1]
+            adjoint._adjoint = self
+            self._adjoint = adjoint
+
+        return self._adjoint
+
+    def gene_indices(self, circuits: [[[int, [int]]]]) -> np.ndarray:
+        """
+        Converts a list of circuits into a 2D array of indices into the stack of
+        gene matrices, adding the matrix of any gene that hasn't been seen before.
+
+        Args:
+            circuits ([[[int, [int]]]]): The circuits in the list based representation.
+                Circuits shorter than the longest one are padded with the identity.
+
+        Returns:
+            indices (np.ndarray): A (number of circuits, circuit length) integer array.
+        """
+        length = max((len(circuit) for circuit in circuits), default=0)
+        indices = np.zeros((len(circuits), length), dtype=np.intp)
+        new_matrices = []
+        for row, circuit in enumerate(circuits):
+            for column, gene in enumerate(circuit):
+                key = (gene[0], tuple(gene[1]))
+                index = self._gene_indices.get(key)
+                if index is None:
+                    index = len(self._gene_indices) + 1
+                    self._gene_indices[key] = index
+                    new_matrices.append(self.gene_matrix(gene))
+                indices[row, column] = index
+
+        # The stack is only rebuilt when new genes were found
+        if new_matrices:
+            self._gene_stack = np.concatenate((self._gene_stack, np.stack(new_matrices)))
+
+        return indices
+
+    def batch_unitaries(self, circuits: [[[int, [int]]]]) -> np.ndarray:
+        """
+        Calculates the unitary matrices of a whole list of circuits at once, by
+        multiplying every circuit's matrix by the gene at the same position with a
+        single batched matrix multiplication per position.
+
+        Args:
+            circuits ([[[int, [int]]]]): The circuits in the list based representation.
+
+        Returns:
+            unitaries (np.ndarray): A (number of circuits, 2^n, 2^n) complex array where
+                each entry matches the result of unitary() for the same circuit.
+        """
+        return self.stacked_unitaries(self.gene_indices(circuits))
+
+    def stacked_unitaries(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Calculates the unitary matrices of circuits given as indices into the stack of
+        gene matrices, such as the indices returned by gene_indices.
+
+        Args:
+            indices (np.ndarray): A (number of circuits, circuit length) integer array.
+
+        Returns:
+            unitaries (np.ndarray): A (number of circuits, 2^n, 2^n) complex array.
+        """
+        if indices.shape[1] == 0:
+            return np.repeat(self._gene_stack[:1], len(indices), axis=0)
+
+        # Indexing the stack copies the matrices of the first gene of every circuit
+        unitaries = self._gene_stack[indices[:, 0]]
+        for column in range(1, indices.shape[1]):
+            unitaries = np.matmul(self._gene_stack[indices[:, column]], unitaries)
+
+        return unitaries
+
+def gate_matrix(gate) -> np.ndarray:
+    """
+    Returns the matrix of a Qiskit gate (or composite circuit such as MCMT).
+
+    Args:
+        gate (Gate): The Qiskit gate or circuit taken from a gate set.
+
+    Returns:
+        matrix (np.ndarray): The gate's complex matrix in Qiskit's qubit ordering.
+    """
+    # Qiskit is only imported when a gate set is compiled, which happens once
+    # per gate set as the result is stored by compile_gate_set
+    import qiskit.quantum_info as qi
+    return np.asarray(qi.Operator(gate).data, dtype=complex)
+
+# Stores each compiled gate set, keyed by the id of the gate set dictionary and
+# the number of qubits, along with the dictionary itself so the id stays valid
+_compiled_gate_sets = {}
+
+def compile_gate_set(gate_set: dict, num_qubits: int) -> CompiledGateSet:
+    """
+    Returns the compiled version of a gate set, only compiling it the first time
+    the gate set is used with the given number of qubits.
+
+    Args:
+        gate_set ({int: Gate}): The gate set for the current algorithm and number of
+            qubits, mapping each gate id to its Qiskit gate (or "WIRE").
+        num_qubits (int): The number of qubits being used by the circuits.
+
+    Returns:
+        compiled (CompiledGateSet): The gate set's matrices stored as tensors.
+    """
+    key = (id(gate_set), num_qubits)
+    cached = _compiled_gate_sets.get(key)
+    if cached is None or cached[0] is not gate_set:
+        cached = (gate_set, CompiledGateSet(gate_set, num_qubits))
+        _compiled_gate_sets[key] = cached
+
+    return cached[1]
+
+def circuit_unitary(current_circuit: [[int, [int]]],
+                    gate_set: dict,
+                    num_qubits: int) -> np.ndarray:
+    """
+    Calculates the unitary matrix of a circuit without converting it into a
+    Qiskit QuantumCircuit.
+
+    Args:
+        current_circuit ([[int, [int]]]): The circuit in the list based representation.
+        gate_set ({int: Gate}): The gate set used by the circuit.
+        num_qubits (int): The number of qubits being used by the circuit.
+
+    Returns:
+        unitary (np.ndarray): The 2^n x 2^n complex unitary matrix of the circuit.
+    """
+    return compile_gate_set(gate_set, num_qubits).unitary(current_circuit)
+
+def batch_circuit_unitaries(circuits: [[[int, [int]]]],
+                            gate_set: dict,
+                            num_qubits: int) -> np.ndarray:
+    """
+    Calculates the unitary matrices of a list of circuits as one stacked array.
+
+    Args:
+        circuits ([[[int, [int]]]]): The circuits in the list based representation.
+        gate_set ({int: Gate}): The gate set used by the circuits.
+        num_qubits (int): The number of qubits being used by the circuits.
+
+    Returns:
+        unitaries (np.ndarray): A (number of circuits, 2^n, 2^n) complex array.
+    """
+    return compile_gate_set(gate_set, num_qubits).batch_unitaries(circuits)
@@ -0,0 +1,387 @@
+"""
+Times each step of the evaluation hot path (convert_circuit, circuit_fitness,
+mutate, crossover, circuit_size and one full generation) for every shipped target,
+with the generation timed at several population sizes, along with the time taken to
+import each of the EA's modules in a new interpreter. The timings are written to
+a JSON baseline file, which later runs can be compared against so that slowdowns
+show up as numbers rather than as a longer wall-clock time in experiment_results.
+
+Usage (from the tests directory, with src on the PYTHONPATH):
+    python benchmark_suite.py record [--output benchmark_baseline.json]
+    python benchmark_suite.py compare benchmark_baseline.json [--threshold 0.2]
+    python benchmark_suite.py memory [--targets ...] [--population-sizes ...]
+
+Both commands accept --targets, --population-sizes, --imports and --repeats. compare
+exits with a status of 1 when any benchmark is slower than the baseline by more than
+the threshold (e.g. 0.2 for 20%), so it can be used as a check before merging.
+memory compares the memory allocated by cloning with DEAP's deep copy against the
+shallow light_clone of shared_genes.py.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+import subprocess
+import tracemalloc
+import numpy as np
+from deap import base, creator, tools
+from functions import convert_circuit, circuit_fitness, mutate, crossover, circuit_size
+from evolution import generation_step
+from shared_genes import interned_gates, light_clone
+from target_registry import target_matrix, target_gate_count
+from qft_circuits import qgate_set1, qgate_set2, qgate_set3, qpossible_gates_1, qpossible_gates_2, qpossible_gates_3
+from grover_circuits import ggate_set1, ggate_set2, ggate_set3, gpossible_gates_1, gpossible_gates_2, gpossible_gates_3
+
+# Changing this makes older baselines fail to compare instead of comparing wrongly
+BENCHMARK_VERSION = 1
+
+# The gate set, possible gates and number of qubits of each shipped target
+BENCHMARK_TARGETS = {"qft_matrix1": (qgate_set1, qpossible_gates_1, 2),
+                     "qft_matrix2": (qgate_set2, qpossible_gates_2, 3),
+                     "qft_matrix3": (qgate_set3, qpossible_gates_3, 4),
+                     "grover_matrix1": (ggate_set1, gpossible_gates_1, 2),
+                     "grover_matrix2": (ggate_set2, gpossible_gates_2, 3),
+                     "grover_matrix3": (ggate_set3, gpossible_gates_3, 4)}
+
+# The population sizes one full generation is timed at (600 is main.ipynb's POP_SIZE)
+POPULATION_SIZES = (50, 200, 600)
+
+# The modules whose import time is measured, from the evaluation core to the entry point
+IMPORT_MODULES = ("functions", "qft_circuits", "grover_circuits", "unitary_engine", "evolution",
+                  "parallel_evaluation", "run_ea")
+
+# The directories searched for the modules, when importing them in a new interpreter
+MODULE_DIRECTORIES = [os.path.dirname(os.path.abspath(__file__)),
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")]
+
+# The EA parameters used by main.ipynb
+MUTATION_RATE = 0.8
+CROSSOVER_RATE = 0.6
+ELITISM_RATE = 0.05
+TOURNAMENT_SIZE = 4
+
+# Creates a minimising fitness and individual, unless another module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+def time_call(function, repeats: int = 5, minimum_time: float = 0.05) -> float:
+    """
+    Times a function in the same way as timeit, calling it enough times per repeat
+    to take at least minimum_time seconds and keeping the fastest repeat, which is
+    the least affected by other processes.
+
+    Args:
+        function (function): The function being timed, which takes no arguments.
+        repeats (int): The number of times the calls are timed.
+        minimum_time (float): The shortest time each repeat should take.
+
+    Returns:
+        seconds (float): The fastest time of a single call.
+    """
+    # Doubles the number of calls until a repeat takes long enough to time accurately
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minimum_time:
+            break
+        number *= 2
+
+    fastest = elapsed / number
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        fastest = min(fastest, (time.perf_counter() - start) / number)
+
+    return fastest
+
+def import_time(module: str, repeats: int = 5) -> float:
+    """
+    Times importing a module in a new interpreter, so nothing it imports has
+    already been loaded by this process.
+
+    Args:
+        module (str): The name of the module being imported.
+        repeats (int): The number of interpreters started.
+
+    Returns:
+        seconds (float): The fastest time taken by the import.
+    """
+    code = "import time; start = time.perf_counter(); import " + module + "; print(time.perf_counter() - start)"
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(MODULE_DIRECTORIES + [os.environ.get("PYTHONPATH", "")]))
+    times = []
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-W", "ignore", "-c", code], env=environment,
+                                   capture_output=True, text=True, check=True)
+        times.append(float(completed.stdout.strip().splitlines()[-1]))
+
+    return min(times)
+
+def create_toolbox(name: str, shared_genes: bool = False):
+    """
+    Registers the EA's functions for one of the shipped targets, in the same way
+    as main.ipynb.
+
+    Args:
+        name (str): The name of the target, a key of BENCHMARK_TARGETS.
+        shared_genes (bool): Whether the circuits are made of interned genes and
+            cloned by light_clone, rather than deep copied.
+
+    Returns:
+        toolbox (base.Toolbox): The toolbox, with the functions used by generation_step.
+    """
+    gate_set, possible_gates, num_qubits = BENCHMARK_TARGETS[name]
+    toolbox = base.Toolbox()
+    if shared_genes:
+        possible_gates = interned_gates(possible_gates)
+        toolbox.register("clone", light_clone)
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(possible_gates), n=target_gate_count(name) + 1)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", crossover)
+    toolbox.register("mutate", mutate, possible_gates=possible_gates)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", circuit_fitness, gate_set=gate_set,
+                     target_matrix=target_matrix(name), num_qubits=num_qubits)
+    return toolbox
+
+def benchmark_target(name: str,
+                     population_sizes: [int] = POPULATION_SIZES,
+                     repeats: int = 5,
+                     seed: int = 0) -> {str: float}:
+    """
+    Times each step of the hot path for one target.
+
+    Args:
+        name (str): The name of the target, a key of BENCHMARK_TARGETS.
+        population_sizes ([int]): The population sizes a generation is timed at.
+        repeats (int): The number of repeats of each timing.
+        seed (int): Seeds the circuits being timed, so every run times the same circuits.
+
+    Returns:
+        timings ({str: float}): The seconds taken by a single call of each step, keyed
+            by "target/step" (and "target/generation/population_size" for generations).
+    """
+    random.seed(seed)
+    gate_set, possible_gates, num_qubits = BENCHMARK_TARGETS[name]
+    toolbox = create_toolbox(name)
+    goal_matrix = target_matrix(name)
+    circuits = toolbox.population(n=64)
+    # Each call of the step functions uses the next circuit, so a single circuit's
+    # cost doesn't decide the timing
+    next_circuit = itertools.cycle(circuits).__next__
+    next_pair = itertools.cycle(zip(circuits[::2], circuits[1::2])).__next__
+
+    timings = {}
+    timings[name + "/convert_circuit"] = time_call(
+        lambda: convert_circuit(next_circuit(), num_qubits, gate_set), repeats)
+    timings[name + "/circuit_fitness"] = time_call(
+        lambda: circuit_fitness(next_circuit(), gate_set, goal_matrix, num_qubits), repeats)
+    timings[name + "/mutate"] = time_call(
+        lambda: toolbox.mutate(next_circuit()), repeats)
+    timings[name + "/crossover"] = time_call(
+        lambda: toolbox.mate(*next_pair()), repeats)
+    timings[name + "/circuit_size"] = time_call(
+        lambda: circuit_size(next_circuit()), repeats)
+
+    for population_size in population_sizes:
+        population = toolbox.population(n=population_size)
+        # The initial evaluation isn't part of a generation, so it isn't timed
+        for circuit in population:
+            circuit.fitness.values = toolbox.evaluate(circuit)
+        elite_count = int(ELITISM_RATE * population_size)
+        # Each generation starts from the same population, which is left unchanged
+        # as generation_step only alters clones of it
+        timings[name + "/generation/" + str(population_size)] = time_call(
+            lambda: generation_step(population, toolbox, MUTATION_RATE, CROSSOVER_RATE,
+                                    elite_count, TOURNAMENT_SIZE),
+            repeats=max(repeats // 2, 1), minimum_time=0.0)
+
+    return timings
+
+def run_benchmarks(targets: [str] = None,
+                   population_sizes: [int] = POPULATION_SIZES,
+                   repeats: int = 5,
+                   import_modules: [str] = IMPORT_MODULES) -> dict:
+    """
+    Times every step for each of the targets, and the import of each module.
+
+    Args:
+        targets ([str]): The names of the targets, which defaults to every shipped target.
+        population_sizes ([int]): The population sizes a generation is timed at.
+        repeats (int): The number of repeats of each timing.
+        import_modules ([str]): The modules whose import is timed (keyed by "import/module").
+
+    Returns:
+        results (dict): The timings, along with the machine and library versions they
+            were recorded with.
+    """
+    timings = {}
+    for module in import_modules:
+        timings["import/" + module] = import_time(module, repeats)
+    for name in targets or BENCHMARK_TARGETS:
+        timings.update(benchmark_target(name, population_sizes, repeats))
+
+    return {"version": BENCHMARK_VERSION,
+            "machine": {"python": platform.python_version(),
+                        "numpy": np.__version__,
+                        "platform": platform.platform(),
+                        "processor": platform.processor()},
+            "timings": timings}
+
+def clone_memory(name: str, population_size: int, shared_genes: bool, seed: int = 0) -> dict:
+    """
+    Measures the memory used by cloning a population, as generation_step does with
+    the selected circuits, and by one full generation.
+
+    Args:
+        name (str): The name of the target, a key of BENCHMARK_TARGETS.
+        population_size (int): The number of circuits in the population.
+        shared_genes (bool): Whether light_clone is used instead of the deep copy.
+        seed (int): Seeds the population, so both clone functions use the same circuits.
+
+    Returns:
+        memory (dict): The bytes held by the clones of the population, the number of
+            memory blocks they use, the peak bytes allocated by a generation and
+            the seconds taken to clone the population.
+    """
+    random.seed(seed)
+    toolbox = create_toolbox(name, shared_genes)
+    population = toolbox.population(n=population_size)
+    for circuit in population:
+        circuit.fitness.values = toolbox.evaluate(circuit)
+
+    tracemalloc.start()
+    held_bytes, held_blocks = tracemalloc.get_traced_memory()[0], len(tracemalloc.take_snapshot().traces)
+    clones = list(map(toolbox.clone, population))
+    snapshot = tracemalloc.take_snapshot()
+    held_bytes = tracemalloc.get_traced_memory()[0] - held_bytes
+    held_blocks = len(snapshot.traces) - held_blocks
+    del clones, snapshot
+
+    tracemalloc.reset_peak()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    generation_step(population, toolbox, MUTATION_RATE, CROSSOVER_RATE,
+                    int(ELITISM_RATE * population_size), TOURNAMENT_SIZE)
+    peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+    tracemalloc.stop()
+
+    return {"clone_bytes": held_bytes,
+            "clone_blocks": held_blocks,
+            "generation_peak_bytes": peak_bytes,
+            "clone_seconds": time_call(lambda: list(map(toolbox.clone, population)), repeats=3)}
+
+def compare_memory(targets: [str] = None, population_sizes: [int] = POPULATION_SIZES) -> str:
+    """Creates a table of the memory used by each clone function for each target and population size"""
+    lines = ["{:<32}{:>14}{:>14}{:>14}{:>12}".format("benchmark", "clone (KiB)", "blocks", "peak (KiB)", "clone (ms)")]
+    for name in targets or BENCHMARK_TARGETS:
+        for population_size in population_sizes:
+            for shared_genes in (False, True):
+                memory = clone_memory(name, population_size, shared_genes)
+                lines.append("{:<32}{:>14.1f}{:>14}{:>14.1f}{:>12.3f}".format(
+                    name + "/" + str(population_size) + ("/light_clone" if shared_genes else "/deepcopy"),
+                    memory["clone_bytes"] / 1024, memory["clone_blocks"],
+                    memory["generation_peak_bytes"] / 1024, 1000 * memory["clone_seconds"]))
+
+    return "\n".join(lines)
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2) -> [dict]:
+    """
+    Compares the timings of two runs, finding the benchmarks which have slowed down.
+
+    Args:
+        baseline (dict): The results of the earlier run, as returned by run_benchmarks.
+        current (dict): The results of the current run.
+        threshold (float): The largest allowed slowdown, as a fraction of the baseline
+            time (0.2 allows benchmarks to take up to 20% longer).
+
+    Returns:
+        comparisons ([dict]): The name, baseline time, current time, ratio (current
+            over baseline) and whether it is a regression, for each benchmark in both runs.
+    """
+    if baseline.get("version") != current.get("version"):
+        raise ValueError("The baseline was recorded by an incompatible version of the benchmark suite")
+
+    comparisons = []
+    for name, current_time in current["timings"].items():
+        baseline_time = baseline["timings"].get(name)
+        if baseline_time is None:
+            continue
+
+        ratio = current_time / baseline_time if baseline_time > 0 else float("inf")
+        comparisons.append({"name": name,
+                            "baseline": baseline_time,
+                            "current": current_time,
+                            "ratio": ratio,
+                            "regression": ratio > 1 + threshold})
+
+    return comparisons
+
+def format_comparisons(comparisons: [dict]) -> str:
+    """Creates a table of the comparisons, marking each regression"""
+    lines = ["{:<40}{:>14}{:>14}{:>9}".format("benchmark", "baseline (ms)", "current (ms)", "ratio")]
+    for comparison in comparisons:
+        lines.append("{:<40}{:>14.4f}{:>14.4f}{:>9.2f}{}".format(
+            comparison["name"], 1000 * comparison["baseline"], 1000 * comparison["current"],
+            comparison["ratio"], "  SLOWER" if comparison["regression"] else ""))
+
+    return "\n".join(lines)
+
+def main(arguments: [str] = None) -> int:
+    """Records or compares the benchmarks specified by the command line arguments"""
+    parser = argparse.ArgumentParser(description="Times the EA's evaluation hot path")
+    parser.add_argument("command", choices=["record", "compare", "memory"])
+    parser.add_argument("baseline", nargs="?", default="benchmark_baseline.json",
+                        help="the baseline file being compared against (compare only)")
+    parser.add_argument("--output", default=None, help="the file the results are written to")
+    parser.add_argument("--targets", nargs="+", default=None, choices=list(BENCHMARK_TARGETS))
+    parser.add_argument("--population-sizes", nargs="+", type=int, default=list(POPULATION_SIZES))
+    parser.add_argument("--imports", nargs="*", default=list(IMPORT_MODULES),
+                        help="the modules whose import is timed (none if the option is empty)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="the largest allowed slowdown, as a fraction of the baseline time")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == "memory":
+        print(compare_memory(arguments.targets, arguments.population_sizes))
+        return 0
+
+    # The baseline is read before any results are written, as --output may replace it
+    if arguments.command == "compare":
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+
+    results = run_benchmarks(arguments.targets, arguments.population_sizes, arguments.repeats, arguments.imports)
+    output = arguments.output or (arguments.baseline if arguments.command == "record" else None)
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if arguments.command == "record":
+        for name, seconds in results["timings"].items():
+            print("{:<40}{:>12.4f} ms".format(name, 1000 * seconds))
+        return 0
+
+    comparisons = compare_results(baseline, results, arguments.threshold)
+    print(format_comparisons(comparisons))
+
+    regressions = [comparison for comparison in comparisons if comparison["regression"]]
+    if regressions:
+        print(len(regressions), "of", len(comparisons), "benchmarks are more than",
+              str(round(100 * arguments.threshold)) + "% slower than the baseline")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
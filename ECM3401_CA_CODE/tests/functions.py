@@ -1,12 +1,11 @@
 import random
 import math
 import numpy as np
-import qiskit.quantum_info as qi
-import matplotlib.pyplot as plt
-from deap import base, creator, tools
-from qiskit import QuantumCircuit
-from qft_circuits import *
-from grover_circuits import *
+from qft_circuits import qpossible_gates_2
+from unitary_engine import circuit_unitary, batch_circuit_unitaries, compile_gate_set
+from fitness_metrics import circuit_distance, batch_distances
+from circuit_simplifier import simplifier_for
+from profiling import PhaseTimer, NULL_TIMER
 
 def random_gate() -> [int, [int,int]]:
     """ 
@@ -24,7 +23,10 @@ def random_gate() -> [int, [int,int]]:
 def circuit_fitness(current_circuit: [[int, [int, int]]],
                    gate_set: [[int, [int, int]]],
                    target_matrix: [[float]],
-                   num_qubits: int) -> (float,):
+                   num_qubits: int,
+                   native_engine: bool = False,
+                   metric: str = "l1",
+                   timer: PhaseTimer = None) -> (float,):
     """
     Converts the provided circuit into a Quantum Circuit object that Qiskit can
     operate on and then calculates the fitness of the circuit (the element to element
@@ -44,6 +46,14 @@ def circuit_fitness(current_circuit: [[int, [int, int]]],
             to be calculated.
         num_qubits (int): The number of qubits being used by the circuit, stored
             as an integer as this value is a whole number.
+        native_engine (bool): Whether the unitary matrix is built directly with
+            NumPy from the compiled gate set (see unitary_engine.py) instead of
+            converting the circuit into a QuantumCircuit and using qi.Operator.
+        metric (str): The name of the distance measure used as the fitness (see
+            fitness_metrics.py), "l1" (the element to element difference), "frobenius"
+            or "fidelity" (which ignores the global phase), or a metric function.
+        timer (PhaseTimer): Times the conversion, matrix calculation and fitness sum
+            as separate phases (see profiling.py), if provided.
 
     Returns:
         (fitness,): The Deap library requires all evaluation functions to return
@@ -51,20 +61,99 @@ def circuit_fitness(current_circuit: [[int, [int, int]]],
             The float representing the difference between the current circuit and the
             goal is returned in the desired format.
     """
-    # Converts the representation of the current circuit into a QuantumCircuit object
-    qiskit_representation = convert_circuit(current_circuit, num_qubits, gate_set)
-    # Finds the matrix representing the current quantum circuit
-    circuit_unitary_matrix = qi.Operator(qiskit_representation)
-    circuit_unitary_matrix = circuit_unitary_matrix.data
-    # The circuit's fitness is the sum of the absolute element to element difference
-    fitness = 0
-    for i in range(0, len(circuit_unitary_matrix)):
-        for j in range(0, len(circuit_unitary_matrix[i])):
-            fitness += abs(circuit_unitary_matrix[i][j] - target_matrix[i][j])
+    timer = timer or NULL_TIMER
+    if native_engine:
+        # Applies each gate's compiled matrix directly, skipping Qiskit entirely
+        with timer.phase("circuit_unitary"):
+            circuit_unitary_matrix = circuit_unitary(current_circuit, gate_set, num_qubits)
+    else:
+        # Converts the representation of the current circuit into a QuantumCircuit object
+        with timer.phase("convert_circuit"):
+            qiskit_representation = convert_circuit(current_circuit, num_qubits, gate_set)
+        # Finds the matrix representing the current quantum circuit. Qiskit is only
+        # imported when it's first used, so importing these functions stays cheap
+        import qiskit.quantum_info as qi
+        with timer.phase("operator"):
+            circuit_unitary_matrix = qi.Operator(qiskit_representation)
+            circuit_unitary_matrix = circuit_unitary_matrix.data
+    # By default, the circuit's fitness is the sum of the absolute element to element
+    # difference, calculated over the whole matrix at once with NumPy
+    with timer.phase("fitness_sum"):
+        fitness = circuit_distance(circuit_unitary_matrix, target_matrix, metric)
 
     return (fitness,)
 
-def circuit_size(current_circuit: [[int, [int, int]]]) -> int:
+def batch_circuit_fitness(circuits: [[[int, [int, int]]]],
+                          gate_set: [[int, [int, int]]],
+                          target_matrix: [[float]],
+                          num_qubits: int,
+                          metric: str = "l1") -> [(float,)]:
+    """
+    Calculates the fitness of a whole list of circuits (such as every altered
+    circuit in a generation) in one call, building all of their unitary matrices
+    as a single stacked array instead of evaluating each circuit individually.
+
+    Args:
+        circuits ([[[int, [int, int]]]]): The circuits being evaluated by the algorithm,
+            each stored in the same format as the circuits passed to circuit_fitness.
+        gate_set ([int, [[int, [int, int]]]): The complete gate set for the current
+            algorithm and number of qubits.
+        target_matrix ([[float]]): The array of imaginary float values representing the
+            goal circuit.
+        num_qubits (int): The number of qubits being used by the circuits.
+        metric (str): The name of the distance measure used as the fitness, or a
+            metric function (see circuit_fitness).
+
+    Returns:
+        [(fitness,)]: A fitness tuple for each circuit, in the same order as the circuits,
+            holding the same value circuit_fitness would return for that circuit.
+    """
+    if len(circuits) == 0:
+        return []
+
+    # Stacks every circuit's unitary matrix into a (circuits, 2^n, 2^n) array
+    unitaries = batch_circuit_unitaries(circuits, gate_set, num_qubits)
+    # The chosen metric is calculated for every circuit at once
+    fitnesses = batch_distances(unitaries, target_matrix, metric)
+
+    return [(fitness,) for fitness in fitnesses.tolist()]
+
+def index_array_fitness(population: np.ndarray,
+                        possible_gates: [[int, [int, int]]],
+                        gate_set: [[int, [int, int]]],
+                        target_matrix: [[float]],
+                        num_qubits: int,
+                        metric: str = "l1") -> np.ndarray:
+    """
+    Calculates the fitness of a population stored as a 2D array of indices into the
+    list of possible gates (see compact_genome.stack_population), without converting
+    the population back into lists of genes.
+
+    Args:
+        population (np.ndarray): A (population size, circuit length) array of indices.
+        possible_gates ([[int, [int, int]]]): The genes the indices refer to.
+        gate_set ([int, [[int, [int, int]]]): The complete gate set for the current
+            algorithm and number of qubits.
+        target_matrix ([[float]]): The array of imaginary float values representing the
+            goal circuit.
+        num_qubits (int): The number of qubits being used by the circuits.
+        metric (str): The name of the distance measure used as the fitness, or a
+            metric function (see circuit_fitness).
+
+    Returns:
+        fitnesses (np.ndarray): The fitness of each row, holding the same value
+            circuit_fitness would return for that circuit.
+    """
+    compiled = compile_gate_set(gate_set, num_qubits)
+    # Maps each possible gate to the position of its matrix in the compiled stack
+    stack_indices = compiled.gene_indices([possible_gates])[0]
+    unitaries = compiled.stacked_unitaries(stack_indices[np.asarray(population, dtype=np.intp)])
+
+    return batch_distances(unitaries, target_matrix, metric)
+
+def circuit_size(current_circuit: [[int, [int, int]]],
+                 gate_set: [[int, [int, int]]] = None,
+                 num_qubits: int = None) -> int:
     """
     Calculates and returns the number of gates within a quantum circuit,
     using my proprietary (non-qiskit) representation.
@@ -74,11 +163,19 @@ def circuit_size(current_circuit: [[int, [int, int]]]) -> int:
             as some gates only affect one qubit or represent a wire. The current circuit
             being evaluated by the algorithm, stored in a format that can easily be
             converted into a Qiskit represntation.
+        gate_set ([int, [[int, [int, int]]]): The complete gate set for the current
+            algorithm and number of qubits. When it is provided (along with num_qubits),
+            the circuit is simplified first (see circuit_simplifier.py), so gates which
+            cancel each other out aren't counted.
+        num_qubits (int): The number of qubits being used by the circuit.
     
     Returns:
         size (int): The size of the circuit, as an integer as this value is a whole
             number.
     """
+    if gate_set is not None:
+        return simplifier_for(gate_set, num_qubits).size(current_circuit)
+
     size = 0
     # Loops through each index in the circuit representation
     # The size counter is incremented for each index that isn't a wire
@@ -90,7 +187,7 @@ def circuit_size(current_circuit: [[int, [int, int]]]) -> int:
 
 def convert_circuit(current_circuit: [[int, [int, int]]],
                     num_qubits: int,
-                    gate_set: [[int, [int, int]]]) -> QuantumCircuit(int):
+                    gate_set: [[int, [int, int]]]) -> "QuantumCircuit":
     """
     Converts a list based representation of a quantum circuit into a Qiskit compatible
     QuantumCircuit object which can be modified and read with Qiskit's methods.
@@ -111,6 +208,7 @@ def convert_circuit(current_circuit: [[int, [int, int]]],
         circuit (QuantumCircuit(int)): The Qiskit QuantumCircuit representation of the
             circuit being evaluated by the algorithm.
     """
+    from qiskit import QuantumCircuit
     # Creates a new QuantumCircuit object to add the gates to
     circuit = QuantumCircuit(num_qubits)
     for gate in current_circuit:
@@ -124,7 +222,8 @@ def convert_circuit(current_circuit: [[int, [int, int]]],
 
     return circuit
 
-def mutate(circuit: [[int, [int, int]]]) -> [[int, [int, int]]]:
+def mutate(circuit: [[int, [int, int]]],
+           possible_gates: [[int, [int]]] = qpossible_gates_2) -> [[int, [int, int]]]:
     """
     Mutates a random gate in the provided circuit by changing it to another gate
     from the gate set at random (this gate set is the one being used by the algorithm being
@@ -135,6 +234,9 @@ def mutate(circuit: [[int, [int, int]]]) -> [[int, [int, int]]]:
             as some gates only affect one qubit or represent a wire. The current circuit
             which is about to be mutated, stored in a format that can easily be
             converted into a Qiskit represntation.
+        possible_gates ([[int, [int]]]): The genes the mutated gate can be replaced with,
+            which must match the gate set of the target (e.g. qpossible_gates_3 for the
+            4 qubit QFT), registered with toolbox.register("mutate", mutate, possible_gates=...).
 
     Returns:
         circuit ([int, [[int, [int, int]]]): This typecasting is not absolute
@@ -143,9 +245,6 @@ def mutate(circuit: [[int, [int, int]]]) -> [[int, [int, int]]]:
             potentially changed), stored in a format that can easily be converted into a
             Qiskit represntation.
     """
-    # The current gate can be mutated to any other gate in the gate set
-    possible_gates = qpossible_gates_2
-    
     # Choose a random gate in the circuit via index to mutate
     mutation_index = random.randint(0, len(circuit) - 1)
     # Choose a random gate from the gate set to replace said gate
@@ -0,0 +1,83 @@
+"""A unit test module to validate the batch mutation and crossover operators"""
+import unittest
+import numpy as np
+from batch_operators import batch_crossover, batch_mutate, vary_population
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the batch mutation and crossover operators
+
+    # Valid tests - checking the variation applied to populations of gene indices
+    def test_batch_crossover_valid1(self):
+        """Tests that each crossed pair swaps one segment and keeps its genes"""
+        rng = np.random.default_rng(0)
+        population = np.stack([np.full(8, row) for row in range(101)])
+        original = population.copy()
+        crossed = batch_crossover(population, 1.0, rng)
+
+        # The last row of an odd population has no partner
+        self.assertTrue(crossed[:100].all())
+        self.assertFalse(crossed[100])
+        for row in range(0, 100, 2):
+            swapped = population[row] != original[row]
+            self.assertTrue((population[row][swapped] == original[row + 1][swapped]).all())
+            self.assertTrue((population[row + 1][swapped] == original[row][swapped]).all())
+            # The swapped genes form one segment between distinct cut points, which
+            # never includes the final gene
+            positions = np.flatnonzero(swapped)
+            self.assertGreater(len(positions), 0)
+            self.assertEqual(positions[-1] - positions[0] + 1, len(positions))
+            self.assertLess(positions[-1], 7)
+
+    def test_batch_crossover_valid2(self):
+        """Tests that pairs are crossed over with the given probability"""
+        rng = np.random.default_rng(1)
+        population = np.zeros((20000, 4), dtype=np.int16)
+        crossed = batch_crossover(population, 0.7, rng)
+        self.assertTrue((crossed[0::2] == crossed[1::2]).all())
+        self.assertAlmostEqual(crossed.mean(), 0.7, delta=0.02)
+        self.assertFalse(batch_crossover(population, 0.0, rng).any())
+
+    def test_batch_mutate_valid1(self):
+        """Tests that each mutated row has at most one changed gene"""
+        rng = np.random.default_rng(2)
+        population = np.full((20000, 6), 5, dtype=np.int16)
+        mutated = batch_mutate(population, 5, 0.4, rng)
+        changes = (population != 5).sum(axis=1)
+        # Every replacement gene differs from the original here, as index 5 isn't drawn
+        self.assertTrue((changes[mutated] == 1).all())
+        self.assertTrue((changes[~mutated] == 0).all())
+        self.assertTrue((population < 6).all())
+        self.assertAlmostEqual(mutated.mean(), 0.4, delta=0.02)
+
+    def test_vary_population_valid1(self):
+        """Tests that every altered row is marked as needing evaluation"""
+        rng = np.random.default_rng(3)
+        population = np.arange(300 * 10).reshape(300, 10) % 7
+        original = population.copy()
+        needs_evaluation = vary_population(population, 7, 0.4, 0.7, rng)
+        altered = (population != original).any(axis=1)
+        self.assertTrue(needs_evaluation[altered].all())
+
+    def test_vary_population_valid2(self):
+        """Tests that seeding NumPy's global random state makes the variation repeatable"""
+        results = []
+        for _ in range(2):
+            np.random.seed(4)
+            population = np.zeros((10, 5), dtype=np.int16)
+            vary_population(population, 3, 0.5, 0.5)
+            results.append(population)
+        self.assertTrue((results[0] == results[1]).all())
+
+    # Erroneous tests - circuits too short to cross over
+    def test_batch_crossover_erroneous1(self):
+        """Tests that crossing over single gene circuits raises a ValueError"""
+        with self.assertRaises(ValueError):
+            batch_crossover(np.zeros((4, 1), dtype=np.int16), 0.5)
+
+
+def main_batch_operators():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_batch_operators()
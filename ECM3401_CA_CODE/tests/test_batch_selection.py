@@ -0,0 +1,80 @@
+"""A unit test module to validate the batch selection functions"""
+import unittest
+import numpy as np
+from batch_selection import tournament_select, select_elites, refill, batch_generation_step
+
+def count_evaluate(population: np.ndarray) -> np.ndarray:
+    """A fitness function which is minimised by circuits made of gene 0"""
+    return np.count_nonzero(population, axis=1).astype(float)
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the batch selection functions
+
+    # Valid tests - checking selection against the population's fitness values
+    def test_tournament_select_valid1(self):
+        """Tests that each winner is at least as fit as a random circuit"""
+        rng = np.random.default_rng(0)
+        fitnesses = rng.random(1000)
+        winners = tournament_select(fitnesses, 5000, 3, rng)
+        self.assertEqual(winners.shape, (5000,))
+        # The expected fitness of the best of three uniform values is 1/4
+        self.assertAlmostEqual(fitnesses[winners].mean(), 0.25, delta=0.02)
+        # A tournament of one is a uniform random choice
+        self.assertAlmostEqual(fitnesses[tournament_select(fitnesses, 5000, 1, rng)].mean(), 0.5, delta=0.02)
+
+    def test_select_elites_valid1(self):
+        """Tests that the elites are the fittest circuits, fittest first"""
+        fitnesses = np.array([5.0, 1.0, 4.0, 0.5, 3.0, 1.0])
+        self.assertEqual(select_elites(fitnesses, 3).tolist(), [3, 1, 5])
+        self.assertEqual(len(select_elites(fitnesses, 0)), 0)
+        self.assertEqual(len(select_elites(fitnesses, 10)), 6)
+
+    def test_refill_valid1(self):
+        """Tests that refilling picks different offspring"""
+        chosen = refill(100, 95, np.random.default_rng(1))
+        self.assertEqual(len(chosen), 95)
+        self.assertEqual(len(set(chosen.tolist())), 95)
+
+    def test_batch_generation_step_valid1(self):
+        """Tests that the elites are kept and every stored fitness stays correct"""
+        rng = np.random.default_rng(2)
+        population = rng.integers(0, 6, size=(200, 10)).astype(np.int16)
+        fitnesses = count_evaluate(population)
+        best_fitness = fitnesses.min()
+
+        for _ in range(20):
+            population, fitnesses, best_index, evaluations = batch_generation_step(
+                population, fitnesses, count_evaluate, 6, 0.4, 0.7, 5, 3, rng)
+            self.assertEqual(population.shape, (200, 10))
+            self.assertTrue((fitnesses == count_evaluate(population)).all())
+            self.assertLessEqual(fitnesses.min(), best_fitness)
+            self.assertLessEqual(evaluations, 200)
+            best_fitness = fitnesses.min()
+
+        self.assertLess(best_fitness, 2)
+
+    # Erroneous tests - invalid tournament sizes and elite counts
+    def test_tournament_select_erroneous1(self):
+        """Tests that a tournament without contestants raises a ValueError"""
+        with self.assertRaises(ValueError):
+            tournament_select(np.ones(10), 5, 0)
+
+    def test_batch_generation_step_erroneous1(self):
+        """Tests that an elite count outside of the population raises a ValueError"""
+        population = np.zeros((10, 4), dtype=np.int16)
+        fitnesses = count_evaluate(population)
+        for elite_count in [-1, 11]:
+            with self.assertRaises(ValueError):
+                batch_generation_step(population, fitnesses, count_evaluate, 6, 0.4, 0.7, elite_count, 3)
+        with self.assertRaises(ValueError):
+            refill(10, -1)
+        with self.assertRaises(ValueError):
+            refill(10, 11)
+
+
+def main_batch_selection():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_batch_selection()
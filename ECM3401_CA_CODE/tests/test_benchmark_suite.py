@@ -0,0 +1,88 @@
+"""A unit test module to validate the benchmark suite's timing and comparisons"""
+import unittest
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from benchmark_suite import main, time_call, import_time, clone_memory, compare_results, format_comparisons, run_benchmarks
+from benchmark_suite import BENCHMARK_VERSION, MODULE_DIRECTORIES
+
+def results(timings: dict) -> dict:
+    """Creates the results of a benchmark run with the given timings"""
+    return {"version": BENCHMARK_VERSION, "machine": {}, "timings": timings}
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the benchmark suite
+
+    # Valid tests - checking timings and comparisons
+    def test_time_call_valid1(self):
+        """Tests that a function is called enough times to be timed"""
+        calls = []
+        seconds = time_call(lambda: calls.append(1), repeats=3, minimum_time=0.001)
+        self.assertGreater(seconds, 0)
+        self.assertGreater(len(calls), 3)
+
+    def test_compare_results_valid1(self):
+        """Tests that only slowdowns beyond the threshold are regressions"""
+        baseline = results({"a/mutate": 1.0, "a/crossover": 1.0, "a/removed": 1.0})
+        current = results({"a/mutate": 1.1, "a/crossover": 1.5, "a/added": 1.0})
+        comparisons = compare_results(baseline, current, threshold=0.2)
+
+        # Benchmarks missing from either run aren't compared
+        self.assertEqual([comparison["name"] for comparison in comparisons], ["a/mutate", "a/crossover"])
+        self.assertEqual([comparison["regression"] for comparison in comparisons], [False, True])
+        self.assertIn("SLOWER", format_comparisons(comparisons).splitlines()[2])
+
+    def test_run_benchmarks_valid1(self):
+        """Tests that every step is timed for a target"""
+        timings = run_benchmarks(["qft_matrix1"], population_sizes=[10], repeats=1, import_modules=[])["timings"]
+        self.assertEqual(sorted(timings), ["qft_matrix1/circuit_fitness", "qft_matrix1/circuit_size",
+                                           "qft_matrix1/convert_circuit", "qft_matrix1/crossover",
+                                           "qft_matrix1/generation/10", "qft_matrix1/mutate"])
+
+    def test_import_time_valid1(self):
+        """Tests that importing the evaluation core doesn't import Qiskit, Matplotlib or DEAP"""
+        self.assertGreater(import_time("functions", repeats=1), 0)
+        code = "import sys, functions, qft_circuits, grover_circuits; print(sorted(name for name in " \
+               "('qiskit', 'matplotlib', 'deap') if name in sys.modules))"
+        imported = subprocess.run([sys.executable, "-c", code], cwd=MODULE_DIRECTORIES[1],
+                                  env={"PYTHONPATH": os.pathsep.join(MODULE_DIRECTORIES)},
+                                  capture_output=True, text=True, check=True)
+        self.assertEqual(imported.stdout.strip(), "[]")
+
+    def test_clone_memory_valid1(self):
+        """Tests that light clones hold less memory than deep copies"""
+        deep_copies = clone_memory("qft_matrix2", 50, shared_genes=False)
+        light_clones = clone_memory("qft_matrix2", 50, shared_genes=True)
+        self.assertLess(light_clones["clone_bytes"], deep_copies["clone_bytes"])
+        self.assertLess(light_clones["clone_blocks"], deep_copies["clone_blocks"])
+
+    def test_main_valid1(self):
+        """Tests that comparing with the baseline as the output compares against the old baseline"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            # A baseline far faster than any real run, so every benchmark is a regression
+            timings = run_benchmarks(["qft_matrix1"], population_sizes=[10], repeats=1, import_modules=[])["timings"]
+            with open(path, "w") as file:
+                json.dump(results({name: 1e-12 for name in timings}), file)
+
+            arguments = ["compare", path, "--output", path, "--targets", "qft_matrix1",
+                         "--population-sizes", "10", "--imports", "--repeats", "1"]
+            self.assertEqual(main(arguments), 1)
+            with open(path) as file:
+                self.assertGreater(min(json.load(file)["timings"].values()), 1e-12)
+
+    # Erroneous tests - incompatible baselines
+    def test_compare_results_erroneous1(self):
+        """Tests that a baseline from another version raises a ValueError"""
+        with self.assertRaises(ValueError):
+            compare_results(dict(results({}), version=BENCHMARK_VERSION - 1), results({}))
+
+
+def main_benchmark_suite():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_benchmark_suite()
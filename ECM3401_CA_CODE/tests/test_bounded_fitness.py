@@ -0,0 +1,151 @@
+"""A unit test module to validate the bounded (early terminating) fitness"""
+import unittest
+import math
+import random
+import numpy as np
+from deap import base, creator, tools
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from unitary_engine import circuit_unitary, compile_gate_set
+from fitness_metrics import circuit_distance
+from evolution import generation_step, select_elites
+from bounded_fitness import bounded_circuit_fitness, BoundedEvaluator, exact_fitness
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 4: CPhaseGate(math.pi/4), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [1, [2]], [2, [0, 2]], [3, [0, 1]], [3, [1, 2]], [4, [0, 2]], [10, [0]]]
+GOAL_MATRIX = circuit_unitary([[1, [2]], [3, [1, 2]], [4, [0, 2]], [1, [1]], [3, [0, 1]], [1, [0]], [2, [0, 2]]],
+                              GATE_SET, 3)
+
+class Circuit(list):
+    # A list which accepts attributes, like a creator.Individual
+    pass
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the bounded fitness
+
+    # Valid tests - comparing bounded fitness values against the full fitness
+    def test_bounded_fitness_valid1(self):
+        """Tests that without a cutoff the exact fitness is calculated"""
+        random.seed(0)
+        for block_rows in [1, 3, 8]:
+            test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(12)]
+            unitary = circuit_unitary(test_circuit, GATE_SET, 3)
+            for metric in ["l1", "frobenius"]:
+                fitness, exact = bounded_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 3,
+                                                         block_rows=block_rows, metric=metric)
+                self.assertTrue(exact)
+                self.assertAlmostEqual(fitness[0], circuit_distance(unitary, GOAL_MATRIX, metric))
+
+    def test_bounded_fitness_valid2(self):
+        """Tests that stopping early gives a lower bound above the cutoff"""
+        random.seed(1)
+        for _ in range(20):
+            test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(12)]
+            full_fitness = circuit_distance(circuit_unitary(test_circuit, GATE_SET, 3), GOAL_MATRIX)
+            fitness, exact = bounded_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 3,
+                                                     cutoff=2.0, block_rows=2)
+            if exact:
+                self.assertAlmostEqual(fitness[0], full_fitness)
+            else:
+                self.assertGreater(fitness[0], 2.0)
+                self.assertLessEqual(fitness[0], full_fitness + 1e-9)
+
+    def test_bounded_fitness_valid3(self):
+        """Tests that the adjoint gate set applies the inverse of a circuit"""
+        random.seed(2)
+        test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(9)]
+        compiled = compile_gate_set(GATE_SET, 3)
+        inverse = compiled.adjoint().unitary(list(reversed(test_circuit)))
+        self.assertTrue(np.allclose(inverse @ compiled.unitary(test_circuit), np.eye(8)))
+        self.assertIs(compiled.adjoint().adjoint(), compiled)
+
+    def test_bounded_evaluator_valid1(self):
+        """Tests that the evaluator flags lower bounds and keeps elites exact"""
+        random.seed(3)
+        evaluator = BoundedEvaluator(GATE_SET, GOAL_MATRIX, 3, block_rows=1)
+        evaluator.cutoff = 0.5
+        test_circuit = Circuit(random.choice(POSSIBLE_GATES) for _ in range(10))
+        fitness = evaluator.evaluate(test_circuit)
+        self.assertTrue(test_circuit.lower_bound)
+        self.assertEqual(evaluator.early_stops, 1)
+        self.assertGreater(fitness[0], 0.5)
+
+        goal_circuit = Circuit([[1, [2]], [3, [1, 2]], [4, [0, 2]], [1, [1]], [3, [0, 1]], [1, [0]], [2, [0, 2]]])
+        self.assertAlmostEqual(evaluator.evaluate(goal_circuit)[0], 0.0)
+        self.assertFalse(goal_circuit.lower_bound)
+
+    def test_bounded_evaluator_valid2(self):
+        """Tests that selection ranks every lower bound equally and below every exact fitness"""
+        evaluator = BoundedEvaluator(GATE_SET, GOAL_MATRIX, 3)
+        toolbox = base.Toolbox()
+        evaluator.register(toolbox)
+        population = []
+        for fitness, lower_bound in [(5.0, False), (1.5, True), (9.0, True)]:
+            circuit = creator.Individual([[1, [0]]])
+            circuit.fitness.values = (fitness,)
+            circuit.lower_bound = lower_bound
+            population.append(circuit)
+
+        random.seed(4)
+        # An exact fitness always beats a lower bound, even a smaller one (large
+        # tournaments make it near certain every tournament has both circuits)
+        self.assertTrue(all(circuit is population[0] for circuit in toolbox.select(population[:2], 50, 20)))
+        self.assertEqual(evaluator.selection_key(population[1]), evaluator.selection_key(population[2]))
+        self.assertGreater(evaluator.selection_key(population[0]), evaluator.selection_key(population[1]))
+
+        # Between two lower bounds, the winner is whichever was drawn first
+        winners = toolbox.select(population[1:], 200, 2)
+        self.assertGreater(sum(circuit is population[2] for circuit in winners), 50)
+        self.assertGreater(sum(circuit is population[1] for circuit in winners), 50)
+
+    def test_bounded_evaluator_valid3(self):
+        """Tests that over a run the cutoff follows the elites, which always have their exact fitness"""
+        random.seed(5)
+        evaluator = BoundedEvaluator(GATE_SET, GOAL_MATRIX, 3, block_rows=2)
+        toolbox = base.Toolbox()
+        toolbox.register("individual", tools.initRepeat, creator.Individual,
+                         lambda: random.choice(POSSIBLE_GATES), n=8)
+        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+        toolbox.register("mate", tools.cxTwoPoint)
+        toolbox.register("mutate", tools.mutShuffleIndexes, indpb=0.2)
+        evaluator.register(toolbox)
+
+        def exact(circuit):
+            return circuit_distance(circuit_unitary(circuit, GATE_SET, 3), GOAL_MATRIX)
+
+        population = toolbox.population(n=40)
+        for _ in range(15):
+            population, best_circuit, evaluations = generation_step(population, toolbox, 0.8, 0.6, 4, 3)
+            self.assertFalse(best_circuit.lower_bound)
+            self.assertAlmostEqual(best_circuit.fitness.values[0], exact(best_circuit))
+            for elite in select_elites(population, 4):
+                self.assertFalse(elite.lower_bound)
+                self.assertAlmostEqual(elite.fitness.values[0], exact(elite))
+            # The cutoff came from the previous generation's elites, which the new elites can only improve on
+            self.assertGreaterEqual(evaluator.cutoff, select_elites(population, 4)[-1].fitness.values[0])
+
+        # The bound was used, and the lower bounds are left out of the fitness statistics
+        self.assertGreater(evaluator.early_stops, 0)
+        bounded = [circuit for circuit in population if circuit.lower_bound]
+        self.assertTrue(bounded)
+        self.assertTrue(math.isnan(exact_fitness(bounded[0])))
+        self.assertEqual(exact_fitness(best_circuit), best_circuit.fitness.values[0])
+
+    # Erroneous tests - metrics which can't be bounded
+    def test_bounded_fitness_erroneous1(self):
+        """Tests that bounding the fidelity raises a ValueError"""
+        with self.assertRaises(ValueError):
+            bounded_circuit_fitness([[1, [0]]], GATE_SET, GOAL_MATRIX, 3, cutoff=1.0, metric="fidelity")
+
+
+def main_bounded_fitness():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_bounded_fitness()
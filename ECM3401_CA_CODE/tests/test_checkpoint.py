@@ -0,0 +1,120 @@
+"""A unit test module to validate checkpointing and resuming EA runs"""
+import unittest
+import os
+import zlib
+import pickle
+import random
+import tempfile
+import numpy as np
+from deap import base, creator, tools
+from checkpoint import (Checkpointer, pack_population, unpack_population,
+                        load_checkpoint, evolve, resume)
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+
+def noisy_evaluate(circuit):
+    """A stand-in evaluation function which uses NumPy's random state"""
+    return (float(sum(gene[0] for gene in circuit)) + np.random.random(),)
+
+def mutate(circuit):
+    """Replaces a random gene in the circuit"""
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(POSSIBLE_GATES)
+    del circuit.fitness.values
+    return circuit
+
+def create_toolbox():
+    """Registers the functions used by generation_step with a DEAP toolbox"""
+    toolbox = base.Toolbox()
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(POSSIBLE_GATES), n=8)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", mutate)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", noisy_evaluate)
+    return toolbox
+
+def start_run(seed: int) -> (base.Toolbox, list):
+    """Seeds both random number generators and creates the initial population"""
+    random.seed(seed)
+    np.random.seed(seed)
+    toolbox = create_toolbox()
+    return (toolbox, toolbox.population(n=30))
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for checkpointing and resuming EA runs
+
+    # Valid tests - comparing resumed runs against uninterrupted runs
+    def test_checkpoint_valid1(self):
+        """Tests that a population is stored and rebuilt with its fitness values"""
+        random.seed(0)
+        population = create_toolbox().population(n=5)
+        population[1].append([2, [0, 1]])
+        population[0].fitness.values = (3.5,)
+        rebuilt = unpack_population(pack_population(population), creator.Individual)
+        self.assertEqual(rebuilt, population)
+        self.assertEqual(rebuilt[0].fitness.values, (3.5,))
+        self.assertFalse(rebuilt[1].fitness.valid)
+
+    def test_checkpoint_valid2(self):
+        """Tests that a resumed run finishes exactly like an uninterrupted run"""
+        with tempfile.TemporaryDirectory() as directory:
+            toolbox, population = start_run(1)
+            population, logbook, best_circuit = evolve(toolbox, population, 12, 0.5, 0.7, 2, 3)
+
+            path = os.path.join(directory, "run.checkpoint")
+            toolbox, interrupted = start_run(1)
+            checkpointer = Checkpointer(path, every_generations=5)
+            # The run stops after 5 generations, when its checkpoint is written
+            evolve(toolbox, interrupted, 5, 0.5, 0.7, 2, 3, checkpointer)
+            self.assertEqual(checkpointer.saves, 1)
+            self.assertEqual(load_checkpoint(path, creator.Individual)["generation"], 5)
+
+            # Reseeding shows the random number generator states come from the checkpoint
+            random.seed(99)
+            np.random.seed(99)
+            resumed, resumed_logbook, resumed_best = resume(path, create_toolbox(), creator.Individual,
+                                                            12, 0.5, 0.7, 2, 3)
+
+        self.assertEqual(resumed, population)
+        self.assertEqual([circuit.fitness.values for circuit in resumed],
+                         [circuit.fitness.values for circuit in population])
+        self.assertEqual(resumed_logbook.select("evaluations"), logbook.select("evaluations"))
+        self.assertEqual(resumed_best.fitness.values, best_circuit.fitness.values)
+
+    def test_checkpoint_valid3(self):
+        """Tests that checkpoints are due after the given number of generations or seconds"""
+        checkpointer = Checkpointer("unused", every_generations=3)
+        self.assertFalse(checkpointer.due(2))
+        self.assertTrue(checkpointer.due(3))
+        self.assertTrue(Checkpointer("unused", every_seconds=0).due(1))
+        self.assertFalse(Checkpointer("unused", every_seconds=3600).due(1))
+
+    # Erroneous tests - invalid intervals and incompatible files
+    def test_checkpoint_erroneous1(self):
+        """Tests that a checkpointer without an interval raises a ValueError"""
+        with self.assertRaises(ValueError):
+            Checkpointer("unused")
+
+    def test_checkpoint_erroneous2(self):
+        """Tests that a checkpoint from another version raises a ValueError"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "old.checkpoint")
+            with open(path, "wb") as file:
+                file.write(zlib.compress(pickle.dumps({"version": 0})))
+            with self.assertRaises(ValueError):
+                load_checkpoint(path, creator.Individual)
+
+
+def main_checkpoint():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_checkpoint()
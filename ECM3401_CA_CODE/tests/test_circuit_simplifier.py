@@ -0,0 +1,82 @@
+"""A unit test module to validate the CircuitSimplifier class"""
+import unittest
+import math
+import random
+import numpy as np
+from qiskit.circuit.library import HGate, XGate, SwapGate, CPhaseGate, CXGate, MCXGate, U3Gate
+from unitary_engine import circuit_unitary
+from fitness_cache import FitnessCache
+from circuit_simplifier import CircuitSimplifier, simplifier_for
+
+GATE_SET = {1: HGate(), 2: XGate(), 3: SwapGate(), 4: CPhaseGate(math.pi/2), 5: CXGate(),
+            6: MCXGate(2), 7: U3Gate(math.pi/2, 0, math.pi), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [2]], [3, [0, 2]], [3, [2, 0]], [4, [0, 1]], [4, [1, 0]],
+                  [5, [0, 1]], [5, [1, 0]], [6, [0, 1, 2]], [6, [1, 0, 2]], [7, [0]], [10, [0]], [10, [1]]]
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the CircuitSimplifier class
+
+    # Valid tests - comparing simplified circuits against the original unitary matrices
+    def test_circuit_simplifier_valid1(self):
+        """Tests that wires and cancelling pairs are removed"""
+        simplifier = CircuitSimplifier(GATE_SET, 3)
+        test_circuit = [[1, [0]], [10, [1]], [2, [2]], [2, [2]], [1, [0]], [3, [0, 2]], [3, [2, 0]]]
+        self.assertEqual(simplifier.simplify(test_circuit), [])
+        # Cancellations cascade, and only skip gates on other qubits
+        self.assertEqual(simplifier.simplify([[1, [0]], [2, [2]], [5, [0, 1]], [5, [0, 1]], [1, [0]]]), [[2, [2]]])
+        self.assertEqual(simplifier.size([[1, [0]], [5, [0, 1]], [1, [0]]]), 3)
+
+    def test_circuit_simplifier_valid2(self):
+        """Tests that the gate metadata is found from the gate matrices"""
+        simplifier = CircuitSimplifier(GATE_SET, 3)
+        # U3(pi/2, 0, pi) has the same matrix as H
+        self.assertEqual(simplifier.equivalent_ids[7], 1)
+        self.assertIn((1, 1), simplifier.inverse_pairs)
+        self.assertNotIn((4, 4), simplifier.inverse_pairs)
+        self.assertEqual(simplifier.canonical_gene([3, [2, 0]]), (3, (0, 2)))
+        self.assertEqual(simplifier.canonical_gene([5, [1, 0]]), (5, (1, 0)))
+        # Only the controls of a multi-controlled X can be reordered
+        self.assertEqual(simplifier.canonical_gene([6, [1, 0, 2]]), (6, (0, 1, 2)))
+        self.assertEqual(simplifier.canonical_gene([6, [2, 1, 0]]), (6, (1, 2, 0)))
+
+    def test_circuit_simplifier_valid3(self):
+        """Tests that simplified circuits have the same unitary matrix"""
+        random.seed(0)
+        simplifier = simplifier_for(GATE_SET, 3)
+        for _ in range(200):
+            test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(random.randint(0, 15))]
+            simplified = simplifier.simplify(test_circuit)
+            self.assertLessEqual(len(simplified), len(test_circuit))
+            self.assertTrue(np.allclose(circuit_unitary(simplified, GATE_SET, 3),
+                                        circuit_unitary(test_circuit, GATE_SET, 3)))
+
+    def test_circuit_simplifier_valid4(self):
+        """Tests that reordering gates on disjoint qubits gives the same key"""
+        simplifier = simplifier_for(GATE_SET, 3)
+        first = [[1, [0]], [2, [2]], [4, [0, 1]], [1, [1]], [10, [1]]]
+        second = [[2, [2]], [7, [0]], [4, [1, 0]], [1, [1]]]
+        self.assertEqual(simplifier.canonical_key(first), simplifier.canonical_key(second))
+        self.assertNotEqual(simplifier.canonical_key(first), simplifier.canonical_key(first[::-1]))
+
+    def test_circuit_simplifier_valid5(self):
+        """Tests that a fitness cache keyed by the simplifier shares evaluations"""
+        simplifier = simplifier_for(GATE_SET, 3)
+        cache = FitnessCache(key=simplifier.canonical_key)
+        evaluate = cache.wrap(simplifier.wrap(lambda circuit: (len(circuit),)))
+        self.assertEqual(evaluate([[1, [0]], [2, [2]], [2, [2]]]), (1,))
+        self.assertEqual(evaluate([[10, [1]], [7, [0]]]), (1,))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    # Erroneous tests - genes outside the gate set
+    def test_circuit_simplifier_erroneous1(self):
+        """Tests that a gene with an unknown gate id raises a KeyError"""
+        with self.assertRaises(KeyError):
+            CircuitSimplifier(GATE_SET, 3).simplify([[8, [0]]])
+
+
+def main_circuit_simplifier():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_circuit_simplifier()
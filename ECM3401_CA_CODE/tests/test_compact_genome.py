@@ -0,0 +1,101 @@
+"""A unit test module to validate the CompactGenome and CompactFitness classes"""
+import unittest
+import copy
+import math
+import random
+import numpy as np
+from deap import tools
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from gate_generator import GateTable
+from compact_genome import (CompactGenome, CompactFitness, random_genome,
+                            stack_population, genomes_from_array)
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+TABLE = GateTable(GATE_SET, POSSIBLE_GATES)
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the compact genome representation
+
+    # Valid tests - comparing compact genomes against the list based representation
+    def test_compact_genome_valid1(self):
+        """Tests that a compact genome gives back the circuit it was created from"""
+        test_circuit = [[1, [0]], [10, [1]], [3, [0, 1]], [2, [0, 1]]]
+        genome = CompactGenome.from_circuit(TABLE, test_circuit)
+        self.assertEqual(genome.indices.dtype, np.int16)
+        self.assertEqual(list(genome), test_circuit)
+        self.assertEqual(genome[2], [3, [0, 1]])
+        self.assertEqual(genome[1:3], test_circuit[1:3])
+        self.assertEqual(genome.size(), 3)
+
+    def test_compact_genome_valid2(self):
+        """Tests that assigning genes and slices updates the stored indices"""
+        genome = CompactGenome.from_circuit(TABLE, [[1, [0]], [1, [0]], [1, [0]]])
+        genome[0] = [2, [0, 1]]
+        genome[1:3] = [[10, [1]], [1, [1]]]
+        self.assertEqual(genome.to_circuit(), [[2, [0, 1]], [10, [1]], [1, [1]]])
+        self.assertEqual(genome.indices.tolist(), [2, 5, 1])
+
+    def test_compact_genome_valid3(self):
+        """Tests that clones share the table but not the indices or fitness"""
+        genome = CompactGenome.from_circuit(TABLE, [[1, [0]], [2, [0, 1]]])
+        genome.fitness.values = (2.5,)
+        clone = copy.deepcopy(genome)
+        self.assertIs(clone.table, TABLE)
+        self.assertEqual(clone, genome)
+        clone[0] = [3, [0, 1]]
+        del clone.fitness.values
+        self.assertEqual(genome[0], [1, [0]])
+        self.assertEqual(genome.fitness.values, (2.5,))
+        self.assertFalse(clone.fitness.valid)
+
+    def test_compact_genome_valid4(self):
+        """Tests that tournament selection picks the same circuits as with DEAP's fitness"""
+        random.seed(3)
+        population = [random_genome(TABLE, 6) for _ in range(20)]
+        for genome in population:
+            genome.fitness.values = (random.random(),)
+        fittest = tools.selBest(population, 1)[0]
+        self.assertEqual(fittest.fitness.values[0], min(genome.fitness.values[0] for genome in population))
+        self.assertEqual(len(tools.selTournament(population, 10, 3)), 10)
+
+    def test_compact_genome_valid5(self):
+        """Tests that a population can be stored as a single 2D array"""
+        random.seed(4)
+        population = [random_genome(TABLE, 5) for _ in range(4)]
+        array = stack_population(population)
+        self.assertEqual(array.shape, (4, 5))
+        genomes = genomes_from_array(TABLE, array)
+        self.assertEqual([genome.to_circuit() for genome in genomes],
+                         [genome.to_circuit() for genome in population])
+        # The genomes are views of the array's rows
+        genomes[0][0] = [2, [0, 1]]
+        self.assertEqual(array[0, 0], 2)
+
+    def test_compact_fitness_valid1(self):
+        """Tests that fitness values are weighted and compared like DEAP's"""
+        class FitnessMulti(CompactFitness):
+            __slots__ = ()
+            weights = (-1.0, 1.0)
+        fitness = FitnessMulti((2.0, 3.0))
+        self.assertEqual(fitness.wvalues, (-2.0, 3.0))
+        self.assertEqual(fitness.values, (2.0, 3.0))
+        self.assertTrue(CompactFitness((1.0,)) > CompactFitness((2.0,)))
+        self.assertFalse(hasattr(fitness, "__dict__"))
+
+    # Erroneous tests - genes that aren't in the table
+    def test_compact_genome_erroneous1(self):
+        """Tests that assigning a gene missing from the table raises a KeyError"""
+        genome = CompactGenome.from_circuit(TABLE, [[1, [0]]])
+        with self.assertRaises(KeyError):
+            genome[0] = [3, [1, 0]]
+        with self.assertRaises(KeyError):
+            CompactGenome.from_circuit(TABLE, [[4, [0, 1]]])
+
+
+def main_compact_genome():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_compact_genome()
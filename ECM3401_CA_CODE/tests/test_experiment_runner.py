@@ -0,0 +1,115 @@
+"""A unit test module to validate the experiment runner"""
+import os
+import json
+import unittest
+import random
+import tempfile
+import numpy as np
+from run_ea import sweep_run
+from experiment_runner import run_sweep, sweep_jobs, summarise, write_atomically
+
+def fake_run(population_size, num_generations):
+    """A stand-in for the EA which returns a fitness and size based on its arguments"""
+    return (population_size / num_generations, population_size // 10)
+
+def create_spec(directory):
+    """Creates a sweep specification which stores its results in the given directory"""
+    return {"run": "test_experiment_runner:fake_run",
+            "parameter": "population_size",
+            "values": [100, 200],
+            "repeats": 3,
+            "seed": 5,
+            "fixed": {"num_generations": 10},
+            "output": os.path.join(directory, "runs"),
+            "summary": os.path.join(directory, "population_size_results.txt")}
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the experiment runner
+
+    # Valid tests - testing the jobs, results and restarting a sweep
+    def test_experiment_runner_valid1(self):
+        """Tests that every (value, repeat) pair is a job with its own seed"""
+        jobs = sweep_jobs(create_spec("results"))
+
+        self.assertEqual(len(jobs), 6)
+        self.assertEqual([job["seed"] for job in jobs[:3]], [5, 6, 7])
+        self.assertEqual(len(set(job["path"] for job in jobs)), 6)
+
+    def test_experiment_runner_valid2(self):
+        """Tests that a restarted sweep only runs the unfinished jobs"""
+        with tempfile.TemporaryDirectory() as directory:
+            spec = create_spec(directory)
+            self.assertEqual(len(run_sweep(spec, processes=2)), 6)
+
+            # Removes one result, as if the sweep had crashed during that job
+            os.remove(sweep_jobs(spec)[4]["path"])
+            results = run_sweep(spec, processes=2)
+            self.assertEqual([(result["value"], result["repeat"]) for result in results], [(200, 1)])
+
+            with open(spec["summary"]) as file:
+                lines = file.read().splitlines()
+            self.assertEqual([line.split(",")[:2] for line in lines], [["10.0", "10.0"], ["20.0", "20.0"]])
+            self.assertEqual([line.split(",")[3] for line in lines], ["100", "200"])
+
+    def test_experiment_runner_valid3(self):
+        """Tests that unfinished parameter values are left out of the summary"""
+        with tempfile.TemporaryDirectory() as directory:
+            spec = create_spec(directory)
+            job = sweep_jobs(spec)[0]
+            write_atomically(job["path"], json.dumps(dict(job, run=spec["run"], fixed=spec["fixed"],
+                                                          fitness=1.0, size=2, time=3.0)))
+
+            self.assertEqual(summarise(spec), "")
+
+    def test_experiment_runner_valid4(self):
+        """Tests that jobs whose stored results came from other fixed options or seeds are run again"""
+        with tempfile.TemporaryDirectory() as directory:
+            spec = create_spec(directory)
+            run_sweep(spec, processes=2)
+
+            spec["fixed"] = {"num_generations": 20}
+            self.assertEqual(len(run_sweep(spec, processes=2)), 6)
+            self.assertEqual([line.split(",")[0] for line in summarise(spec).splitlines()], ["5.0", "10.0"])
+
+            # Every repeat's seed changes, so every job is run again, but only once
+            spec["seed"] = 6
+            self.assertEqual(len(run_sweep(spec, processes=2)), 6)
+            self.assertEqual(run_sweep(spec, processes=2), [])
+
+    def test_experiment_runner_valid5(self):
+        """Tests that run_ea.sweep_run can be run by a sweep"""
+        with tempfile.TemporaryDirectory() as directory:
+            spec = {"run": "run_ea:sweep_run",
+                    "parameter": "population_size",
+                    "values": [10, 20],
+                    "repeats": 2,
+                    "fixed": {"family": "qft", "num_qubits": 2, "num_generations": 2},
+                    "output": directory}
+            results = run_sweep(spec, processes=2)
+            summary = summarise(spec)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(len(summary.splitlines()), 2)
+        # The runner's seed makes each run repeatable
+        for result in results:
+            random.seed(result["seed"])
+            np.random.seed(result["seed"])
+            self.assertEqual(sweep_run(population_size=result["value"], **spec["fixed"]),
+                             (result["fitness"], result["size"]))
+
+    # Erroneous tests - testing the runner with an invalid specification
+    def test_experiment_runner_erroneous1(self):
+        """Tests sweep_jobs when the number of seeds doesn't match the repeats"""
+        spec = create_spec("results")
+        spec["seeds"] = [1, 2]
+
+        with self.assertRaises(ValueError):
+            sweep_jobs(spec)
+
+
+def main_experiment_runner():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_experiment_runner()
@@ -0,0 +1,61 @@
+"""A unit test module to validate the FitnessCache class"""
+import unittest
+from fitness_cache import FitnessCache, canonical_key
+
+def count_gates(circuit):
+    """A stand-in evaluation function which returns the number of genes"""
+    return (float(len(circuit)),)
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the FitnessCache class
+
+    # Valid tests - testing the cache's keys, counters and eviction
+    def test_fitness_cache_valid1(self):
+        """Tests that circuits only differing by their wires share a key"""
+        circuit1 = [[1, [0]], [10, [1]], [3, [0, 1]]]
+        circuit2 = [[10, [0]], [1, [0]], [3, [0, 1]], [10, [0]]]
+
+        self.assertEqual(canonical_key(circuit1), canonical_key(circuit2))
+        self.assertNotEqual(canonical_key(circuit1), canonical_key([[3, [0, 1]], [1, [0]]]))
+
+    def test_fitness_cache_valid2(self):
+        """Tests that the wrapped function is only called on a cache miss"""
+        cache = FitnessCache()
+        cached_evaluate = cache.wrap(count_gates)
+
+        # The second circuit is equivalent to the first, so returns the first's fitness
+        self.assertEqual(cached_evaluate([[1, [0]]]), (1.0,))
+        self.assertEqual(cached_evaluate([[1, [0]], [10, [1]]]), (1.0,))
+        self.assertEqual(cache.statistics()["hits"], 1)
+        self.assertEqual(cache.statistics()["misses"], 1)
+
+    def test_fitness_cache_valid3(self):
+        """Tests that the least recently used fitness is evicted"""
+        cache = FitnessCache(max_size=2)
+        cached_evaluate = cache.wrap(count_gates)
+        cached_evaluate([[1, [0]]])
+        cached_evaluate([[2, [0]]])
+        # Uses the first circuit again, so the second is the least recently used
+        cached_evaluate([[1, [0]]])
+        cached_evaluate([[3, [0]]])
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        cached_evaluate([[1, [0]]])
+        self.assertEqual(cache.hits, 2)
+        cached_evaluate([[2, [0]]])
+        self.assertEqual(cache.misses, 4)
+
+    # Erroneous tests - testing the cache with invalid sizes
+    def test_fitness_cache_erroneous1(self):
+        """Tests FitnessCache with a maximum size of 0"""
+        with self.assertRaises(ValueError):
+            FitnessCache(max_size=0)
+
+
+def main_fitness_cache():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_fitness_cache()
@@ -0,0 +1,75 @@
+"""A unit test module to validate the fitness metrics"""
+import unittest
+import math
+import random
+import numpy as np
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from unitary_engine import circuit_unitary, batch_circuit_unitaries
+from incremental_evaluation import incremental_circuit_fitness
+from fitness_metrics import (l1_distance, frobenius_distance, process_infidelity,
+                             circuit_distance, batch_distances, get_metric)
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+GOAL_MATRIX = circuit_unitary([[1, [1]], [3, [0, 1]], [1, [0]], [2, [0, 1]]], GATE_SET, 2)
+
+class Circuit(list):
+    # A list which accepts attributes, like a creator.Individual
+    pass
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the fitness metrics
+
+    # Valid tests - comparing each metric against its definition
+    def test_fitness_metrics_valid1(self):
+        """Tests the metrics against element by element calculations"""
+        random.seed(0)
+        unitary = circuit_unitary([random.choice(POSSIBLE_GATES) for _ in range(6)], GATE_SET, 2)
+        l1 = sum(abs(unitary[i][j] - GOAL_MATRIX[i][j]) for i in range(4) for j in range(4))
+        frobenius = math.sqrt(sum(abs(unitary[i][j] - GOAL_MATRIX[i][j])**2 for i in range(4) for j in range(4)))
+        trace = sum(np.conj(GOAL_MATRIX[i][j]) * unitary[i][j] for i in range(4) for j in range(4))
+
+        self.assertAlmostEqual(circuit_distance(unitary, GOAL_MATRIX, "l1"), l1)
+        self.assertAlmostEqual(circuit_distance(unitary, GOAL_MATRIX, "frobenius"), frobenius)
+        self.assertAlmostEqual(circuit_distance(unitary, GOAL_MATRIX, "fidelity"), 1 - abs(trace) / 4)
+
+    def test_fitness_metrics_valid2(self):
+        """Tests that only the fidelity ignores a global phase"""
+        shifted = np.exp(1j * 0.7) * GOAL_MATRIX
+        self.assertAlmostEqual(process_infidelity(shifted, GOAL_MATRIX), 0.0)
+        self.assertGreater(l1_distance(shifted, GOAL_MATRIX), 1)
+        self.assertGreater(frobenius_distance(shifted, GOAL_MATRIX), 1)
+
+    def test_fitness_metrics_valid3(self):
+        """Tests that the batched metrics match each circuit's own value"""
+        random.seed(1)
+        test_circuits = [[random.choice(POSSIBLE_GATES) for _ in range(7)] for _ in range(12)]
+        unitaries = batch_circuit_unitaries(test_circuits, GATE_SET, 2)
+        for metric in ["l1", "frobenius", "fidelity"]:
+            fitnesses = batch_distances(unitaries, GOAL_MATRIX, metric)
+            self.assertEqual(fitnesses.shape, (12,))
+            for unitary, fitness in zip(unitaries, fitnesses):
+                self.assertAlmostEqual(circuit_distance(unitary, GOAL_MATRIX, metric), fitness)
+
+    def test_fitness_metrics_valid4(self):
+        """Tests that the incremental evaluation uses the chosen metric"""
+        random.seed(2)
+        test_circuit = Circuit(random.choice(POSSIBLE_GATES) for _ in range(8))
+        unitary = circuit_unitary(test_circuit, GATE_SET, 2)
+        fitness = incremental_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 2, metric="fidelity")
+        self.assertAlmostEqual(fitness[0], float(process_infidelity(unitary, GOAL_MATRIX)))
+        self.assertIs(get_metric(l1_distance), l1_distance)
+
+    # Erroneous tests - unknown metrics
+    def test_fitness_metrics_erroneous1(self):
+        """Tests that an unknown metric name raises a ValueError"""
+        with self.assertRaises(ValueError):
+            circuit_distance(GOAL_MATRIX, GOAL_MATRIX, "hamming")
+
+
+def main_fitness_metrics():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_fitness_metrics()
@@ -0,0 +1,78 @@
+"""A unit test module to validate the generate_gate_table function"""
+import unittest
+import numpy as np
+import qiskit.quantum_info as qi
+from qft_circuits import qgate_set3, qpossible_gates_1, qpossible_gates_2, qpossible_gates_3
+from gate_generator import generate_gate_table, qubit_placements, WIRE_ID
+
+def gene_set(possible_gates: list) -> set:
+    """Returns the possible gates as a set, ignoring their order"""
+    return {(gene[0], tuple(gene[1])) for gene in possible_gates}
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the generate_gate_table function
+
+    # Valid tests - comparing generated tables against the hand-written QFT tables
+    def test_gate_generator_valid1(self):
+        """Tests that the structured QFT tables match qpossible_gates_1 to 3"""
+        for num_qubits, possible_gates in [(2, qpossible_gates_1), (3, qpossible_gates_2), (4, qpossible_gates_3)]:
+            table = generate_gate_table(num_qubits, "qft", structured=True)
+            self.assertEqual(gene_set(table.possible_gates), gene_set(possible_gates))
+
+    def test_gate_generator_valid2(self):
+        """Tests that the generated QFT gates have the same ids and matrices as qgate_set3"""
+        table = generate_gate_table(4, "qft")
+        self.assertEqual(set(table.gate_set), set(qgate_set3))
+        for gate_id, gate in table.gate_set.items():
+            if gate == "WIRE":
+                self.assertEqual(qgate_set3[gate_id], "WIRE")
+            else:
+                self.assertTrue(np.allclose(qi.Operator(gate).data, qi.Operator(qgate_set3[gate_id]).data))
+
+    def test_gate_generator_valid3(self):
+        """Tests that symmetric gates are only placed once per set of qubits when pruned"""
+        self.assertEqual(len(qubit_placements(4, 2, "all", True)), 6)
+        self.assertEqual(len(qubit_placements(4, 2, "all", False)), 12)
+        self.assertEqual(len(qubit_placements(4, 2, "none", True)), 12)
+        # Only the target of a multi-controlled gate is distinguished
+        self.assertEqual(qubit_placements(3, 3, "controls", True), [[0, 1, 2], [0, 2, 1], [1, 2, 0]])
+
+    def test_gate_generator_valid4(self):
+        """Tests the Grover family's gate ids and the indexed form of its possible gates"""
+        table = generate_gate_table(3, "grover")
+        self.assertEqual(sorted(table.gate_set), [1, 2, 3, 4, 5, WIRE_ID])
+        # 3 H, 3 X, 1 MCZ, 3 MCX, 3 U3 and 3 wires
+        self.assertEqual(len(table), 16)
+        self.assertEqual(table.qubits.shape, (16, 3))
+        for index, gene in enumerate(table.possible_gates):
+            self.assertEqual(table.index(gene), index)
+            self.assertEqual(table.gate_ids[index], gene[0])
+            self.assertEqual([qubit for qubit in table.qubits[index] if qubit >= 0], gene[1])
+
+    def test_gate_generator_valid5(self):
+        """Tests that gate ids skip the wire's id when a family has many gates"""
+        table = generate_gate_table(12, "qft")
+        self.assertEqual(table.gate_set[WIRE_ID], "WIRE")
+        self.assertEqual(len(table.gate_set), 14)
+        self.assertEqual(max(table.gate_set), 14)
+
+    # Erroneous tests - invalid families and qubit counts
+    def test_gate_generator_erroneous1(self):
+        """Tests that a multi-qubit gate can't be used with a single qubit"""
+        with self.assertRaises(ValueError):
+            generate_gate_table(1, ("h", "swap"))
+
+    def test_gate_generator_erroneous2(self):
+        """Tests that an unknown family or kind of gate raises a KeyError"""
+        with self.assertRaises(KeyError):
+            generate_gate_table(2, "shor")
+        with self.assertRaises(KeyError):
+            generate_gate_table(2, ("h", "toffoli"))
+
+
+def main_gate_generator():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_gate_generator()
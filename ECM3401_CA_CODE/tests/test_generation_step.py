@@ -0,0 +1,86 @@
+"""A unit test module to validate the generation_step function"""
+import unittest
+import random
+from deap import base, creator, tools
+from evolution import generation_step, select_elites
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+
+def gate_id_sum(circuit):
+    """A stand-in evaluation function which records how many times it is called"""
+    gate_id_sum.calls += 1
+    return (float(sum(gene[0] for gene in circuit)),)
+
+def mutate(circuit):
+    """Replaces a random gene in the circuit"""
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(POSSIBLE_GATES)
+    del circuit.fitness.values
+    return circuit
+
+def create_toolbox():
+    """Registers the functions used by generation_step with a DEAP toolbox"""
+    toolbox = base.Toolbox()
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(POSSIBLE_GATES), n=6)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", mutate)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", gate_id_sum)
+    return toolbox
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the generation_step function
+
+    # Valid tests - testing the size of the next generation and the evaluation count
+    def test_generation_step_valid1(self):
+        """Tests that only unevaluated circuits are evaluated"""
+        random.seed(0)
+        toolbox = create_toolbox()
+        population = toolbox.population(n=40)
+        gate_id_sum.calls = 0
+
+        population[:], best_circuit, evaluations = generation_step(population, toolbox, 0.5, 0.5, 2, 3)
+        # The whole initial population and the altered offspring are evaluated once
+        self.assertEqual(evaluations, gate_id_sum.calls)
+        self.assertEqual(len(population), 40)
+
+        gate_id_sum.calls = 0
+        population[:], best_circuit, evaluations = generation_step(population, toolbox, 0.0, 0.0, 2, 3)
+        # Without crossover or mutation every circuit already has a fitness value
+        self.assertEqual(evaluations, 0)
+        self.assertEqual(gate_id_sum.calls, 0)
+
+    def test_generation_step_valid2(self):
+        """Tests that the fittest circuits are carried over by elitism"""
+        random.seed(1)
+        toolbox = create_toolbox()
+        population = toolbox.population(n=30)
+        for circuit in population:
+            circuit.fitness.values = toolbox.evaluate(circuit)
+        fittest = sorted(circuit.fitness.values[0] for circuit in population)
+
+        next_gen_population, best_circuit, evaluations = generation_step(population, toolbox, 1.0, 1.0, 3, 3)
+        self.assertEqual(best_circuit.fitness.values[0], fittest[0])
+        self.assertEqual([circuit.fitness.values[0] for circuit in next_gen_population[:3]], fittest[:3])
+
+    def test_select_elites_valid1(self):
+        """Tests select_elites with fewer circuits than requested"""
+        circuit = creator.Individual([[1, [0]]])
+        circuit.fitness.values = (1.0,)
+
+        self.assertEqual(select_elites([circuit], 5), [circuit])
+
+
+def main_generation_step():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_generation_step()
@@ -0,0 +1,77 @@
+"""A unit test module to validate the incremental_circuit_fitness function"""
+import unittest
+import math
+import copy
+import random
+import numpy as np
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from unitary_engine import circuit_unitary
+from incremental_evaluation import incremental_circuit_fitness, UnitaryCache
+
+class Individual(list):
+    """A list which accepts attributes, akin to a creator.Individual"""
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 4: CPhaseGate(math.pi/4), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [1, [2]], [2, [0, 2]], [3, [0, 1]],
+                  [3, [1, 2]], [4, [0, 2]], [10, [0]], [10, [1]], [10, [2]]]
+GOAL_MATRIX = np.eye(8)
+
+def full_fitness(circuit):
+    """Calculates the fitness of a circuit without using a cache"""
+    return np.abs(circuit_unitary(circuit, GATE_SET, 3) - GOAL_MATRIX).sum()
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the incremental_circuit_fitness function
+
+    # Valid tests - comparing incremental re-evaluation against full evaluation
+    def test_incremental_fitness_valid1(self):
+        """Tests incremental_circuit_fitness after repeated point mutations"""
+        random.seed(0)
+        for interval in (1, 3, 8):
+            test_circuit = Individual(random.choice(POSSIBLE_GATES) for _ in range(20))
+            incremental_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 3, interval)
+            for _ in range(30):
+                test_circuit = copy.deepcopy(test_circuit)
+                test_circuit[random.randint(0, 19)] = random.choice(POSSIBLE_GATES)
+                fitness, = incremental_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 3, interval)
+                self.assertAlmostEqual(fitness, full_fitness(test_circuit))
+
+    def test_incremental_fitness_valid2(self):
+        """Tests incremental_circuit_fitness on the children of a two point crossover"""
+        random.seed(1)
+        circuit1 = Individual(random.choice(POSSIBLE_GATES) for _ in range(20))
+        circuit2 = Individual(random.choice(POSSIBLE_GATES) for _ in range(20))
+        incremental_circuit_fitness(circuit1, GATE_SET, GOAL_MATRIX, 3)
+        incremental_circuit_fitness(circuit2, GATE_SET, GOAL_MATRIX, 3)
+
+        child1, child2 = copy.deepcopy(circuit1), copy.deepcopy(circuit2)
+        child1[5:12], child2[5:12] = child2[5:12], child1[5:12]
+        for child in (child1, child2):
+            fitness, = incremental_circuit_fitness(child, GATE_SET, GOAL_MATRIX, 3)
+            self.assertAlmostEqual(fitness, full_fitness(child))
+
+    def test_incremental_fitness_valid3(self):
+        """Tests that clones share the cache and only the changed segment is re-applied"""
+        test_circuit = Individual([[1, [0]], [3, [0, 1]], [1, [1]], [2, [0, 2]], [10, [0]]] * 4)
+        incremental_circuit_fitness(test_circuit, GATE_SET, GOAL_MATRIX, 3, interval=1)
+        clone = copy.deepcopy(test_circuit)
+        self.assertIs(clone.unitary_cache, test_circuit.unitary_cache)
+
+        clone[7] = [1, [2]]
+        unitary, reapplied = clone.unitary_cache.unitary_for(clone)
+        self.assertEqual(reapplied, 1)
+        self.assertTrue(np.allclose(unitary, circuit_unitary(clone, GATE_SET, 3)))
+
+    # Erroneous tests - testing the cache against invalid arguments
+    def test_incremental_fitness_erroneous1(self):
+        """Tests UnitaryCache with an invalid interval"""
+        with self.assertRaises(ValueError):
+            UnitaryCache([[1, [0]]], None, interval=0)
+
+
+def main_incremental_evaluation():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_incremental_evaluation()
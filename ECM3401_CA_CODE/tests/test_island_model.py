@@ -0,0 +1,132 @@
+"""A unit test module to validate the island model"""
+import unittest
+import random
+from deap import base, creator, tools
+from island_model import run_islands, migrate, ring_topology, fully_connected_topology
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+
+def gate_id_sum(circuit):
+    """A stand-in evaluation function which is minimised by circuits of wires and HGates"""
+    return (float(sum(gene[0] for gene in circuit)),)
+
+def mutate(circuit):
+    """Replaces a random gene in the circuit"""
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(POSSIBLE_GATES)
+    del circuit.fitness.values
+    return circuit
+
+def create_toolbox():
+    """Creates the toolbox used by each island (and the creator classes if needed)"""
+    if not hasattr(creator, "FitnessMin"):
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+
+    toolbox = base.Toolbox()
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(POSSIBLE_GATES), n=6)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", mutate)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", gate_id_sum)
+    return toolbox
+
+def create_maximising_toolbox():
+    """Creates a toolbox whose circuits maximise their fitness (and the creator classes if needed)"""
+    if not hasattr(creator, "FitnessMax"):
+        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    if not hasattr(creator, "IndividualMax"):
+        creator.create("IndividualMax", list, fitness=creator.FitnessMax)
+
+    toolbox = create_toolbox()
+    toolbox.register("individual", tools.initRepeat, creator.IndividualMax,
+                     lambda: random.choice(POSSIBLE_GATES), n=6)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    return toolbox
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the island model
+
+    # Valid tests - testing the topologies, migration and the merged logbook
+    def test_island_model_valid1(self):
+        """Tests the neighbours of each island in both topologies"""
+        self.assertEqual(ring_topology(3), {0: [1], 1: [2], 2: [0]})
+        self.assertEqual(fully_connected_topology(3), {0: [1, 2], 1: [0, 2], 2: [0, 1]})
+
+    def test_island_model_valid2(self):
+        """Tests that migration replaces the least fit circuits with copies of the fittest"""
+        toolbox = create_toolbox()
+        populations = []
+        for fitnesses in ([1.0, 2.0, 3.0], [10.0, 20.0, 30.0]):
+            population = []
+            for fitness in fitnesses:
+                circuit = creator.Individual([[1, [0]]])
+                circuit.fitness.values = (fitness,)
+                population.append(circuit)
+            populations.append(population)
+
+        migrate(populations, ring_topology(2), 1, toolbox)
+        self.assertEqual(sorted(c.fitness.values[0] for c in populations[1]), [1.0, 10.0, 20.0])
+        self.assertEqual(sorted(c.fitness.values[0] for c in populations[0]), [1.0, 2.0, 10.0])
+
+    def test_island_model_valid3(self):
+        """Tests that the logbook has one record per generation for every island"""
+        populations, logbook, best_circuit = run_islands(
+            create_toolbox, num_islands=3, island_size=20, num_generations=7,
+            mutation_rate=0.5, crossover_rate=0.5, elite_count=2, tournament_size=3,
+            migration_interval=3, migration_size=2, processes=2, seed=0)
+
+        self.assertEqual(len(populations), 3)
+        self.assertEqual(logbook.select("gen"), list(range(1, 8)))
+        self.assertEqual(len(logbook[0]["islands"]), 3)
+        # Elitism means the best fitness across the islands never gets worse
+        best = logbook.select("best")
+        self.assertTrue(all(later <= earlier for earlier, later in zip(best, best[1:])))
+        self.assertLessEqual(best_circuit.fitness.values[0], best[-1])
+
+    def test_island_model_valid4(self):
+        """Tests that two runs with the same seed find the same circuit and logbook"""
+        runs = []
+        for _ in range(2):
+            # Other uses of the global generator shouldn't affect a seeded run
+            random.seed()
+            runs.append(run_islands(
+                create_toolbox, num_islands=2, island_size=10, num_generations=4,
+                mutation_rate=0.5, crossover_rate=0.5, elite_count=1, tournament_size=3,
+                migration_interval=2, migration_size=1, processes=2, seed=5))
+
+        (populations1, logbook1, best_circuit1), (populations2, logbook2, best_circuit2) = runs
+        self.assertEqual(list(best_circuit1), list(best_circuit2))
+        self.assertEqual(best_circuit1.fitness.values, best_circuit2.fitness.values)
+        self.assertEqual(list(logbook1), list(logbook2))
+        self.assertEqual([[list(c) for c in p] for p in populations1],
+                         [[list(c) for c in p] for p in populations2])
+
+    def test_island_model_valid5(self):
+        """Tests that the logbook's best fitness is the fittest island's when fitness is maximised"""
+        populations, logbook, best_circuit = run_islands(
+            create_maximising_toolbox, num_islands=3, island_size=10, num_generations=4,
+            mutation_rate=0.5, crossover_rate=0.5, elite_count=1, tournament_size=3,
+            migration_interval=2, migration_size=1, processes=2, seed=1)
+
+        for record in logbook:
+            self.assertEqual(record["best"], max(record["islands"]))
+        best = logbook.select("best")
+        self.assertEqual(best, sorted(best))
+        self.assertGreaterEqual(best_circuit.fitness.values[0], best[-1])
+
+    # Erroneous tests - testing the island model with an invalid topology
+    def test_island_model_erroneous1(self):
+        """Tests run_islands with an unknown topology"""
+        with self.assertRaises(ValueError):
+            run_islands(create_toolbox, 2, 10, 1, 0.5, 0.5, 1, 3, topology="star")
+
+
+def main_island_model():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_island_model()
@@ -0,0 +1,133 @@
+"""A unit test module to validate the MetricsWriter and PopulationStatistics classes"""
+import unittest
+import os
+import copy
+import random
+import tempfile
+from deap import base, creator
+from fitness_cache import FitnessCache
+from metrics_stream import MetricsWriter, PopulationStatistics, read_metrics
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+
+def gate_count(circuit):
+    """Counts the genes that aren't wires, like circuit_size"""
+    return sum(1 for gene in circuit if gene[0] != 10)
+
+def create_population(size: int) -> list:
+    """Creates evaluated random circuits"""
+    population = []
+    for _ in range(size):
+        circuit = creator.Individual(random.choice(POSSIBLE_GATES) for _ in range(6))
+        circuit.fitness.values = (random.random(),)
+        population.append(circuit)
+    return population
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the streaming metrics writer
+
+    # Valid tests - comparing the streamed statistics against direct calculations
+    def test_population_statistics_valid1(self):
+        """Tests that sizes are only recalculated for altered circuits"""
+        random.seed(0)
+        statistics = PopulationStatistics(gate_count)
+        population = create_population(20)
+        record = statistics.compile(population)
+        self.assertEqual(statistics.size_calls, 20)
+        self.assertEqual(record["size"]["maximum"], max(gate_count(circuit) for circuit in population))
+        self.assertEqual(record["fitness"]["minimum"], min(c.fitness.values[0] for c in population))
+
+        # Clones keep their cached size, while an altered circuit is measured again
+        population = [copy.deepcopy(circuit) for circuit in population]
+        population[3][0] = [10, [0]]
+        del population[3].fitness.values
+        population[3].fitness.values = (0.5,)
+        record = statistics.compile(population)
+        self.assertEqual(statistics.size_calls, 21)
+        self.assertAlmostEqual(record["size"]["average"],
+                               sum(gate_count(circuit) for circuit in population) / 20)
+
+        # Lower bounds on the fitness are counted rather than averaged in
+        population[0].lower_bound = True
+        population[0].fitness.values = (100.0,)
+        record = statistics.compile(population)
+        self.assertEqual(record["fitness"]["lower_bounds"], 1)
+        self.assertLess(record["fitness"]["maximum"], 100.0)
+        self.assertAlmostEqual(record["fitness"]["average"],
+                               sum(c.fitness.values[0] for c in population[1:]) / 19)
+
+    def test_metrics_writer_valid1(self):
+        """Tests that JSONL records are written and can be read back"""
+        random.seed(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.jsonl")
+            cache = FitnessCache()
+            with MetricsWriter(path, gate_count, flush_every=2) as writer:
+                for gen in range(3):
+                    writer.record(gen, create_population(10), evaluations=7, cache=cache,
+                                  phases={"select": 0.25})
+                    if gen == 1:
+                        # The first two records have been flushed while the file is open
+                        self.assertEqual(len(read_metrics(path)), 2)
+            records = read_metrics(path)
+
+        self.assertEqual([record["gen"] for record in records], [0, 1, 2])
+        self.assertEqual(records[0]["evaluations"], 7)
+        self.assertEqual(records[0]["phase_select"], 0.25)
+        self.assertEqual(records[0]["cache_hits"], 0)
+        self.assertIn("fitness_average", records[0])
+
+    def test_metrics_writer_valid2(self):
+        """Tests that CSV records share one header, even when the file is appended to"""
+        random.seed(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.csv")
+            for _ in range(2):
+                with MetricsWriter(path, gate_count, file_format="csv") as writer:
+                    writer.record(0, create_population(5), evaluations=5)
+            records = read_metrics(path)
+            with open(path) as file:
+                lines = file.read().splitlines()
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(records[1]["evaluations"], 5.0)
+
+    # Erroneous tests - unsupported formats and CSV records that don't match the columns
+    def test_metrics_writer_erroneous1(self):
+        """Tests that an unknown format raises a ValueError"""
+        with self.assertRaises(ValueError):
+            MetricsWriter("unused.xml", gate_count, file_format="xml")
+
+    def test_metrics_writer_erroneous2(self):
+        """Tests that a CSV record with fields the columns don't have raises a ValueError"""
+        random.seed(3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.csv")
+            with MetricsWriter(path, gate_count, file_format="csv") as writer:
+                writer.record(0, create_population(5), evaluations=5)
+                with self.assertRaises(ValueError):
+                    writer.record(1, create_population(5), evaluations=5, phases={"select": 0.1})
+
+            # Appending checks the records against the file's existing columns
+            with MetricsWriter(path, gate_count, file_format="csv") as writer:
+                with self.assertRaises(ValueError):
+                    writer.record(2, create_population(5))
+                writer.record(2, create_population(5), evaluations=3)
+            records = read_metrics(path)
+
+        self.assertEqual([record["gen"] for record in records], [0.0, 2.0])
+
+
+def main_metrics_stream():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_metrics_stream()
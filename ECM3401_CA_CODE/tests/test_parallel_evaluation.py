@@ -0,0 +1,53 @@
+"""A unit test module to validate the ProcessPoolEvaluator class"""
+import unittest
+import math
+import random
+import numpy as np
+from deap import base
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from unitary_engine import circuit_unitary
+from parallel_evaluation import ProcessPoolEvaluator, compact_circuit
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+GOAL_MATRIX = np.full((4, 4), 0.5)
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the ProcessPoolEvaluator class
+
+    # Valid tests - comparing the pool's fitness values against the unitary engine
+    def test_parallel_evaluation_valid1(self):
+        """Tests that every circuit's fitness matches a single process evaluation"""
+        random.seed(0)
+        test_circuits = [[random.choice(POSSIBLE_GATES) for _ in range(8)] for _ in range(37)]
+        expected = [np.abs(circuit_unitary(circuit, GATE_SET, 2) - GOAL_MATRIX).sum()
+                    for circuit in test_circuits]
+
+        with ProcessPoolEvaluator(GATE_SET, GOAL_MATRIX, 2, processes=2, chunk_size=5) as evaluator:
+            fitnesses = evaluator.evaluate_population(test_circuits)
+            self.assertEqual(len(fitnesses), 37)
+            for fitness, expected_fitness in zip(fitnesses, expected):
+                self.assertAlmostEqual(fitness[0], expected_fitness)
+
+            self.assertAlmostEqual(evaluator.evaluate(test_circuits[0])[0], expected[0])
+            self.assertEqual(evaluator.evaluate_population([]), [])
+
+    def test_parallel_evaluation_valid2(self):
+        """Tests that the evaluator registers its functions with the toolbox"""
+        toolbox = base.Toolbox()
+        with ProcessPoolEvaluator(GATE_SET, GOAL_MATRIX, 2, processes=1) as evaluator:
+            evaluator.register(toolbox)
+            self.assertEqual(toolbox.evaluate_population([[[1, [0]]]]),
+                             evaluator.evaluate_population([[[1, [0]]]]))
+
+    def test_compact_circuit_valid1(self):
+        """Tests that compact circuits only contain tuples of integers"""
+        self.assertEqual(compact_circuit([[1, [0]], [2, [0, 1]]]), ((1, (0,)), (2, (0, 1))))
+
+
+def main_parallel_evaluation():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_parallel_evaluation()
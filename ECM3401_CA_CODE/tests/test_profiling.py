@@ -0,0 +1,99 @@
+"""A unit test module to validate the profiling helpers"""
+import unittest
+import tracemalloc
+import time
+from deap import base
+from profiling import PhaseTimer, ProfileWindow, instrument_toolbox, breakdown_table, NULL_TIMER
+
+def busy(seconds: float) -> float:
+    """Waits for the given number of seconds and returns it"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return seconds
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the profiling helpers
+
+    # Valid tests - checking the recorded phases
+    def test_phase_timer_valid1(self):
+        """Tests that phases record their calls and time"""
+        timer = PhaseTimer()
+        with timer.phase("select"):
+            busy(0.01)
+        timed_busy = timer.wrap("mutate", busy)
+        self.assertEqual(timed_busy(0.002), 0.002)
+        timed_busy(0.002)
+
+        self.assertEqual(timer.calls, {"select": 1, "mutate": 2})
+        self.assertGreaterEqual(timer.totals["select"], 0.01)
+        self.assertGreaterEqual(timer.snapshot()["mutate"], 0.004)
+        timer.reset()
+        self.assertEqual(timer.totals, {})
+        with NULL_TIMER.phase("unused"):
+            pass
+
+    def test_phase_timer_valid2(self):
+        """Tests that instrumented toolbox functions keep their registered arguments"""
+        timer = PhaseTimer()
+        toolbox = base.Toolbox()
+        toolbox.register("evaluate", lambda circuit, offset: (len(circuit) + offset,), offset=2)
+        instrument_toolbox(toolbox, timer)
+        self.assertEqual(toolbox.evaluate([1, 2, 3]), (5,))
+        self.assertEqual(timer.calls, {"evaluate": 1})
+        # The toolbox's default clone is also timed
+        toolbox.clone([1])
+        self.assertEqual(timer.calls["clone"], 1)
+
+    def test_breakdown_table_valid1(self):
+        """Tests that the table lists the slowest phase first with its share"""
+        timer = PhaseTimer()
+        timer.add("evaluate", 3.0, 30)
+        timer.add("select", 1.0, 10)
+        lines = breakdown_table(timer).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("evaluate"))
+        self.assertIn("75.0%", lines[1])
+        self.assertIn("100.0000", lines[2])
+
+    def test_profile_window_valid1(self):
+        """Tests that only the generations in the window are profiled"""
+        for mode in ["cprofile", "tracemalloc"]:
+            window = ProfileWindow(range(2, 4), mode)
+            for gen in range(6):
+                with window.generation(gen):
+                    data = [list(range(100)) for _ in range(50)]
+                    busy(0.001)
+                if gen < 3:
+                    self.assertIsNone(window.report)
+            self.assertTrue(window.report)
+            self.assertGreater(len(data), 0)
+
+    def test_profile_window_valid2(self):
+        """Tests that closing a window the run didn't reach the end of stops its profiler"""
+        for mode in ["cprofile", "tracemalloc"]:
+            window = ProfileWindow(range(1, 10), mode)
+            for gen in range(3):
+                with window.generation(gen):
+                    busy(0.001)
+            self.assertIsNone(window.report)
+            window.close()
+            self.assertTrue(window.report)
+            self.assertFalse(tracemalloc.is_tracing())
+            # Closing again, or closing a window that never started, does nothing
+            window.close()
+            ProfileWindow(range(5, 6), mode).close()
+
+    # Erroneous tests - unknown profiling modes
+    def test_profile_window_erroneous1(self):
+        """Tests that an unknown mode raises a ValueError"""
+        with self.assertRaises(ValueError):
+            ProfileWindow(range(1), "perf")
+
+
+def main_profiling():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_profiling()
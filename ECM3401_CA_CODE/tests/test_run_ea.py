@@ -0,0 +1,155 @@
+"""A unit test module to validate the command line entry point of the EA"""
+import os
+import sys
+import json
+import unittest
+import tempfile
+import subprocess
+import tracemalloc
+from run_ea import load_config, target_parameters, run, main, DEFAULT_CONFIG
+from deap import creator
+from checkpoint import load_checkpoint
+
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the command line entry point
+
+    # Valid tests - running small configurations
+    def test_load_config_valid1(self):
+        """Tests that the file and command line options replace the defaults"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as file:
+                json.dump({"family": "grover", "num_qubits": 3, "seed": 1}, file)
+            config = load_config(path, seed=5, output=None)
+
+        self.assertEqual(config["family"], "grover")
+        self.assertEqual(config["seed"], 5)
+        self.assertEqual(config["output"], DEFAULT_CONFIG["output"])
+        self.assertEqual(target_parameters(config), {"marked_states": ["011", "100"]})
+        self.assertEqual(target_parameters(load_config(num_qubits=4)), {"num_qubits": 4})
+
+    def test_run_valid1(self):
+        """Tests that a run writes its configuration, statistics and result"""
+        with tempfile.TemporaryDirectory() as directory:
+            config = load_config(family="qft", num_qubits=3, population_size=20, num_generations=4,
+                                 seed=0, output=directory)
+            result = run(config)
+            with open(os.path.join(directory, "metrics.jsonl")) as file:
+                records = [json.loads(line) for line in file]
+            with open(os.path.join(directory, "result.json")) as file:
+                stored_result = json.load(file)
+
+        self.assertEqual([record["gen"] for record in records], [1, 2, 3, 4])
+        self.assertLessEqual(result["fitness"], min(record["fitness_minimum"] for record in records))
+        self.assertEqual(stored_result["circuit"], result["circuit"])
+
+        # The same seed gives the same run
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as file:
+                json.dump({"family": "grover", "num_qubits": 2, "population_size": 20, "num_generations": 3}, file)
+            repeated = main([path, "--seed", "0", "--output", os.path.join(directory, "first")])
+            self.assertEqual(main([path, "--seed", "0", "--output", os.path.join(directory, "second")])["circuit"],
+                             repeated["circuit"])
+
+    def test_run_valid2(self):
+        """Tests that importing the entry point doesn't import matplotlib"""
+        imported = subprocess.run([sys.executable, "-c", "import sys, run_ea; print('matplotlib' in sys.modules)"],
+                                  cwd=SRC_DIRECTORY, capture_output=True, text=True, check=True)
+        self.assertEqual(imported.stdout.strip(), "False")
+
+    def test_run_valid3(self):
+        """Tests that running again into the same directory replaces the earlier run's statistics"""
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in (0, 1):
+                config = load_config(family="qft", num_qubits=2, population_size=10, num_generations=3,
+                                     seed=seed, output=directory)
+                result = run(config)
+            with open(os.path.join(directory, "metrics.jsonl")) as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual([record["gen"] for record in records], [1, 2, 3])
+        self.assertLessEqual(result["fitness"], min(record["fitness_minimum"] for record in records))
+
+    def test_run_valid4(self):
+        """Tests that a resumed run finishes in the same way as an uninterrupted run"""
+        with tempfile.TemporaryDirectory() as directory:
+            options = {"family": "qft", "num_qubits": 2, "population_size": 10, "seed": 3, "checkpoint_every": 2}
+            uninterrupted = run(load_config(num_generations=6, output=os.path.join(directory, "first"), **options))
+
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as file:
+                json.dump(dict(options, num_generations=6), file)
+            output = os.path.join(directory, "second")
+            run(load_config(path, num_generations=4, output=output))
+            resumed = main([path, "--output", output, "--resume"])
+
+            with open(os.path.join(output, "metrics.jsonl")) as file:
+                records = [json.loads(line) for line in file]
+            logbook = load_checkpoint(os.path.join(output, "checkpoint.pkl"), creator.Individual)["logbook"]
+
+        self.assertEqual(resumed["circuit"], uninterrupted["circuit"])
+        self.assertEqual(resumed["fitness"], uninterrupted["fitness"])
+        self.assertEqual([record["gen"] for record in records], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(logbook.select("gen"), [1, 2, 3, 4, 5, 6])
+
+    def test_run_valid5(self):
+        """Tests that a profiled run records each generation's phases and saves a breakdown"""
+        with tempfile.TemporaryDirectory() as directory:
+            # The window ends after the run does, so it has to be closed by the run
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as file:
+                json.dump({"family": "qft", "num_qubits": 2, "population_size": 10, "num_generations": 3,
+                           "profile_window": [2, 10], "profile_mode": "tracemalloc"}, file)
+            output = os.path.join(directory, "profiled")
+            main_result = main([path, "--output", output, "--seed", "0", "--profile"])
+            with open(os.path.join(output, "metrics.jsonl")) as file:
+                records = [json.loads(line) for line in file]
+            with open(os.path.join(output, "profile.txt")) as file:
+                breakdown = file.read()
+            with open(os.path.join(output, "profile_window.txt")) as file:
+                window_report = file.read()
+
+        self.assertTrue(main_result["circuit"])
+        self.assertFalse(tracemalloc.is_tracing())
+        for record in records:
+            self.assertGreater(record["phase_evaluate"], 0)
+            self.assertIn("phase_select", record)
+        self.assertEqual(breakdown.splitlines()[0].split()[0], "phase")
+        self.assertIn("mutate", breakdown)
+        self.assertTrue(window_report)
+
+    # Erroneous tests - invalid configurations
+    def test_load_config_erroneous1(self):
+        """Tests that an unknown option raises a ValueError"""
+        with self.assertRaises(ValueError):
+            load_config(pop_size=100)
+
+    def test_run_erroneous1(self):
+        """Tests that resuming without a checkpoint, or with different options, raises an error"""
+        with tempfile.TemporaryDirectory() as directory:
+            config = load_config(family="qft", num_qubits=2, population_size=10, num_generations=2,
+                                 checkpoint_every=1, output=directory)
+            with self.assertRaises(FileNotFoundError):
+                run(config, resume=True)
+
+            run(config)
+            with self.assertRaises(ValueError):
+                run(dict(config, mutation_rate=0.1), resume=True)
+
+    def test_target_parameters_erroneous1(self):
+        """Tests that a Grover's Search target without marked states raises a ValueError"""
+        with self.assertRaises(ValueError):
+            target_parameters(load_config(family="grover", num_qubits=5))
+        with self.assertRaises(ValueError):
+            target_parameters(load_config(family="grover", num_qubits=2, marked_states=["101"]))
+
+
+def main_run_ea():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_run_ea()
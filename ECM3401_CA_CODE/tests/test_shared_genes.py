@@ -0,0 +1,93 @@
+"""A unit test module to validate the shared genes and light_clone"""
+import copy
+import random
+import unittest
+from deap import base, creator, tools
+from evolution import generation_step
+from shared_genes import intern_gene, interned_gates, intern_circuit, light_clone, register
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+
+def mutate(circuit, possible_gates):
+    """Replaces a random gene in the circuit"""
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(possible_gates)
+    del circuit.fitness.values
+    return circuit
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the shared genes
+
+    # Valid tests - comparing light clones against deep copies
+    def test_intern_gene_valid1(self):
+        """Tests that equal genes are interned as the same tuple"""
+        self.assertIs(intern_gene([2, [0, 1]]), intern_gene((2, (0, 1))))
+        self.assertEqual(intern_gene([2, [0, 1]]), (2, (0, 1)))
+        gates = interned_gates(POSSIBLE_GATES)
+        self.assertIs(gates[2], intern_gene(POSSIBLE_GATES[2]))
+
+        circuit = creator.Individual(POSSIBLE_GATES[:3])
+        circuit.fitness.values = (1.0,)
+        self.assertIs(intern_circuit(circuit)[1], gates[1])
+        self.assertEqual(circuit.fitness.values, (1.0,))
+
+    def test_light_clone_valid1(self):
+        """Tests that a light clone is equal to a deep copy but shares its genes"""
+        circuit = intern_circuit(creator.Individual(POSSIBLE_GATES))
+        circuit.fitness.values = (3.0,)
+        circuit.unitary_cache = object()
+        clone = light_clone(circuit)
+
+        self.assertEqual(clone, copy.deepcopy(circuit))
+        self.assertIsInstance(clone, creator.Individual)
+        self.assertIs(clone[0], circuit[0])
+        self.assertIs(clone.unitary_cache, circuit.unitary_cache)
+        self.assertEqual(clone.fitness.values, (3.0,))
+
+        # Altering the clone leaves the original unchanged
+        mutate(clone, interned_gates(POSSIBLE_GATES))
+        clone[0] = intern_gene([3, [0, 1]])
+        self.assertFalse(clone.fitness.valid)
+        self.assertEqual(circuit.fitness.values, (3.0,))
+        self.assertEqual(circuit[0], (1, (0,)))
+
+    def test_light_clone_valid2(self):
+        """Tests that a generation with light clones matches one with deep copies"""
+        populations = []
+        for shared in (False, True):
+            random.seed(2)
+            toolbox = base.Toolbox()
+            possible_gates = register(toolbox, POSSIBLE_GATES) if shared else POSSIBLE_GATES
+            toolbox.register("individual", tools.initRepeat, creator.Individual,
+                             lambda: random.choice(possible_gates), n=6)
+            toolbox.register("mate", tools.cxTwoPoint)
+            toolbox.register("mutate", mutate, possible_gates=possible_gates)
+            toolbox.register("select", tools.selTournament)
+            toolbox.register("evaluate", lambda circuit: (float(sum(gene[0] for gene in circuit)),))
+
+            population = [toolbox.individual() for _ in range(30)]
+            for _ in range(5):
+                population[:], best_circuit, evaluations = generation_step(population, toolbox, 0.5, 0.5, 2, 3)
+            populations.append([([(gene[0], tuple(gene[1])) for gene in circuit], circuit.fitness.values)
+                                for circuit in population])
+
+        self.assertEqual(populations[0], populations[1])
+
+    # Erroneous tests - altering a shared gene
+    def test_intern_gene_erroneous1(self):
+        """Tests that altering an interned gene in place raises a TypeError"""
+        with self.assertRaises(TypeError):
+            intern_gene([1, [0]])[1][0] = 1
+
+
+def main_shared_genes():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_shared_genes()
@@ -0,0 +1,109 @@
+"""A unit test module to validate the sampled statevector fitness"""
+import unittest
+import math
+import random
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+from unitary_engine import circuit_unitary
+from fitness_metrics import circuit_distance
+from statevector_fitness import sample_states, sampled_distance, target_outputs, SampledStateEvaluator
+
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [1, [2]], [2, [0, 2]], [3, [0, 1]], [3, [1, 2]], [10, [0]]]
+GOAL_CIRCUIT = [[1, [2]], [3, [1, 2]], [1, [1]], [3, [0, 1]], [1, [0]], [2, [0, 2]]]
+GOAL_MATRIX = circuit_unitary(GOAL_CIRCUIT, GATE_SET, 3)
+
+class Fitness:
+    # A stand-in for a DEAP fitness with weighted values
+    def __init__(self, value: float):
+        self.values = (value,)
+        self.wvalues = (-value,)
+
+class Circuit(list):
+    # A list with a fitness, like a creator.Individual
+    pass
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the sampled statevector fitness
+
+    # Valid tests - comparing sampled fitness values against the full unitary matrix
+    def test_sample_states_valid1(self):
+        """Tests that the sampled states are normalised and repeatable"""
+        for kind in ["basis", "random"]:
+            states = sample_states(3, 5, kind, seed=1)
+            self.assertEqual(states.shape, (8, 5))
+            self.assertTrue(np.allclose(np.linalg.norm(states, axis=0), 1))
+            self.assertTrue(np.array_equal(states, sample_states(3, 5, kind, seed=1)))
+        self.assertTrue(np.array_equal(sample_states(3, 8), np.eye(8)))
+
+    def test_statevector_fitness_valid1(self):
+        """Tests that sampling every basis state gives the full metric"""
+        random.seed(0)
+        test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(10)]
+        for metric in ["l1", "frobenius", "fidelity"]:
+            evaluator = SampledStateEvaluator(GATE_SET, GOAL_MATRIX, 3, 8, metric=metric)
+            self.assertAlmostEqual(evaluator.evaluate(test_circuit)[0],
+                                   circuit_distance(circuit_unitary(test_circuit, GATE_SET, 3), GOAL_MATRIX, metric))
+
+    def test_statevector_fitness_valid2(self):
+        """Tests that the goal circuit scores 0 when the target is a Qiskit circuit"""
+        target = QuantumCircuit(3)
+        for gene in GOAL_CIRCUIT:
+            target.append(GATE_SET[gene[0]], gene[1])
+        evaluator = SampledStateEvaluator(GATE_SET, target, 3, 3, kind="random", seed=2)
+        self.assertAlmostEqual(evaluator.evaluate(GOAL_CIRCUIT)[0], 0.0)
+        self.assertTrue(np.allclose(evaluator.target_matrix(), GOAL_MATRIX))
+
+    def test_statevector_fitness_valid3(self):
+        """Tests that only circuits beating the elite threshold are evaluated exactly"""
+        random.seed(3)
+        population = []
+        for _ in range(10):
+            circuit = Circuit(random.choice(POSSIBLE_GATES) for _ in range(6))
+            circuit.fitness = Fitness(random.random() * 10)
+            population.append(circuit)
+
+        evaluator = SampledStateEvaluator(GATE_SET, GOAL_MATRIX, 3, 2)
+        evaluator.update_threshold(population, 3)
+        self.assertEqual(evaluator.exact_threshold, sorted(c.fitness.values[0] for c in population)[2])
+
+        # The goal circuit beats any threshold, so its exact fitness is returned
+        self.assertAlmostEqual(evaluator.evaluate(GOAL_CIRCUIT)[0], 0.0)
+        self.assertEqual(evaluator.exact_evaluations, 1)
+        evaluator.exact_threshold = -1
+        evaluator.evaluate(GOAL_CIRCUIT)
+        self.assertEqual(evaluator.exact_evaluations, 1)
+
+    def test_statevector_fitness_valid4(self):
+        """Tests that a target given as nested lists is treated as a matrix, like circuit_fitness's target_matrix"""
+        states = sample_states(3, 4, "random", seed=5)
+        self.assertTrue(np.allclose(target_outputs(GOAL_MATRIX.tolist(), states), GOAL_MATRIX @ states))
+
+        random.seed(4)
+        test_circuit = [random.choice(POSSIBLE_GATES) for _ in range(10)]
+        evaluator = SampledStateEvaluator(GATE_SET, GOAL_MATRIX.tolist(), 3, 8)
+        self.assertAlmostEqual(evaluator.evaluate(test_circuit)[0],
+                               circuit_distance(circuit_unitary(test_circuit, GATE_SET, 3), GOAL_MATRIX))
+        self.assertTrue(np.array_equal(evaluator.target_matrix(), GOAL_MATRIX))
+
+    # Erroneous tests - invalid samples and metrics
+    def test_statevector_fitness_erroneous1(self):
+        """Tests that sampling more basis states than exist raises a ValueError"""
+        with self.assertRaises(ValueError):
+            sample_states(2, 5)
+        with self.assertRaises(ValueError):
+            sample_states(2, 2, "bell")
+
+    def test_statevector_fitness_erroneous2(self):
+        """Tests that an unknown metric raises a ValueError"""
+        with self.assertRaises(ValueError):
+            sampled_distance(np.eye(4), np.eye(4), "hamming")
+
+
+def main_statevector_fitness():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_statevector_fitness()
@@ -0,0 +1,167 @@
+"""A unit test module to validate the steady-state EA"""
+import math
+import time
+import random
+import threading
+import functools
+import unittest
+import concurrent.futures
+import numpy as np
+from deap import base, creator, tools
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate
+import unitary_engine
+from functions import circuit_fitness
+from steady_state import steady_state, replace_worst, tournament_replace, EvaluationPool
+
+# Creates a minimising fitness and individual, unless another test module already has
+if not hasattr(creator, "FitnessMin"):
+    creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMin)
+
+POSSIBLE_GATES = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+GATE_SET = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+
+def gate_id_sum(circuit):
+    """A stand-in evaluation function, defined at the top level so it can be sent to a process"""
+    return (float(sum(gene[0] for gene in circuit)),)
+
+def compiled_gate_set_count():
+    """Returns the number of gate sets compiled by the process it runs in"""
+    return len(unitary_engine._compiled_gate_sets)
+
+def mutate(circuit):
+    """Replaces a random gene in the circuit"""
+    circuit[random.randint(0, len(circuit) - 1)] = random.choice(POSSIBLE_GATES)
+    del circuit.fitness.values
+    return circuit
+
+def create_toolbox(evaluate=gate_id_sum):
+    """Registers the functions used by the steady-state EA with a DEAP toolbox"""
+    toolbox = base.Toolbox()
+    toolbox.register("individual", tools.initRepeat, creator.Individual,
+                     lambda: random.choice(POSSIBLE_GATES), n=6)
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", mutate)
+    toolbox.register("select", tools.selTournament)
+    toolbox.register("evaluate", evaluate)
+    return toolbox
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the steady-state EA
+
+    # Valid tests - running the steady-state scheme on different executors
+    def test_steady_state_valid1(self):
+        """Tests that the population improves and is recorded every record_every evaluations"""
+        random.seed(0)
+        toolbox = create_toolbox()
+        population = toolbox.population(n=20)
+        statistics = tools.Statistics(lambda circuit: circuit.fitness.values[0])
+        statistics.register("minimum", min)
+
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            population, logbook, best_circuit = steady_state(toolbox, population, 200, 0.5, 0.5, 3,
+                                                             executor, in_flight=1, record_every=50,
+                                                             statistics=statistics)
+
+        self.assertEqual(len(population), 20)
+        self.assertEqual(logbook.select("evaluations"), [50, 100, 150, 200])
+        # Replacing the worst circuit never loses the best one
+        best = logbook.select("best")
+        self.assertEqual(best, sorted(best, reverse=True))
+        self.assertEqual(best_circuit.fitness.values, gate_id_sum(best_circuit))
+        self.assertEqual(min(circuit.fitness.values[0] for circuit in population), best[-1])
+
+    def test_steady_state_valid2(self):
+        """Tests that in_flight evaluations are always running, without waiting for the slowest"""
+        lock = threading.Lock()
+        running = {"now": 0, "most": 0}
+
+        def slow_evaluate(circuit):
+            with lock:
+                running["now"] += 1
+                running["most"] = max(running["most"], running["now"])
+            # Some evaluations take much longer than others
+            time.sleep(0.02 if circuit[0][0] == 1 else 0.001)
+            with lock:
+                running["now"] -= 1
+            return gate_id_sum(circuit)
+
+        random.seed(1)
+        toolbox = create_toolbox(slow_evaluate)
+        population = toolbox.population(n=10)
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            population, logbook, best_circuit = steady_state(toolbox, population, 60, 0.8, 0.6, 3, executor,
+                                                             in_flight=4, replacement="tournament")
+
+        self.assertEqual(running["most"], 4)
+        self.assertEqual(logbook.select("evaluations"), [10, 20, 30, 40, 50, 60])
+        self.assertTrue(all(circuit.fitness.valid for circuit in population))
+
+    def test_steady_state_valid3(self):
+        """Tests that children can be evaluated in other processes"""
+        random.seed(2)
+        toolbox = create_toolbox()
+        population = toolbox.population(n=10)
+        with EvaluationPool(gate_id_sum, 2) as executor:
+            population, logbook, best_circuit = steady_state(toolbox, population, 30, 0.8, 0.6, 3,
+                                                             executor, in_flight=4)
+
+        for circuit in population:
+            self.assertIsInstance(circuit, creator.Individual)
+            self.assertEqual(circuit.fitness.values, gate_id_sum(circuit))
+
+    def test_steady_state_valid4(self):
+        """Tests that a worker compiles the gate set once, rather than once per evaluation"""
+        random.seed(3)
+        evaluate = functools.partial(circuit_fitness, gate_set=GATE_SET, target_matrix=np.full((4, 4), 0.5),
+                                     num_qubits=2, native_engine=True)
+        toolbox = create_toolbox(evaluate)
+        population = toolbox.population(n=10)
+        with EvaluationPool(evaluate, 1) as executor:
+            # The worker may already have the gate sets compiled by this process
+            compiled_before = executor.submit(compiled_gate_set_count).result()
+            population, logbook, best_circuit = steady_state(toolbox, population, 200, 0.8, 0.6, 3,
+                                                             executor, in_flight=2)
+            compiled_after = executor.submit(compiled_gate_set_count).result()
+
+        self.assertLessEqual(compiled_after - compiled_before, 1)
+        for circuit in population:
+            self.assertAlmostEqual(circuit.fitness.values[0], evaluate(circuit)[0])
+
+    def test_replacement_valid1(self):
+        """Tests that the least fit circuit (or tournament contestant) is replaced"""
+        population = [creator.Individual([[1, [0]]] * length) for length in (3, 1, 5, 2)]
+        for circuit in population:
+            circuit.fitness.values = gate_id_sum(circuit)
+        self.assertEqual(replace_worst(population, 2), 2)
+        self.assertEqual(tournament_replace(population, 4), 2)
+
+    # Erroneous tests - invalid parameters
+    def test_steady_state_erroneous1(self):
+        """Tests that an unknown replacement or no variation raises a ValueError"""
+        toolbox = create_toolbox()
+        population = toolbox.population(n=5)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            with self.assertRaises(ValueError):
+                steady_state(toolbox, population, 10, 0.5, 0.5, 3, executor, 1, replacement="oldest")
+            with self.assertRaises(ValueError):
+                steady_state(toolbox, population, 10, 0.0, 0.0, 3, executor, 1)
+
+    def test_steady_state_erroneous2(self):
+        """Tests that evaluating no children at a time raises a ValueError rather than never finishing"""
+        toolbox = create_toolbox()
+        population = toolbox.population(n=5)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            for in_flight in [0, -1]:
+                with self.assertRaises(ValueError):
+                    steady_state(toolbox, population, 10, 0.5, 0.5, 3, executor, in_flight)
+
+
+def main_steady_state():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_steady_state()
@@ -0,0 +1,53 @@
+"""A unit test module to validate the target registry"""
+import os
+import unittest
+import tempfile
+import numpy as np
+import target_registry
+from target_registry import get_target, target_key
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the target registry
+
+    # Valid tests - testing that targets are built once and then loaded from disk
+    def test_target_registry_valid1(self):
+        """Tests that a stored target is loaded instead of being rebuilt"""
+        # Forgets targets loaded by other tests, so the target is built and stored
+        target_registry._targets.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            matrix, gate_count = get_target("qft", {"num_qubits": 2}, directory)
+            path = os.path.join(directory, target_key("qft", {"num_qubits": 2}) + ".npz")
+            self.assertTrue(os.path.exists(path))
+
+            # Forgets the targets held in memory, so the stored file has to be used
+            target_registry._targets.clear()
+            stored_matrix, stored_gate_count = get_target("qft", {"num_qubits": 2}, directory)
+            self.assertTrue(np.allclose(matrix, stored_matrix))
+            self.assertEqual(gate_count, stored_gate_count)
+
+    def test_target_registry_valid2(self):
+        """Tests the matrix and gate count of the 2 qubit QFT circuit"""
+        matrix, gate_count = get_target("qft", {"num_qubits": 2}, None)
+        # The QFT matrix has the entries i^(jk) / 2
+        expected = np.array([[1j ** (row * column) for column in range(4)] for row in range(4)]) / 2
+        self.assertTrue(np.allclose(matrix, expected))
+        self.assertEqual(gate_count, 4)
+
+    def test_target_registry_valid3(self):
+        """Tests that different construction parameters are stored under different keys"""
+        self.assertNotEqual(target_key("grover", {"marked_states": ["10"]}),
+                            target_key("grover", {"marked_states": ["01"]}))
+
+    # Erroneous tests - testing the registry with an unknown family
+    def test_target_registry_erroneous1(self):
+        """Tests get_target with an unknown target family"""
+        with self.assertRaises(ValueError):
+            get_target("shor", {"num_qubits": 2}, None)
+
+
+def main_target_registry():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_target_registry()
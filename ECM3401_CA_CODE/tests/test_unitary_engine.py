@@ -0,0 +1,106 @@
+"""A unit test module to validate the NumPy unitary engine against Qiskit"""
+import unittest
+import math
+import random
+import numpy as np
+import qiskit.quantum_info as qi
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import HGate, SwapGate, CPhaseGate, XGate, CXGate, CCXGate, U3Gate
+from unitary_engine import circuit_unitary, compile_gate_set, batch_circuit_unitaries
+
+def qiskit_unitary(circuit, gate_set, num_qubits):
+    """Builds the unitary of a circuit the same way convert_circuit and qi.Operator do"""
+    qiskit_circuit = QuantumCircuit(num_qubits)
+    for gate in circuit:
+        if gate_set[gate[0]] != "WIRE":
+            qiskit_circuit.append(gate_set[gate[0]], gate[1])
+
+    return qi.Operator(qiskit_circuit).data
+
+class TestClass(unittest.TestCase):
+    # A TestClass that stores each unit test for the unitary engine
+
+    # Valid tests - comparing the engine against qi.Operator
+    def test_unitary_engine_valid1(self):
+        """Tests circuit_unitary with an asymmetric 2 qubit gate in both orientations"""
+        gate_set = {1: HGate(), 2: CXGate(), 10: "WIRE"}
+        test_circuit = [[1, [0]], [2, [0, 1]], [10, [1]], [2, [1, 0]]]
+
+        # Asserts that the qubit ordering matches Qiskit's little-endian ordering
+        self.assertTrue(np.allclose(circuit_unitary(test_circuit, gate_set, 2),
+                                    qiskit_unitary(test_circuit, gate_set, 2)))
+
+    def test_unitary_engine_valid2(self):
+        """Tests circuit_unitary with random 3 qubit QFT style circuits"""
+        gate_set = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2),
+                    4: CPhaseGate(math.pi/4), 10: "WIRE"}
+        possible_gates = [[1, [0]], [1, [1]], [1, [2]], [2, [0, 2]], [3, [0, 1]],
+                          [3, [1, 2]], [4, [0, 2]], [10, [0]]]
+        random.seed(0)
+        for _ in range(10):
+            test_circuit = [random.choice(possible_gates) for _ in range(20)]
+            self.assertTrue(np.allclose(circuit_unitary(test_circuit, gate_set, 3),
+                                        qiskit_unitary(test_circuit, gate_set, 3)))
+
+    def test_unitary_engine_valid3(self):
+        """Tests circuit_unitary with random 4 qubit circuits containing 3 qubit gates"""
+        gate_set = {1: HGate(), 2: XGate(), 3: CCXGate(),
+                    5: U3Gate(math.pi/2, 0, math.pi), 10: "WIRE"}
+        possible_gates = [[1, [0]], [1, [3]], [2, [1]], [3, [0, 1, 2]],
+                          [3, [3, 1, 0]], [5, [2]], [10, [0]]]
+        random.seed(1)
+        for _ in range(10):
+            test_circuit = [random.choice(possible_gates) for _ in range(20)]
+            self.assertTrue(np.allclose(circuit_unitary(test_circuit, gate_set, 4),
+                                        qiskit_unitary(test_circuit, gate_set, 4)))
+
+    def test_unitary_engine_valid4(self):
+        """Tests that a circuit of only wires has the identity as its unitary"""
+        gate_set = {1: HGate(), 10: "WIRE"}
+        test_circuit = [[10, [0]], [10, [1]]]
+
+        self.assertTrue(np.allclose(circuit_unitary(test_circuit, gate_set, 2), np.eye(4)))
+
+    def test_unitary_engine_valid5(self):
+        """Tests that a gate set is only compiled once per number of qubits"""
+        gate_set = {1: HGate(), 10: "WIRE"}
+
+        self.assertIs(compile_gate_set(gate_set, 2), compile_gate_set(gate_set, 2))
+        self.assertIsNot(compile_gate_set(gate_set, 2), compile_gate_set(gate_set, 3))
+
+    def test_unitary_engine_batch1(self):
+        """Tests that batch_circuit_unitaries matches circuit_unitary for every circuit"""
+        gate_set = {1: HGate(), 2: SwapGate(), 3: CPhaseGate(math.pi/2), 10: "WIRE"}
+        possible_gates = [[1, [0]], [1, [1]], [2, [0, 1]], [3, [0, 1]], [10, [0]], [10, [1]]]
+        random.seed(2)
+        test_circuits = [[random.choice(possible_gates) for _ in range(5)] for _ in range(50)]
+
+        unitaries = batch_circuit_unitaries(test_circuits, gate_set, 2)
+        self.assertEqual(unitaries.shape, (50, 4, 4))
+        for test_circuit, unitary in zip(test_circuits, unitaries):
+            self.assertTrue(np.allclose(unitary, circuit_unitary(test_circuit, gate_set, 2)))
+
+    def test_unitary_engine_batch2(self):
+        """Tests batch_circuit_unitaries with circuits of different lengths"""
+        gate_set = {1: HGate(), 2: CXGate(), 10: "WIRE"}
+        test_circuits = [[], [[1, [0]]], [[1, [1]], [2, [1, 0]], [10, [0]]]]
+
+        unitaries = batch_circuit_unitaries(test_circuits, gate_set, 2)
+        for test_circuit, unitary in zip(test_circuits, unitaries):
+            self.assertTrue(np.allclose(unitary, qiskit_unitary(test_circuit, gate_set, 2)))
+
+    # Erroneous tests - testing the engine against invalid genes
+    def test_unitary_engine_erroneous1(self):
+        """Tests circuit_unitary with a gate id missing from the gate set"""
+        gate_set = {1: HGate(), 10: "WIRE"}
+
+        with self.assertRaises(KeyError):
+            circuit_unitary([[4, [0]]], gate_set, 2)
+
+
+def main_unitary_engine():
+    """Enables this test to be included in the test suite and to run each of the unit tests"""
+    unittest.main()
+
+if __name__ == "__main__":
+    main_unitary_engine()